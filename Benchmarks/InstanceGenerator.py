@@ -0,0 +1,116 @@
+# Seeded generator of realistic scheduling instances, for measuring how the scheduler scales beyond the sample workbook.
+# The instances can be used in memory (as an InputData, the same form ImportInputData returns) or written to a workbook
+# in the format of "Input Data.xlsx".
+#
+# Usage: python Benchmarks/InstanceGenerator.py --visitors 150 --professors 60 --output "Large Event.xlsx"
+
+# Import the modules needed for random data and the command line
+import argparse
+import os
+import sys
+
+# Make GenerateSchedule importable from the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import GenerateSchedule as gs
+import numpy as np
+import pandas as pd
+
+# Specify the names from which the visitors' and professors' names are built
+FirstNames = ['Alex', 'Betty', 'Chi', 'David', 'Elena', 'Farid', 'Grace', 'Hiro', 'Isabel', 'Jacob', 'Kristen', 'Lexie', 'Mingrou', 'Nadine', 'Omar', 'Pedro', 'Qing', 'Rosa', 'Sanjay', 'Thomas']
+LastNames = ['Abels', 'Baker', 'Cai', 'Dubois', 'Evans', 'Fromer', 'Garcia', 'Heath', 'Ito', 'Jensen', 'Kim', 'Loop', 'Matthews', 'Nguyen', 'Okafor', 'Patel', 'Quinn', 'Rossi', 'Stover', 'Tanaka']
+
+# Define the function for labelling the time slots
+def GetTimeSlotLabels(NumTimeSlots, StartHour = 8):
+    # Returns half-hour labels in the format of the sample workbook (e.g., '8:00 AM - 8:30 AM')
+    def FormatTime(Minutes):
+        (Hour, Minute) = divmod(Minutes, 60)
+        return '%d:%02d %s' % ((Hour - 1) % 12 + 1, Minute, 'AM' if Hour % 24 < 12 else 'PM')
+    return [('%s - %s' % (FormatTime(60 * StartHour + 30 * t), FormatTime(60 * StartHour + 30 * (t + 1)))) for t in range(NumTimeSlots)]
+
+# Define the function for generating an instance
+def GenerateInputData(NumVisitors, NumProfessors, NumTimeSlots = 18, AvailabilityDensity = 0.5, PreferencesPerVisitor = 8, AvailabilityMix = (0.75, 0.1, 0.15), Popularity = 0.5, Seed = 0):
+    # Returns an InputData holding a random instance.  The same inputs always give the same instance.
+    #
+    # Inputs:
+    #   AvailabilityDensity = the fraction of time slots during which each professor is available.  Professors are
+    #                         available in blocks (with unavailable stretches averaging 1.5 hours), as in real calendars.
+    #   PreferencesPerVisitor = the average length of the visitors' lists of preferred professors
+    #   AvailabilityMix = the fractions of visitors available all day ('na'), in the morning, and in the afternoon
+    #   Popularity = how strongly the preferences are concentrated on a few popular professors (0 is uniform)
+
+    # Seed the random number generator
+    Random = np.random.default_rng(Seed)
+
+    # Name the professors and visitors, numbering any repeated names so that every name is unique
+    ProfessorNames = np.array(['%s%s' % (LastNames[p % len(LastNames)], '' if p < len(LastNames) else p // len(LastNames) + 1) for p in range(NumProfessors)], dtype=object)
+    VisitorFrame = pd.DataFrame({
+        'First Name' : [FirstNames[v % len(FirstNames)] for v in range(NumVisitors)],
+        'Last Name' : ['%s%s' % (LastNames[(v // len(FirstNames)) % len(LastNames)], '' if v < len(FirstNames) * len(LastNames) else v // (len(FirstNames) * len(LastNames)) + 1) for v in range(NumVisitors)],
+        'Availability' : Random.choice(['na', 'morning', 'afternoon'], size=NumVisitors, p=AvailabilityMix),
+    })
+
+    # Build the professors' availability as a two-state Markov chain over the time slots, whose long-run fraction of
+    # available slots is the availability density
+    UnavailableRun = 3
+    AvailableRun = max(UnavailableRun * AvailabilityDensity / max(1 - AvailabilityDensity, 1e-9), 1)
+    AvailabilityMatrix = np.zeros((NumProfessors, NumTimeSlots), dtype=bool)
+    AvailabilityMatrix[:, 0] = Random.random(NumProfessors) < AvailabilityDensity
+    Draws = Random.random((NumProfessors, NumTimeSlots))
+    for t in range(1, NumTimeSlots):
+        Stay = np.where(AvailabilityMatrix[:, t - 1], 1 - 1 / AvailableRun, 1 - 1 / UnavailableRun)
+        AvailabilityMatrix[:, t] = np.where(Draws[:, t] < Stay, AvailabilityMatrix[:, t - 1], ~AvailabilityMatrix[:, t - 1])
+
+    # Draw each visitor's ranked list of preferred professors, favouring the popular professors (with a Zipf-like weight)
+    Weights = 1 / np.arange(1, NumProfessors + 1) ** Popularity
+    Weights = Weights[Random.permutation(NumProfessors)]
+    Weights /= Weights.sum()
+    ListLengths = np.clip(Random.poisson(PreferencesPerVisitor, size=NumVisitors), 1, NumProfessors)
+    Preferences = [ProfessorNames[Random.choice(NumProfessors, size=ListLengths[v], replace=False, p=Weights)] for v in range(NumVisitors)]
+    PreferredProfessors = pd.Series(np.concatenate(Preferences) if NumVisitors > 0 else [], index=np.repeat(np.arange(NumVisitors), ListLengths), dtype=object)
+
+    # Collect the instance
+    Data = gs.InputData()
+    Data.VisitorFrame = VisitorFrame
+    Data.PreferredProfessors = PreferredProfessors
+    Data.ProfessorNames = ProfessorNames
+    Data.AvailabilityMatrix = AvailabilityMatrix
+    Data.TimeSlots = dict(enumerate(GetTimeSlotLabels(NumTimeSlots)))
+
+    # Return the result
+    return Data
+
+# Define the function for writing an instance to a workbook
+def WriteWorkbook(Data, ExcelFileName):
+    # Writes the "Visitor Preferences" and "Professor Availability" sheets in the format of "Input Data.xlsx"
+
+    # List each visitor's preferred professors, separated by commas
+    Preferences = Data.PreferredProfessors.groupby(level=0).agg(', '.join).reindex(Data.VisitorFrame.index, fill_value='')
+    VisitorSheet = Data.VisitorFrame.assign(**{'Preferred Professor Meetings' : Preferences.to_numpy()})
+
+    # Mark the available time slots with a 1, leaving the others blank
+    ProfessorSheet = pd.DataFrame(np.where(Data.AvailabilityMatrix, 1, np.nan), columns=[Data.TimeSlots[t] for t in Data.TimeSlots])
+    ProfessorSheet.insert(0, 'Last Name', Data.ProfessorNames)
+
+    # Write the workbook
+    with pd.ExcelWriter(ExcelFileName) as Writer:
+        VisitorSheet.to_excel(Writer, sheet_name='Visitor Preferences', index=False)
+        ProfessorSheet.to_excel(Writer, sheet_name='Professor Availability', index=False)
+
+if __name__ == '__main__':
+
+    # Parse the command line arguments
+    Parser = argparse.ArgumentParser(description='Generate a random scheduling instance and write it to a workbook.')
+    Parser.add_argument('--visitors', dest='NumVisitors', type=int, default=150, help='the number of visitors (default: %(default)s)')
+    Parser.add_argument('--professors', dest='NumProfessors', type=int, default=60, help='the number of professors (default: %(default)s)')
+    Parser.add_argument('--slots', dest='NumTimeSlots', type=int, default=18, help='the number of half-hour time slots (default: %(default)s)')
+    Parser.add_argument('--density', dest='AvailabilityDensity', type=float, default=0.5, help='the fraction of time slots during which each professor is available (default: %(default)s)')
+    Parser.add_argument('--preferences', dest='PreferencesPerVisitor', type=float, default=8, help='the average number of preferred professors per visitor (default: %(default)s)')
+    Parser.add_argument('--mix', dest='AvailabilityMix', type=float, nargs=3, default=(0.75, 0.1, 0.15), metavar=('NA', 'MORNING', 'AFTERNOON'), help='the fractions of visitors available all day, in the morning, and in the afternoon (default: 0.75 0.1 0.15)')
+    Parser.add_argument('--seed', dest='Seed', type=int, default=0, help='the seed of the random number generator (default: %(default)s)')
+    Parser.add_argument('--output', dest='OutputFile', default='Generated Input Data.xlsx', help='the workbook to write (default: %(default)s)')
+    Arguments = Parser.parse_args()
+
+    # Generate and write the instance
+    Data = GenerateInputData(Arguments.NumVisitors, Arguments.NumProfessors, Arguments.NumTimeSlots, Arguments.AvailabilityDensity, Arguments.PreferencesPerVisitor, Arguments.AvailabilityMix, Seed=Arguments.Seed)
+    WriteWorkbook(Data, Arguments.OutputFile)
+    print('Wrote %d visitors, %d professors, and %d time slots to \"%s\".' % (Arguments.NumVisitors, Arguments.NumProfessors, Arguments.NumTimeSlots, os.path.abspath(Arguments.OutputFile)))
@@ -0,0 +1,75 @@
+# Micro-benchmark comparing the old linear-scan professor lookup with the ProfessorIndex used by CalcPreferencePoints.
+#
+# Usage: python Benchmarks/ProfessorLookupBenchmark.py
+
+# Import the modules needed for timing and random data
+import os
+import random
+import sys
+import time
+
+# Make GenerateSchedule importable from the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import GenerateSchedule as gs
+
+# Define the original lookup, which rebuilds both lists of professors on every call
+def LinearScanGetProfID(ProfLastName, Professors):
+    ProfLastNames = [p.LastName for p in Professors.values()]
+    if ProfLastName in ProfLastNames:
+        return [p.Id for p in Professors.values()][ProfLastNames.index(ProfLastName)]
+    raise ValueError
+
+# Define the function for building a random roster
+def BuildRoster(NumVisitors, NumProfessors, PrefsPerVisitor, Seed = 0):
+
+    # Seed the random number generator so that every run times the same lookups
+    Random = random.Random(Seed)
+
+    # Build the professors
+    Professors = dict()
+    for i in range(NumProfessors):
+        p = gs.Professor()
+        p.Id = i
+        p.LastName = 'Professor%04d' % i
+        Professors[i] = p
+
+    # Build the visitors, each with a random list of preferred professors
+    Visitors = dict()
+    for i in range(NumVisitors):
+        v = gs.Visitor()
+        v.Id = i
+        v.PreferredProfessors = [Professors[p].LastName for p in Random.sample(range(NumProfessors), PrefsPerVisitor)]
+        Visitors[i] = v
+
+    # Return the result
+    return (Visitors, Professors)
+
+# Define the function for timing every lookup made while scoring preferences
+def TimeLookups(Visitors, LookupFunction):
+    Start = time.perf_counter()
+    for v in Visitors.values():
+        for ProfLastName in v.PreferredProfessors:
+            LookupFunction(ProfLastName)
+    return time.perf_counter() - Start
+
+if __name__ == '__main__':
+
+    # Print a header
+    print('%10s %10s %15s %15s %10s' % ('Visitors', 'Professors', 'Linear scan (s)', 'Index (s)', 'Speedup'))
+
+    # Loop over increasingly large rosters
+    for (NumVisitors, NumProfessors) in [(50, 25), (150, 60), (300, 120), (600, 240), (1200, 480)]:
+
+        # Build the roster
+        (Visitors, Professors) = BuildRoster(NumVisitors, NumProfessors, PrefsPerVisitor = 10)
+
+        # Time the original lookup
+        LinearTime = TimeLookups(Visitors, lambda Name: LinearScanGetProfID(Name, Professors))
+
+        # Time the index, including the cost of building it
+        Start = time.perf_counter()
+        ProfIndex = gs.ProfessorIndex(Professors)
+        IndexTime = time.perf_counter() - Start + TimeLookups(Visitors, lambda Name: gs.GetProfID(Name, ProfIndex))
+
+        # Print the results
+        print('%10d %10d %15.5f %15.5f %9.1fx' % (NumVisitors, NumProfessors, LinearTime, IndexTime, LinearTime / IndexTime))
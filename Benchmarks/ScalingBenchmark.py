@@ -0,0 +1,155 @@
+# Benchmark timing each stage of the scheduling pipeline (reading the workbook, calculating the preference points,
+# analyzing the problem, building the model, solving it, extracting the schedule, and writing the output) on generated instances of increasing
+# size.  The results are saved to a JSON file, and can be compared against an earlier run to catch regressions.
+#
+# Usage: python Benchmarks/ScalingBenchmark.py [--sizes 32x28x18 150x60x18] [--solver cbc] [--baseline OLD.json]
+
+# Import the modules needed for timing, temporary files, and the command line
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# Make GenerateSchedule (and the instance generator next to this file) importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import GenerateSchedule as gs
+import InstanceGenerator as ig
+import ortools
+
+# Specify the stages of the pipeline, in order
+Stages = ['Import', 'Preference points', 'Presolve', 'Build', 'Solve', 'Extraction', 'Output']
+
+# Define the function for timing the pipeline on one instance
+def TimePipeline(NumVisitors, NumProfessors, NumTimeSlots, BackendName, Parameters, Seed = 0):
+    # Returns a dictionary describing the instance, the time of each stage (in seconds), and the outcome of the solve
+
+    # Keep the morning/afternoon split of the sample workbook (8 of its 18 time slots are in the morning)
+    gs.AfternoonStartSlot = NumTimeSlots * 8 // 18
+
+    # Work in a temporary directory, keeping the printed status messages out of the benchmark's output
+    Row = {'Visitors' : NumVisitors, 'Professors' : NumProfessors, 'Time slots' : NumTimeSlots, 'Seed' : Seed}
+    with tempfile.TemporaryDirectory() as Directory, contextlib.redirect_stdout(io.StringIO()):
+
+        # Generate the instance and write it to a workbook
+        ExcelFileName = os.path.join(Directory, 'Input Data.xlsx')
+        ig.WriteWorkbook(ig.GenerateInputData(NumVisitors, NumProfessors, NumTimeSlots, Seed=Seed), ExcelFileName)
+
+        # Read the workbook (without the cache, which would hide the cost of parsing it)
+        Start = time.perf_counter()
+        Data = gs.ImportInputData(ExcelFileName, UseCache=False)
+        Visitors = Data.GetVisitors()
+        Professors = Data.GetProfessors()
+        TimeSlots = Data.TimeSlots
+        Row['Import'] = time.perf_counter() - Start
+
+        # Calculate the preference points
+        Start = time.perf_counter()
+        gs.CalcPreferencePoints(Visitors, Professors, Data.GetProfessorIndex())
+        Row['Preference points'] = time.perf_counter() - Start
+
+        # Analyze the problem, then build and solve the model, the same way the schedule command does (a stage which is
+        # skipped, e.g., building a model which the analysis found to have no solution, takes no time)
+        Report = gs.RunReport()
+        (Result, BuildSeconds) = gs.SolveWithBackend(Visitors, Professors, TimeSlots, BackendName, Parameters, Report=Report)
+        StageSeconds = {Stage['Stage'] : Stage['Seconds'] for Stage in Report.Stages}
+        for Stage in ['Presolve', 'Build', 'Solve']:
+            Row[Stage] = StageSeconds.get(Stage, 0.0)
+        Row['Feasible meetings'] = len(gs.GetFeasibleMeetings(Visitors, Professors, TimeSlots))
+
+        # Extract the schedule into arrays
+        Start = time.perf_counter()
+        gs.ScheduleAssignment(Visitors, Professors, TimeSlots, Result.ScheduledMeetings)
+        Row['Extraction'] = time.perf_counter() - Start
+
+        # Write out the statistics and schedules
+        Start = time.perf_counter()
+        if len(Result.ScheduledMeetings) > 0:
+            gs.ReportSchedule(Visitors, Professors, TimeSlots, Result.ScheduledMeetings, Directory)
+        Row['Output'] = time.perf_counter() - Start
+
+    # Record the outcome of the solve (with undefined values saved as nulls, since JSON has no NaN)
+    Row.update({'Status' : Result.Status, 'Objective' : Result.ObjectiveValue, 'Gap (%)' : 100 * Result.RelativeGap(), 'Meetings' : len(Result.ScheduledMeetings)})
+    for Name in ['Objective', 'Gap (%)']:
+        if math.isnan(Row[Name]):
+            Row[Name] = None
+
+    # Return the result
+    return Row
+
+# Define the function for comparing the results with those of an earlier run
+def FindRegressions(Results, Baseline, Tolerance, MinSeconds):
+    # Returns a list of (instance, stage, old seconds, new seconds) for each stage which got slower by more than the
+    # tolerance (a fraction) and by more than MinSeconds, which keeps timer noise in the fastest stages from being flagged
+    GetKey = lambda Row: (Row['Visitors'], Row['Professors'], Row['Time slots'], Row['Seed'])
+    OldRows = {GetKey(Row) : Row for Row in Baseline['Results']}
+    Regressions = []
+    for Row in Results:
+        OldRow = OldRows.get(GetKey(Row))
+        if OldRow is None:
+            continue
+        for Stage in Stages:
+            if Stage not in OldRow:
+                continue
+            if Row[Stage] > OldRow[Stage] * (1 + Tolerance) and Row[Stage] - OldRow[Stage] > MinSeconds:
+                Regressions.append(('%dx%dx%d' % GetKey(Row)[:3], Stage, OldRow[Stage], Row[Stage]))
+    return Regressions
+
+if __name__ == '__main__':
+
+    # Parse the command line arguments
+    Parser = argparse.ArgumentParser(description='Time each stage of the scheduler on generated instances of increasing size.')
+    Parser.add_argument('--sizes', dest='Sizes', nargs='+', default=['32x28x18', '75x30x18', '150x60x18'], metavar='VxPxT', help='the numbers of visitors, professors, and time slots of each instance (default: %(default)s)')
+    Parser.add_argument('--solver', dest='Solver', choices=list(gs.SolverBackends), default='cbc', help='the solver (default: %(default)s)')
+    Parser.add_argument('--max-minutes', dest='MaxMinutes', type=gs.ParseMaxMinutes, default=0.5, help='the time limit of the solver for each instance (default: %(default)s)')
+    Parser.add_argument('--seed', dest='Seed', type=int, default=0, help='the seed of the instance generator (default: %(default)s)')
+    Parser.add_argument('--output', dest='OutputFile', default='ScalingBenchmark.json', help='the JSON file in which to save the results (default: %(default)s)')
+    Parser.add_argument('--baseline', dest='BaselineFile', default=None, help='the results of an earlier run to compare against.  The exit status is 1 if any stage got slower.')
+    Parser.add_argument('--tolerance', dest='Tolerance', type=float, default=0.25, help='the fraction by which a stage may get slower before it is flagged (default: %(default)s)')
+    Arguments = Parser.parse_args()
+
+    # Collect the parameters
+    Parameters = dict(gs.DefaultParameters, MaxMinutes=Arguments.MaxMinutes)
+
+    # Print a header
+    print('%20s %10s' % ('Instance', 'Feasible') + ''.join(' %12s' % Stage[:12] for Stage in Stages) + ' %12s %8s' % ('Status', 'Gap (%)'))
+
+    # Time the pipeline on each instance
+    Results = []
+    for Size in Arguments.Sizes:
+        (NumVisitors, NumProfessors, NumTimeSlots) = [int(Number) for Number in Size.lower().split('x')]
+        Row = TimePipeline(NumVisitors, NumProfessors, NumTimeSlots, Arguments.Solver, Parameters, Arguments.Seed)
+        Results.append(Row)
+        print('%20s %10d' % (Size, Row['Feasible meetings']) + ''.join(' %12.4f' % Row[Stage] for Stage in Stages) + ' %12s %8s' % (Row['Status'], '%.2f' % Row['Gap (%)'] if Row['Gap (%)'] is not None else '-'))
+
+    # Save the results, along with a description of the environment
+    Report = {
+        'Created' : time.strftime('%Y-%m-%d %H:%M:%S'),
+        'Python' : platform.python_version(),
+        'Platform' : platform.platform(),
+        'Processors' : os.cpu_count(),
+        'OR-Tools' : ortools.__version__,
+        'Solver' : Arguments.Solver,
+        'MaxMinutes' : Arguments.MaxMinutes,
+        'Results' : Results,
+    }
+    with open(Arguments.OutputFile, 'w') as File:
+        json.dump(Report, File, indent=2)
+    print('Saved the results to \"%s\".' % os.path.abspath(Arguments.OutputFile))
+
+    # Compare the results with the baseline, if one was given
+    if Arguments.BaselineFile is not None:
+        with open(Arguments.BaselineFile) as File:
+            Baseline = json.load(File)
+        Regressions = FindRegressions(Results, Baseline, Arguments.Tolerance, MinSeconds=0.05)
+        for (Instance, Stage, OldSeconds, NewSeconds) in Regressions:
+            print('Regression: %s got slower on %s (%.4f s -> %.4f s)' % (Stage, Instance, OldSeconds, NewSeconds))
+        if len(Regressions) > 0:
+            sys.exit(1)
+        print('No stage got more than %d%% slower than in \"%s\".' % (100 * Arguments.Tolerance, Arguments.BaselineFile))
@@ -0,0 +1,108 @@
+# Benchmark comparing the original way of reading a solved model (calling solution_value() for every visitor, professor,
+# and time slot in each of the three reporting passes) with pulling the solution out once into a ScheduleAssignment.
+#
+# Usage: python Benchmarks/SolutionExtractionBenchmark.py
+
+# Import the modules needed for timing and random data
+import os
+import random
+import sys
+import time
+
+# Make GenerateSchedule importable from the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import GenerateSchedule as gs
+
+# Define the function for building a random instance along with a solved model of one of its schedules
+def BuildSolvedModel(NumVisitors, NumProfessors, NumTimeSlots, Seed = 0):
+    # Returns the visitors, professors, time slots, the solved model, and the dictionary of its meeting variables
+
+    # Seed the random number generator so that every run times the same instance
+    Random = random.Random(Seed)
+
+    # Build the time slots, professors, and visitors
+    TimeSlots = {t : 'Slot %d' % t for t in range(NumTimeSlots)}
+    Professors = dict()
+    for i in range(NumProfessors):
+        p = gs.Professor()
+        p.Id = i
+        p.LastName = 'Professor%04d' % i
+        p.Availability = {t : Random.random() < 0.6 for t in TimeSlots}
+        Professors[i] = p
+    Visitors = dict()
+    for i in range(NumVisitors):
+        v = gs.Visitor()
+        v.Id = i
+        v.FirstName = 'Visitor'
+        v.LastName = '%04d' % i
+        v.PreferencePoints = {p : 1 for p in Random.sample(range(NumProfessors), min(8, NumProfessors))}
+        Visitors[i] = v
+
+    # Pick a random schedule which respects the one-meeting-per-slot and pair-once constraints
+    ScheduledMeetings = set()
+    (VisitorBusy, ProfBusy, PairsMet) = (set(), set(), set())
+    for (v,p,t) in Random.sample([(v,p,t) for v in Visitors for p in Professors for t in TimeSlots if Professors[p].Availability[t]], NumVisitors * NumTimeSlots // 2):
+        if (v,t) not in VisitorBusy and (p,t) not in ProfBusy and (v,p) not in PairsMet:
+            ScheduledMeetings.add((v,p,t))
+            VisitorBusy.add((v,t))
+            ProfBusy.add((p,t))
+            PairsMet.add((v,p))
+
+    # Build a model whose only solution is that schedule, and solve it
+    model = gs.pywraplp.Solver.CreateSolver('CBC')
+    Meeting = dict()
+    for (v,p,t) in gs.GetFeasibleMeetings(Visitors, Professors, TimeSlots):
+        Value = 1 if (v,p,t) in ScheduledMeetings else 0
+        Meeting[(v,p,t)] = model.IntVar(Value, Value, '')
+    model.Solve()
+
+    # Return the result (along with the model, which must outlive its variables)
+    return (Visitors, Professors, TimeSlots, model, Meeting)
+
+# Define the function for reading the solution the original way, with one pass each for the visitor schedules, the
+# professor schedules, and the visitors' happiness
+def ReadRepeatedly(Visitors, Professors, TimeSlots, Meeting):
+    IsMet = lambda k: k in Meeting and Meeting[k].solution_value() > 0.5
+    VisitorSchedules = [[p for p in Professors if IsMet((v,p,t))] for v in Visitors for t in TimeSlots]
+    ProfessorSchedules = [[v for v in Visitors if IsMet((v,p,t))] for p in Professors for t in TimeSlots]
+    Happiness = [sum(Visitors[v].PreferencePoints.get(p, 0) for p in Professors if sum(1 for t in TimeSlots if IsMet((v,p,t))) == 1) for v in Visitors]
+    return (VisitorSchedules, ProfessorSchedules, Happiness)
+
+# Define the function for reading the solution once into a ScheduleAssignment, which the three passes then use
+def ReadOnce(Visitors, Professors, TimeSlots, Meeting):
+    Schedule = gs.ScheduleAssignment(Visitors, Professors, TimeSlots, {k for k in Meeting if Meeting[k].solution_value() > 0.5})
+    VisitorSchedules = [Schedule.VisitorSlot[v,t] for v in Visitors for t in TimeSlots]
+    ProfessorSchedules = [Schedule.ProfSlot[p,t] for p in Professors for t in TimeSlots]
+    Happiness = [sum(Visitors[v].PreferencePoints.get(p, 0) for p in Schedule.VisitorSlot[v][Schedule.VisitorSlot[v] != -1]) for v in Visitors]
+    return (VisitorSchedules, ProfessorSchedules, Happiness)
+
+if __name__ == '__main__':
+
+    # Import the libraries which GenerateSchedule imports lazily, so that loading NumPy isn't counted as part of the first
+    # ScheduleAssignment (the schedule command has always loaded it by the time the schedule is read)
+    gs.ImportLazyModules()
+
+    # Print a header
+    print('%10s %10s %10s %12s %14s %14s %10s' % ('Visitors', 'Professors', 'Slots', 'Variables', 'Repeated (s)', 'Once (s)', 'Speedup'))
+
+    # Loop over increasingly large instances
+    for (NumVisitors, NumProfessors) in [(32, 28), (150, 60), (300, 100)]:
+
+        # Build and solve the model
+        (Visitors, Professors, TimeSlots, model, Meeting) = BuildSolvedModel(NumVisitors, NumProfessors, 18)
+
+        # Time both ways of reading the solution, keeping the best of three runs to filter out timer noise
+        (RepeatedTime, OnceTime) = (float('inf'), float('inf'))
+        for Run in range(3):
+            Start = time.perf_counter()
+            Repeated = ReadRepeatedly(Visitors, Professors, TimeSlots, Meeting)
+            RepeatedTime = min(RepeatedTime, time.perf_counter() - Start)
+            Start = time.perf_counter()
+            Once = ReadOnce(Visitors, Professors, TimeSlots, Meeting)
+            OnceTime = min(OnceTime, time.perf_counter() - Start)
+
+        # Check that both ways agree on the happiness of every visitor
+        assert Repeated[2] == Once[2]
+
+        # Print the results
+        print('%10d %10d %10d %12d %14.4f %14.4f %9.1fx' % (NumVisitors, NumProfessors, len(TimeSlots), len(Meeting), RepeatedTime, OnceTime, RepeatedTime / OnceTime))
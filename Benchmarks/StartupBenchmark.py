@@ -0,0 +1,96 @@
+# Benchmark measuring the startup time of the commands which don't solve a model (printing the help, checking the workbook,
+# and regenerating the schedule files from a cached schedule), and checking each against its time budget and against the
+# libraries it shouldn't need to import.
+#
+# Usage: python Benchmarks/StartupBenchmark.py [--repeats 5] [--budget-scale 2]
+
+# Import the modules needed for timing the commands in separate processes
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Locate the script and the sample workbook
+RepositoryDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ScriptFileName = os.path.join(RepositoryDirectory, 'GenerateSchedule.py')
+SampleFileName = os.path.join(RepositoryDirectory, 'Input Data.xlsx')
+
+# Specify a module which is only imported once each heavy library is actually used (rather than just imported lazily).
+# OR-Tools itself is listed separately, since importing any of its solvers eagerly would also import the ortools package.
+LibraryModules = {
+    'NumPy' : 'numpy.linalg',
+    'Pandas' : 'pandas.core.frame',
+    'OR-Tools' : 'ortools',
+    'OR-Tools (linear solver)' : 'ortools.linear_solver._pywraplp',
+    'OR-Tools (CP-SAT)' : 'ortools.sat.python.cp_model_helper',
+}
+
+# Specify the commands, each with its arguments, its time budget (in seconds, on a typical laptop), and the libraries it
+# must not load
+Commands = [
+    ('help', ['--help'], 0.5, ['NumPy', 'Pandas', 'OR-Tools', 'OR-Tools (linear solver)', 'OR-Tools (CP-SAT)']),
+    ('validate', ['validate'], 1.5, ['OR-Tools', 'OR-Tools (linear solver)', 'OR-Tools (CP-SAT)']),
+    ('schedule (cached)', ['schedule', '--solver', 'cp-sat', '--max-minutes', '0.2'], 1.5, ['OR-Tools', 'OR-Tools (linear solver)', 'OR-Tools (CP-SAT)']),
+]
+
+# Define the function for running a command
+def RunCommand(Arguments, Directory, ImportTime = False):
+    # Returns the wall-clock time taken by the command (including starting Python), and the output of -X importtime (if
+    # requested), raising an error if the command fails
+    Start = time.perf_counter()
+    Process = subprocess.run([sys.executable] + (['-X', 'importtime'] if ImportTime else []) + [ScriptFileName] + Arguments, cwd=Directory, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    Seconds = time.perf_counter() - Start
+    if Process.returncode != 0:
+        raise RuntimeError('\"%s\" failed:\n%s' % (' '.join(Arguments), Process.stderr))
+    return (Seconds, Process.stderr)
+
+# Define the function for listing the libraries loaded by a command
+def FindLoadedLibraries(ImportTimes):
+    # Returns the names of the libraries whose telltale modules appear in the output of -X importtime
+    Modules = {Line.split('|')[-1].strip() for Line in ImportTimes.splitlines() if Line.startswith('import time:')}
+    return [Library for Library in LibraryModules if LibraryModules[Library] in Modules]
+
+if __name__ == '__main__':
+
+    # Parse the command line arguments
+    Parser = argparse.ArgumentParser(description='Measure the startup time of the commands which don\'t solve a model.')
+    Parser.add_argument('--repeats', dest='Repeats', type=int, default=5, help='the number of times each command is timed, with the median reported (default: %(default)s)')
+    Parser.add_argument('--budget-scale', dest='BudgetScale', type=float, default=1, help='the factor by which to scale every budget, for slower or faster machines (default: %(default)s)')
+    Arguments = Parser.parse_args()
+
+    # Work on a copy of the sample workbook, in a temporary directory
+    with tempfile.TemporaryDirectory() as Directory:
+        shutil.copy(SampleFileName, Directory)
+
+        # Print a header
+        print('%-20s %12s %12s   %s' % ('Command', 'Median (s)', 'Budget (s)', 'Libraries loaded'))
+
+        # Time each command, after one untimed run which fills the cache (and the operating system's file cache)
+        Failures = []
+        for (Name, CommandArguments, Budget, ForbiddenLibraries) in Commands:
+            RunCommand(CommandArguments, Directory)
+            (Seconds, ImportTimes) = RunCommand(CommandArguments, Directory, ImportTime=True)
+            Times = [RunCommand(CommandArguments, Directory)[0] for i in range(Arguments.Repeats)]
+            Median = statistics.median(Times)
+            Budget *= Arguments.BudgetScale
+
+            # Check the time and the libraries against the budget
+            Loaded = FindLoadedLibraries(ImportTimes)
+            Status = ''
+            if Median > Budget:
+                Status = 'OVER BUDGET'
+            if any(Library in ForbiddenLibraries for Library in Loaded):
+                Status = 'LOADS ' + ', '.join(Library for Library in Loaded if Library in ForbiddenLibraries)
+            if Status != '':
+                Failures.append(Name)
+            print(('%-20s %12.3f %12.3f   %-50s %s' % (Name, Median, Budget, ', '.join(Loaded) if len(Loaded) > 0 else '-', Status)).rstrip())
+
+    # Exit with an error status if any command missed its budget
+    if len(Failures) > 0:
+        print('%d commands missed their budget.' % len(Failures))
+        sys.exit(1)
+    print('Every command is within its budget.')
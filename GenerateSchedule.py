@@ -1,13 +1,183 @@
+# Import the modules for importing the libraries below lazily
+import importlib
+import sys
+import types
+
+# Define the class which stands in for a library until it is first used
+class LazyModule(types.ModuleType):
+    # Imports the library the first time one of its attributes is looked up, and then keeps each attribute it hands out, so
+    # that later lookups don't go through the import system again.  Nothing (not even the library's parent packages, e.g.,
+    # ortools for ortools.linear_solver.pywraplp) is imported before then.
+
+    def __getattr__(self, Attribute):
+        Value = getattr(importlib.import_module(self.__name__), Attribute)
+        setattr(self, Attribute, Value)
+        return Value
+
+# Define the function for importing a library lazily
+def LazyImport(Name):
+    # Returns the module, which is only actually imported when one of its attributes is first used, so that commands which
+    # don't need a library (e.g., validate doesn't need OR-Tools) don't pay for importing it.  A module which was already
+    # imported is returned as is.  ImportLazyModules can be called to import them all up front (e.g., before the time
+    # taken by the first use of a library would be counted as part of something else).
+    if Name in sys.modules:
+        return sys.modules[Name]
+    return LazyModule(Name)
+
 # Import the OR-Tools library
-from ortools.linear_solver import pywraplp
+pywraplp = LazyImport('ortools.linear_solver.pywraplp')
+linear_solver_pb2 = LazyImport('ortools.linear_solver.linear_solver_pb2')
+cp_model = LazyImport('ortools.sat.python.cp_model')
+max_flow = LazyImport('ortools.graph.python.max_flow')
 
 # Import Pandas
-import pandas as pd
-from pandas import ExcelFile
+pd = LazyImport('pandas')
+
+# Import NumPy
+np = LazyImport('numpy')
+
+# Import the math module
+import math
 
 # Import the os module
 import os
 
+# Import the module for parsing command line arguments
+import argparse
+
+# Import the time module
+import time
+
+# Import the module for solving sub-problems in parallel processes
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Import the module for building grids of scenarios
+import itertools
+
+# Import the modules for redirecting the output of each event in a batch (or each request to the service) to its own log
+import contextlib
+import io
+
+# Import the modules for caching the parsed workbooks
+import hashlib
+import pickle
+
+# Import the regular expression module
+import re
+
+# Import the module for bundling the schedules into an archive
+import zipfile
+
+# Import the module for serializing the progress updates of the solver's threads
+import threading
+
+# Import the modules for writing the run report and profiling the stages of a run.  The resource module (for measuring the
+# memory use) is only available on Unix.
+import json
+import cProfile
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Import the modules for running the scheduling service
+import signal
+import tempfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Import the module for converting the objective weights into fractions
+from fractions import Fraction
+
+# Import the abstract base class for dictionary-like objects
+from collections.abc import MutableMapping
+
+# Define the function for finishing the lazy imports
+def ImportLazyModules():
+    # Imports each of the lazily imported libraries which hasn't been used yet
+    for Module in (pywraplp, linear_solver_pb2, cp_model, max_flow, pd, np):
+        getattr(Module, '__file__', None)
+
+# Specify the first time slot of the afternoon.  Visitors who are only available in the morning can attend meetings
+# before this time slot, and visitors who are only available in the afternoon can attend meetings from this slot onward.
+AfternoonStartSlot = 8
+
+# Specify any alternative spellings of professors' names used in the visitors' preference lists.  Each entry maps an alias
+# (e.g., 'Smith J.') to the last name used in the Professor Availability sheet (e.g., 'Smith').  Differences in case and
+# whitespace, as well as trailing initials, are already ignored and don't need to be listed here.
+ProfessorAliases = {
+}
+
+# Specify how preference points are assigned.  Two values are valid: 'flat' gives one point for each of the visitor's
+# preferred professors, and 'rank' gives more points to the professors near the top of the visitor's list.
+PreferenceScheme = 'flat'
+
+# Specify the directory in which parsed workbooks and solved schedules are cached, so that a workbook which hasn't changed
+# since the last run doesn't have to be parsed (or solved) again.  The cache can safely be deleted at any time.
+CacheDirectory = '.cache'
+
+# Specify the version of the format of the cached workbooks, which must be increased whenever InputData changes
+InputCacheVersion = 1
+
+# Specify the version of the format of the cached schedules, which must be increased whenever the model or SolveResult changes
+ResultCacheVersion = 3
+
+# Specify the size limit of the cached schedules.  The least recently used schedules are deleted once it is exceeded.
+ResultCacheMaxMegabytes = 100
+
+# Specify the number of threads used to write the schedule files
+NumWriterThreads = 8
+
+# Specify the minimum number of seconds between the progress lines which only report a better bound
+ProgressIntervalSeconds = 5
+
+# Specify how the time limit is scaled with the size of the model when MaxMinutes is 'auto': the number of seconds per
+# thousand variables, and the smallest and largest time limits in minutes
+AutoTimeLimitSecondsPerThousandVariables = 10
+AutoTimeLimitMinutes = (0.5, 30)
+
+# Specify the default parameters of the model and the solver
+DefaultParameters = {
+
+    # The weights of the various objectives
+    'Weight' : {
+        'Maximize the happiness points' : 1,
+        'Maximize the number of meetings' : 0.1,
+        'Maximize the minimum number of meetings': 1,
+        'Maximize the minimum happiness score': 1
+    },
+
+    # The number of time slots each visitor must have free
+    'RequiredFreePeriods' : 8,
+
+    # The time limit of the solver, or 'auto' to scale it with the size of the model (see GetTimeLimitSeconds)
+    'MaxMinutes' : 1,
+
+    # Stop as soon as the best schedule is provably within this fraction of the optimal objective (0 uses the solver's own
+    # tolerance)
+    'RelativeGap' : 0,
+
+    # Stop as soon as the best schedule is provably within this many objective points of optimal (0 uses the solver's own
+    # tolerance).  Only CP-SAT supports this.
+    'AbsoluteGap' : 0,
+
+    # Stop if the best schedule hasn't improved for this many minutes (None never stops early).  Only CP-SAT supports this.
+    'StallMinutes' : None,
+
+    # The number of parallel search workers used by CP-SAT (0 uses every core)
+    'NumWorkers' : 0,
+
+    # The objective bonus for keeping each of the published meetings when re-solving after a last-minute change
+    'ChurnWeight' : 1,
+
+    # Whether to leave out the constraints which are already implied by the others (e.g., at most one meeting during a time
+    # slot in which the visitor can only meet one professor)
+    'DropRedundantConstraints' : True,
+
+    # Whether to tell the solver to ignore the schedules which only differ by swapping interchangeable visitors or professors
+    # (always off when the solver starts from a hint, which may not follow the same ordering)
+    'BreakSymmetry' : True,
+}
+
 # Define the visitor class
 class Visitor():
 
@@ -30,83 +200,133 @@ class Professor():
         self.Availability = dict() # a dictionary mapping each time slot to a boolean, with True indicating the professor is available during that time slot, and False indicating that they are unavailable.
         self.NumberOfMeetingsAvailable = 0
 
-# Define the function for reading in the visitor information
-def ImportVisitorInfo():
+# Define the class which lets a row of the availability matrix be used like a professor's availability dictionary
+class AvailabilityView(MutableMapping):
+    # Maps each time slot to a boolean by reading (and writing) one row of a professor x time slot matrix, so that the
+    # professors' availability lives in a single array rather than in one dictionary per professor.
 
-    # Specify the name of the excel file
-    VisitorInfoExcelFile = 'Input Data.xlsx'
+    def __init__(self, Matrix, Row):
+        self.Matrix = Matrix
+        self.Row = Row
 
-    # Identify the sheet the data is coming from
-    SheetName = 'Visitor Preferences'
+    def __getitem__(self, t):
+        return bool(self.Matrix[self.Row, t])
 
-    # Print out a status update
-    print('Attempting to import the visitor information from \"%s%s%s\"...' %(os.getcwd(), os.sep, VisitorInfoExcelFile))
+    def __setitem__(self, t, Available):
+        self.Matrix[self.Row, t] = Available
 
-    # Instantiate the dictionary of visitors
-    Visitors = dict()
+    def __delitem__(self, t):
+        raise TypeError('Time slots cannot be removed from a professor\'s availability.')
 
-    # Read the visitor preferences into a data frame
-    df = pd.read_excel(io=VisitorInfoExcelFile, sheet_name=SheetName)
+    def __iter__(self):
+        return iter(range(self.Matrix.shape[1]))
 
-    # List the expected columns
-    ExpectedColumns = [
-        'First Name',
-        'Last Name',
-        'Availability',
-        'Preferred Professor Meetings',
-    ]
+    def __len__(self):
+        return self.Matrix.shape[1]
+
+# Define the class which holds the imported input data in array form
+class InputData():
+    # The visitor and professor objects are only built (once) when they are first requested.
+
+    def __init__(self):
+        self.VisitorFrame = None # a data frame with the first name, last name, and availability of each visitor, indexed by visitor id
+        self.PreferredProfessors = None # a series with one row per (visitor id, preferred professor) entry, in rank order
+        self.ProfessorNames = None # an array with the last name of each professor, indexed by professor id
+        self.AvailabilityMatrix = None # a boolean professor x time slot array, with True indicating the professor is available
+        self.TimeSlots = dict() # a dictionary mapping each time slot index to its label
+        self.Visitors = None
+        self.Professors = None
+        self.ProfIndex = None
+
+    def GetVisitors(self):
+
+        # Build the visitor objects if this hasn't been done already
+        if self.Visitors is None:
+            self.Visitors = BuildVisitors(self.VisitorFrame, self.PreferredProfessors)
+
+        # Return the result
+        return self.Visitors
+
+    def GetProfessors(self):
+
+        # Build the professor objects if this hasn't been done already
+        if self.Professors is None:
+            self.Professors = BuildProfessors(self.ProfessorNames, self.AvailabilityMatrix)
+
+        # Return the result
+        return self.Professors
+
+    def GetProfessorIndex(self):
+
+        # Build the index of professor names if this hasn't been done already
+        if self.ProfIndex is None:
+            self.ProfIndex = ProfessorIndex(self.GetProfessors())
+
+        # Return the result
+        return self.ProfIndex
+
+    def Copy(self):
+        # Returns a copy whose visitor and professor objects (and availability matrix) can be changed without affecting
+        # this one, e.g., to solve several variants of the same event at once.  The read-only arrays are shared.
+        Data = InputData()
+        (Data.VisitorFrame, Data.PreferredProfessors, Data.ProfessorNames, Data.TimeSlots) = (self.VisitorFrame, self.PreferredProfessors, self.ProfessorNames, self.TimeSlots)
+        Data.AvailabilityMatrix = self.AvailabilityMatrix.copy()
+        return Data
+
+# Define the function for checking that a sheet has all the expected columns
+def CheckExpectedColumns(df, SheetName, ExpectedColumns):
+    # Raises a ValueError naming the first missing column, if any
 
     # Check that each of the expected columns is present
     for ColName in ExpectedColumns:
         if ColName not in df.columns:
-            print('Error: I was expecting the \"%s\" sheet to have a column called \"%s\", but I could find no such column.' % (SheetName, ColName))
-            exit()
+            raise ValueError('I was expecting the \"%s\" sheet to have a column called \"%s\", but I could find no such column.' % (SheetName, ColName))
 
-    # Loop over all the rows of the data frame
-    for (i, row) in df.iterrows():
+# Define the function for reading the visitor sheet into arrays
+def ReadVisitorArrays(ExcelFileName, SheetName = 'Visitor Preferences'):
+    # ExcelFileName can be either the name of the workbook or an open ExcelFile
+    # Returns:
+    #   VisitorFrame = a data frame with the first name, last name, and availability of each visitor
+    #   PreferredProfessors = a series with one entry per preferred professor, indexed by visitor id and in rank order
 
-        # Instantiate a new visitor
-        v = Visitor()
+    # Read the visitor preferences into a data frame
+    df = pd.read_excel(io=ExcelFileName, sheet_name=SheetName)
 
-        # Specify the index for this visitor
-        v.Id = i
+    # Check that each of the expected columns is present
+    CheckExpectedColumns(df, SheetName, ['First Name', 'Last Name', 'Availability', 'Preferred Professor Meetings'])
 
-        # Retrieve the visitor's first and last name
-        v.FirstName = row['First Name']
-        v.LastName = row['Last Name']
+    # Normalize the index so that it can serve as the visitor id
+    df = df.reset_index(drop=True)
 
-        # Retrieve the list of preferred professors as a string
-        PreferredProfessorsString = row['Preferred Professor Meetings']
+    # Extract the visitor information
+    VisitorFrame = pd.DataFrame({
+        'First Name' : df['First Name'],
+        'Last Name' : df['Last Name'],
+        'Availability' : df['Availability'].fillna('na').astype(str).str.strip(),
+    })
 
-        # Retrieve the visitor's availability
-        v.Availability = str(row['Availability'])
-        
-        # Convert the string into a list
-        v.PreferredProfessors = PreferredProfessorsString.split(', ')
+    # Split the comma-separated lists of preferred professors into one row per entry
+    PreferredProfessors = df['Preferred Professor Meetings'].fillna('').astype(str).str.split(',').explode().str.strip()
 
-        # Add this visitor to the growing dictionary of visitors
-        Visitors[v.Id] = v
-
-    # Print out a status update
-    print('\tSuccessfully read in the information of %d visitors.' %len(Visitors) )
+    # Drop any empty entries (e.g., visitors without preferences or trailing commas)
+    PreferredProfessors = PreferredProfessors[PreferredProfessors != '']
 
     # Return the result
-    return Visitors
+    return (VisitorFrame, PreferredProfessors)
 
-# Define the function for importing the professor information
-def ImportProfessorInfo():
-
-     # Specify the name of the excel file
-    ProfessorInfoExcelFile = 'Input Data.xlsx'
+# Define the function for reading the professor sheet into arrays
+def ReadProfessorArrays(ExcelFileName):
+    # ExcelFileName can be either the name of the workbook or an open ExcelFile
+    # Returns:
+    #   ProfessorNames = an array with the last name of each professor
+    #   AvailabilityMatrix = a boolean professor x time slot array
+    #   TimeSlots = a dictionary mapping each time slot index to its label
 
     # Identify the sheet
     SheetName = 'Professor Availability'
 
-    # Print out a status update
-    print('Attempting to import the professor information from \"%s%s%s\"...' %(os.getcwd(), os.sep, ProfessorInfoExcelFile))
-
     # Read the professor info into a data frame
-    df = pd.read_excel(io=ProfessorInfoExcelFile, sheet_name=SheetName)
+    df = pd.read_excel(io=ExcelFileName, sheet_name=SheetName)
 
     # List the expected columns
     ExpectedColumns = [
@@ -114,50 +334,176 @@ def ImportProfessorInfo():
     ]
 
     # Check that each of the expected columns is present
-    for ColName in ExpectedColumns:
-        if ColName not in df.columns:
-            print('Error: I was expecting the \"%s\" sheet to have a column called \"%s\", but I could find no such column.' % (SheetName, ColName))
-            exit()
-
-    # Count the number of columns that do not correspond to a time slot
-    NonTimeColumns = len(ExpectedColumns)
+    CheckExpectedColumns(df, SheetName, ExpectedColumns)
 
-    # Count the number of time slots
-    NumTimeSlots = len(df.columns) - NonTimeColumns
+    # Every remaining column corresponds to a time slot
+    TimeColumns = [ColName for ColName in df.columns if ColName not in ExpectedColumns]
 
     # Generate the dictionary of time slots
-    TimeSlots = dict()
-    for t in range(NumTimeSlots):
+    TimeSlots = {t : str(ColName) for (t, ColName) in enumerate(TimeColumns)}
 
-        # Add an entry for the current time slot
-        TimeSlots[t] = str(df.columns[NonTimeColumns + t])
+    # Load the whole availability grid at once, with a 1 indicating availability
+    AvailabilityMatrix = (df[TimeColumns].to_numpy() == 1)
+
+    # Extract the professors' last names
+    ProfessorNames = df['Last Name'].to_numpy()
+
+    # Return the result
+    return (ProfessorNames, AvailabilityMatrix, TimeSlots)
+
+# Define the function for building the visitor objects from the visitor arrays
+def BuildVisitors(VisitorFrame, PreferredProfessors):
+
+    # Group the preferred professors by visitor
+    PreferenceLists = PreferredProfessors.groupby(level=0, sort=False).agg(list).to_dict()
+
+    # Instantiate the dictionary of visitors
+    Visitors = dict()
+
+    # Loop over the visitors
+    for (i, FirstName, LastName, Availability) in zip(VisitorFrame.index, VisitorFrame['First Name'], VisitorFrame['Last Name'], VisitorFrame['Availability']):
+
+        # Instantiate a new visitor
+        v = Visitor()
+        v.Id = int(i)
+        v.FirstName = FirstName
+        v.LastName = LastName
+        v.Availability = Availability
+        v.PreferredProfessors = PreferenceLists.get(i, [])
+
+        # Add this visitor to the growing dictionary of visitors
+        Visitors[v.Id] = v
+
+    # Return the result
+    return Visitors
+
+# Define the function for building the professor objects from the professor arrays
+def BuildProfessors(ProfessorNames, AvailabilityMatrix):
 
     # Instantiate the dictionary of professors
     Professors = dict()
 
-    # Loop over all the rows of the data frame
-    for (i, row) in df.iterrows():
+    # Loop over the professors
+    for (i, LastName) in enumerate(ProfessorNames):
 
-        # Instantiate a new professor
+        # Instantiate a new professor whose availability is a view onto the availability matrix
         p = Professor()
-
-        # Specify the index for this visitor
         p.Id = i
+        p.LastName = LastName
+        p.Availability = AvailabilityView(AvailabilityMatrix, i)
 
-        # Retrieve the professor's first and last name
-        p.LastName = row['Last Name']
+        # Add this professor to the growing dictionary of professors
+        Professors[p.Id] = p
 
-        # Loop over the time slots
-        for t in TimeSlots:
+    # Return the result
+    return Professors
+
+# Define the function for hashing the contents of a file
+def HashFile(FileName):
+    # Returns the SHA-256 hash of the file as a string of hexadecimal digits
+    Hash = hashlib.sha256()
+    with open(FileName, 'rb') as File:
+        for Chunk in iter(lambda: File.read(1 << 20), b''):
+            Hash.update(Chunk)
+    return Hash.hexdigest()
+
+# Define the function for loading a parsed workbook from the cache
+def LoadCachedInputData(CacheFileName):
+    # Returns the InputData saved by SaveCachedInputData, or None if the file doesn't exist or can't be used
+
+    # Check that the file exists
+    if not os.path.isfile(CacheFileName):
+        return None
+
+    # Load the arrays, treating any problem (e.g., a file written by an older version) as a cache miss
+    try:
+        with open(CacheFileName, 'rb') as File:
+            (Version, VisitorFrame, PreferredProfessors, ProfessorNames, AvailabilityMatrix, TimeSlots) = pickle.load(File)
+    except Exception:
+        return None
+    if Version != InputCacheVersion:
+        return None
+
+    # Rebuild the input data
+    Data = InputData()
+    (Data.VisitorFrame, Data.PreferredProfessors, Data.ProfessorNames, Data.AvailabilityMatrix, Data.TimeSlots) = (VisitorFrame, PreferredProfessors, ProfessorNames, AvailabilityMatrix, TimeSlots)
 
-            # Extract the professor's availability for the current time slot
-            if row[NonTimeColumns + t] == 1:
-                p.Availability[t] = True
-            else:
-                p.Availability[t] = False
+    # Return the result
+    return Data
+
+# Define the function for saving a parsed workbook to the cache
+def SaveCachedInputData(Data, CacheFileName):
+
+    # Write the arrays to a temporary file first, so that an interrupted run can't leave a broken file in the cache
+    try:
+        os.makedirs(os.path.dirname(CacheFileName), exist_ok=True)
+        TemporaryFileName = '%s.%d.tmp' % (CacheFileName, os.getpid())
+        with open(TemporaryFileName, 'wb') as File:
+            pickle.dump((InputCacheVersion, Data.VisitorFrame, Data.PreferredProfessors, Data.ProfessorNames, Data.AvailabilityMatrix, Data.TimeSlots), File, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(TemporaryFileName, CacheFileName)
+    except OSError as Error:
+        print('Warning: The parsed workbook could not be saved to the cache (%s).' % Error)
+
+# Define the function for reading in all of the input data
+def ImportInputData(ExcelFileName = 'Input Data.xlsx', UseCache = True):
+    # Returns the InputData of the workbook.  Unless UseCache is False, the parsed workbook is saved in the cache directory
+    # under the hash of its contents, and loaded from there (without opening the workbook) until the workbook changes.
+
+    # Look for the workbook in the cache
+    if UseCache:
+        CacheFileName = os.path.join(CacheDirectory, 'Inputs', '%s.pickle' % HashFile(ExcelFileName))
+        Data = LoadCachedInputData(CacheFileName)
+        if Data is not None:
+            print('Loaded the information of %d visitors and %d professors in \"%s\" from the cache.' % (len(Data.VisitorFrame), len(Data.ProfessorNames), os.path.abspath(ExcelFileName)))
+            return Data
+
+    # Instantiate the input data
+    Data = InputData()
+
+    # Open the workbook (once, for both sheets)
+    with pd.ExcelFile(ExcelFileName) as Workbook:
+
+        # Import the visitor information
+        print('Attempting to import the visitor information from \"%s\"...' % os.path.abspath(ExcelFileName))
+        (Data.VisitorFrame, Data.PreferredProfessors) = ReadVisitorArrays(Workbook)
+        print('\tSuccessfully read in the information of %d visitors.' % len(Data.VisitorFrame))
+
+        # Import the professor information
+        print('Attempting to import the professor information from \"%s\"...' % os.path.abspath(ExcelFileName))
+        (Data.ProfessorNames, Data.AvailabilityMatrix, Data.TimeSlots) = ReadProfessorArrays(Workbook)
+        print('\tSuccessfully read in the information of %d professors.' % len(Data.ProfessorNames))
+
+    # Save the parsed workbook to the cache
+    if UseCache:
+        SaveCachedInputData(Data, CacheFileName)
 
-        # Add this professor to the growing dictionary of professors
-        Professors[p.Id] = p
+    # Return the result
+    return Data
+
+# Define the function for reading in the visitor information
+def ImportVisitorInfo(ExcelFileName = 'Input Data.xlsx'):
+
+    # Print out a status update
+    print('Attempting to import the visitor information from \"%s\"...' % os.path.abspath(ExcelFileName))
+
+    # Read the visitor information and build the visitor objects
+    Visitors = BuildVisitors(*ReadVisitorArrays(ExcelFileName))
+
+    # Print out a status update
+    print('\tSuccessfully read in the information of %d visitors.' %len(Visitors) )
+
+    # Return the result
+    return Visitors
+
+# Define the function for importing the professor information
+def ImportProfessorInfo(ExcelFileName = 'Input Data.xlsx'):
+
+    # Print out a status update
+    print('Attempting to import the professor information from \"%s\"...' % os.path.abspath(ExcelFileName))
+
+    # Read the professor information and build the professor objects
+    (ProfessorNames, AvailabilityMatrix, TimeSlots) = ReadProfessorArrays(ExcelFileName)
+    Professors = BuildProfessors(ProfessorNames, AvailabilityMatrix)
 
     # Print out a status update
     print('\tSuccessfully read in the information of %d professors.' %len(Professors) )
@@ -165,39 +511,80 @@ def ImportProfessorInfo():
     # Return the result
     return (Professors, TimeSlots)
 
-# Define the function for looking up a professor's ID number
-def GetProfID(ProfLastName):
-    # Returns the ID number associated with the given prof's last name
+# Define the function for normalizing a name before it is looked up
+def NormalizeName(Name):
+    # Ignores differences in case and whitespace, e.g., " von  Smith" and "Von Smith" are treated as the same name.
+    return ' '.join(str(Name).split()).casefold()
 
-    # Generate the list of professor last names
-    ProfLastNames = [p.LastName for p in Professors.values()]
+# Define the class for looking up professors' ID numbers by name
+class ProfessorIndex():
+    # Maps normalized professor names (and any aliases) to professor ID numbers in constant time.
 
-    # Check if this last name is in the list.
-    if ProfLastName in ProfLastNames: # it's there
+    def __init__(self, Professors, Aliases = None):
+        # Inputs:
+        #   Professors = the dictionary of professors
+        #   Aliases = a dictionary mapping alternative spellings (e.g., 'Smith J.') to the last name used in the
+        #             Professor Availability sheet (e.g., 'Smith').  Defaults to ProfessorAliases.
 
-        # Find the position of the last name in the list of professor last names
-        ListIndex = ProfLastNames.index(ProfLastName)
+        # Instantiate the dictionary of ID numbers
+        self.Ids = dict()
 
-        # Find the ID number corresponding to this list index
-        ProfId = [p.Id for p in Professors.values()][ListIndex]
+        # Add each professor's last name.  If two professors share a last name, the first one wins.
+        for p in Professors:
+            self.Ids.setdefault(NormalizeName(Professors[p].LastName), p)
 
-    else: # it's not there
+        # Add the aliases of any recognized professors
+        if Aliases is None:
+            Aliases = ProfessorAliases
+        for (Alias, LastName) in Aliases.items():
+            if NormalizeName(LastName) in self.Ids:
+                self.Ids.setdefault(NormalizeName(Alias), self.Ids[NormalizeName(LastName)])
 
-        # Raise an error
-        raise ValueError
+    def Lookup(self, Name):
+        # Returns the ID number associated with the given name, raising a ValueError if the name isn't recognized
 
-        # Specify a clearly incorrect value for the ID number
-        ProfId = -1
+        # Try the name as given
+        Key = NormalizeName(Name)
+        if Key in self.Ids:
+            return self.Ids[Key]
 
-    # Return the result
-    return ProfId
+        # Try again without any trailing initials (e.g., "Smith J." becomes "Smith")
+        Words = Key.split(' ')
+        while len(Words) > 1 and len(Words[-1].rstrip('.')) == 1:
+            Words.pop()
+            if ' '.join(Words) in self.Ids:
+                return self.Ids[' '.join(Words)]
 
-# Define the function for calculating the number of "preference points" that each visitor associates with each professor
-def CalcPreferencePoints(Visitors, Professors):
-    # Builds up the dictionary of preference points for each visitor.
+        # The name isn't recognized
+        raise ValueError('Unrecognized professor: %s' % Name)
 
-    # Specify the maximum number of preference points
-    MaxPreferencePoints = 10
+# Define the function for looking up a professor's ID number
+def GetProfID(ProfLastName, ProfIndex):
+    # Returns the ID number associated with the given prof's last name
+    #
+    # Inputs:
+    #   ProfLastName = the professor's last name (or one of their aliases)
+    #   ProfIndex = the ProfessorIndex built from the dictionary of professors
+    return ProfIndex.Lookup(ProfLastName)
+
+# Define the function for calculating the rank that each visitor gives each professor
+def CalcPreferenceRanks(Visitors, Professors, ProfIndex = None):
+    # Returns:
+    #   PreferenceRanks = an integer visitor x professor matrix holding the position of each professor in each visitor's
+    #                     list of preferred professors, with 1 being the most preferred and 0 meaning the professor isn't listed
+    #   UnrecognizedProfs = the list of preferred professors that could not be found among the professors
+    #
+    # Inputs:
+    #   Visitors = the dictionary of visitors
+    #   Professors = the dictionary of professors
+    #   ProfIndex = the ProfessorIndex of the professors (built here if not provided)
+
+    # Build the index of professor names, if necessary
+    if ProfIndex is None:
+        ProfIndex = ProfessorIndex(Professors)
+
+    # Instantiate the matrix of ranks, with one row per visitor id and one column per professor id
+    PreferenceRanks = np.zeros((max(Visitors, default=-1) + 1, max(Professors, default=-1) + 1), dtype=int)
 
     # Instantiate the list of unrecognized professors
     UnrecognizedProfs = []
@@ -205,10 +592,6 @@ def CalcPreferencePoints(Visitors, Professors):
     # Loop over each of the visitors
     for v in Visitors.values():
 
-        # Initialize all dictionary of preference points with all zeros
-        for p in Professors:
-            v.PreferencePoints[p] = 0
-
         # Loop over each of the professors in this visitor's list of preferred professors.
         for i in range(len(v.PreferredProfessors)):
 
@@ -217,13 +600,10 @@ def CalcPreferencePoints(Visitors, Professors):
 
             # Lookup the id number corresponding to this professor
             try:
-                ProfId = GetProfID(ProfLastName)
+                ProfId = GetProfID(ProfLastName, ProfIndex)
                 
             except ValueError:
 
-                # Set the flag to indicate failure in the attempt to get the ID
-                GetIdSuccess = False
-
                 # check if the prof's last name has already been added to the list of unrecognized professors
                 if not ProfLastName in UnrecognizedProfs:
 
@@ -236,18 +616,53 @@ def CalcPreferencePoints(Visitors, Professors):
 
             else:
 
-                # Raise the flag to indicate success in getting the ID
-                GetIdSuccess = True
+                # Record the rank, unless the professor was already listed higher up
+                if PreferenceRanks[v.Id, ProfId] == 0:
+                    PreferenceRanks[v.Id, ProfId] = i + 1
+
+    # Return the result
+    return (PreferenceRanks, UnrecognizedProfs)
+
+# Define the function for calculating the number of "preference points" that each visitor associates with each professor
+def CalcPreferencePoints(Visitors, Professors, ProfIndex = None, Scheme = None):
+    # Builds up the matrix of preference points and the dictionary of preference points for each visitor.  Each visitor's
+    # dictionary only holds the professors with nonzero points.
+    #
+    # Inputs:
+    #   Visitors = the dictionary of visitors
+    #   Professors = the dictionary of professors
+    #   ProfIndex = the ProfessorIndex of the professors (built here if not provided)
+    #   Scheme = 'flat' to give every preferred professor one point, or 'rank' to give more points to the professors listed
+    #            first (defaults to PreferenceScheme)
+    # Outputs:
+    #   PreferenceMatrix = an integer visitor x professor matrix of preference points
+
+    # Specify the maximum number of preference points
+    MaxPreferencePoints = 10
 
-            # Check if the ID was successfully retrieved
-            if GetIdSuccess == True:
+    # Look up the position of each professor in each visitor's list of preferred professors
+    (PreferenceRanks, UnrecognizedProfs) = CalcPreferenceRanks(Visitors, Professors, ProfIndex)
 
-                # Add the professor to the dictionary with the appropriate number of preference points
-                v.PreferencePoints[ProfId] = 1
+    # Convert the ranks into points
+    if Scheme is None:
+        Scheme = PreferenceScheme
+    if Scheme == 'flat':
+        PreferenceMatrix = (PreferenceRanks > 0).astype(int)
+    elif Scheme == 'rank':
+        PreferenceMatrix = np.where(PreferenceRanks > 0, np.maximum(MaxPreferencePoints + 1 - PreferenceRanks, 1), 0)
+    else:
+        raise ValueError('Unknown preference scheme: %s' % Scheme)
+
+    # Store the nonzero entries in each visitor's dictionary of preference points
+    for v in Visitors.values():
+        v.PreferencePoints = {int(p) : int(PreferenceMatrix[v.Id, p]) for p in np.flatnonzero(PreferenceMatrix[v.Id])}
 
         # Print the results for the current visitor
         #PrintPreferencePoints(v, Professors)
 
+    # Return the result
+    return PreferenceMatrix
+
 def PrintPreferencePoints(Visitor, Professors):
     # Input:
     #   Visitor = the object of the visitor whose preference points you'd like to print
@@ -268,354 +683,2614 @@ def PrintPreferencePoints(Visitor, Professors):
         # Print out the result
         print(PrintString)
 
+# Define the function for checking whether a visitor can attend meetings during a given time slot
+def VisitorCanMeet(Visitor, t):
+    # Returns True if the visitor's availability window includes time slot t
+    #
+    # Inputs:
+    #   Visitor = the visitor object
+    #   t = the time slot index
+
+    # Check the visitor's availability window
+    if Visitor.Availability == 'morning':
+        return t < AfternoonStartSlot
+    elif Visitor.Availability == 'afternoon':
+        return t >= AfternoonStartSlot
+    else:
+        return True
+
+# Define the function for enumerating the meetings that could possibly take place
+def GetFeasibleMeetings(Visitors, Professors, TimeSlots):
+    # Returns the list of (visitor, professor, time slot) triples for which a meeting is possible, i.e., the professor is
+    # available during the time slot and the time slot lies within the visitor's availability window.
+    #
+    # Inputs:
+    #   Visitors = a dictionary of visitors.
+    #   Professors = a dictionary of professors
+    #   TimeSlots = a list of time slot indices
+
+    # Instantiate the list of feasible meetings
+    FeasibleMeetings = []
+
+    # Loop over the professors
+    for p in Professors:
+
+        # Find the time slots during which this professor is available
+        ProfTimeSlots = [t for t in TimeSlots if Professors[p].Availability[t] == True]
+
+        # Loop over the visitors
+        for v in Visitors:
+
+            # Add each time slot that also works for the visitor
+            for t in ProfTimeSlots:
+                if VisitorCanMeet(Visitors[v], t):
+                    FeasibleMeetings.append((v,p,t))
+
+    # Return the result
+    return FeasibleMeetings
+
+# Define the class which restricts the model to part of the problem
+class ModelScope():
+    # Used to re-optimize only part of a schedule (e.g., after a last-minute change) while keeping the rest as it is.
+
+    def __init__(self):
+        self.FeasibleMeetings = None # if not None, the list of the only (visitor, professor, time slot) triples considered
+        self.FixedMeetings = set() # the set of meetings which must take place
+        self.MeetingBonus = dict() # a dictionary mapping meetings to an extra objective weight (e.g., for keeping a published meeting)
+        self.MaxMeetings = dict() # a dictionary mapping visitors to a lower maximum number of meetings than RequiredFreePeriods allows
+
+    def IsWholeProblem(self):
+        # Returns True if the scope doesn't restrict the problem in any way
+        return self.FeasibleMeetings is None and len(self.FixedMeetings) == 0 and len(self.MeetingBonus) == 0 and len(self.MaxMeetings) == 0
+
+# Define the function for enumerating the meetings within the scope of the model
+def GetScopedMeetings(Visitors, Professors, TimeSlots, Scope = None):
+    # Returns the feasible meetings, restricted to the scope (if there is one)
+    if Scope is None or Scope.FeasibleMeetings is None:
+        return GetFeasibleMeetings(Visitors, Professors, TimeSlots)
+    else:
+        return Scope.FeasibleMeetings
+
+# Define the function for counting the size of the original (dense) formulation
+def CountDenseModelSize(Visitors, Professors, TimeSlots):
+    # Returns the number of variables and constraints that the dense formulation (one meeting variable for every visitor,
+    # professor, and time slot) would have had.  This is used to report the savings of the sparse formulation.
+
+    # Count the entities
+    NumVisitors = len(Visitors)
+    NumProfessors = len(Professors)
+    NumTimeSlots = len(TimeSlots)
+
+    # Count the variables (the meeting variables plus MinMeetings and MinHappiness)
+    NumVariables = NumVisitors * NumProfessors * NumTimeSlots + 2
+
+    # Count the time slots that each visitor is forbidden from using
+    NumForbiddenSlots = sum(
+        sum(1 for t in TimeSlots if not VisitorCanMeet(Visitors[v], t))
+        for v in Visitors
+    )
+
+    # Count the constraints
+    NumConstraints = (
+        NumVisitors * NumTimeSlots                      # one meeting per visitor per time slot
+        + NumForbiddenSlots * NumProfessors             # visitor time windows
+        + NumProfessors * NumTimeSlots                  # one meeting per professor per time slot
+        + NumProfessors * NumTimeSlots * NumVisitors    # professor availability
+        + NumProfessors * NumVisitors                   # each pair meets at most once
+        + 3 * NumVisitors                               # min meetings, min happiness, free periods
+    )
+
+    # Return the result
+    return (NumVariables, NumConstraints)
+
+# Define the function for grouping the meetings for building the constraints
+def GroupMeetings(Visitors, FeasibleMeetings):
+    # Returns dictionaries mapping each (visitor, time slot), (professor, time slot), and (visitor, professor) pair, as
+    # well as each visitor, to the list of feasible meetings involving them.
+
+    # Instantiate the dictionaries
+    MeetingsByVisitorSlot = dict()
+    MeetingsByProfSlot = dict()
+    MeetingsByPair = dict()
+    MeetingsByVisitor = {v : [] for v in Visitors}
+
+    # Sort each meeting into its groups
+    for (v,p,t) in FeasibleMeetings:
+        MeetingsByVisitorSlot.setdefault((v,t), []).append((v,p,t))
+        MeetingsByProfSlot.setdefault((p,t), []).append((v,p,t))
+        MeetingsByPair.setdefault((v,p), []).append((v,p,t))
+        MeetingsByVisitor[v].append((v,p,t))
+
+    # Return the result
+    return (MeetingsByVisitorSlot, MeetingsByProfSlot, MeetingsByPair, MeetingsByVisitor)
+
+# Define the function for finding the visitors and professors who are interchangeable
+def FindInterchangeableGroups(Visitors, Professors, TimeSlots):
+    # Two visitors are interchangeable if they can meet during the same time slots and assign the same preference points
+    # to every professor.  Two professors are interchangeable if they are available during the same time slots and every
+    # visitor assigns them the same preference points.
+    # Returns:
+    #   VisitorGroups = a list of the lists of interchangeable visitors (only groups of two or more are listed)
+    #   ProfessorGroups = a list of the lists of interchangeable professors (only groups of two or more are listed)
+
+    # Group the visitors by their time slots and preference points
+    VisitorGroups = dict()
+    for v in Visitors:
+        Key = (tuple(VisitorCanMeet(Visitors[v], t) for t in TimeSlots), frozenset(Visitors[v].PreferencePoints.items()))
+        VisitorGroups.setdefault(Key, []).append(v)
+
+    # Group the professors by their availability and the preference points the visitors assign them
+    ProfessorGroups = dict()
+    for p in Professors:
+        Key = (tuple(Professors[p].Availability[t] for t in TimeSlots), tuple(Visitors[v].PreferencePoints.get(p, 0) for v in Visitors))
+        ProfessorGroups.setdefault(Key, []).append(p)
+
+    # Return the result
+    return ([Group for Group in VisitorGroups.values() if len(Group) > 1], [Group for Group in ProfessorGroups.values() if len(Group) > 1])
+
+# Define the function for listing the symmetry-breaking constraints
+def GetSymmetryBreakingRows(Visitors, Professors, TimeSlots, Meeting):
+    # Swapping the schedules of two interchangeable visitors (or professors) gives another schedule with the same objective,
+    # which only slows down the search.  Since the schedules of the visitors in a group can always be reordered so that their
+    # numbers of meetings are in decreasing order (and likewise for the professors, which doesn't change the visitors'
+    # numbers of meetings), the solver only needs to consider such schedules.
+    # Returns:
+    #   Rows = a list of (Larger, Smaller) pairs of lists of meetings, each standing for the constraint that the meetings in
+    #          Larger add up to at least the meetings in Smaller
+    #   NumGroups = the number of groups of interchangeable visitors and the number of groups of interchangeable professors
+
+    # Find the interchangeable visitors and professors
+    (VisitorGroups, ProfessorGroups) = FindInterchangeableGroups(Visitors, Professors, TimeSlots)
+
+    # Group the meetings by visitor and by professor
+    MeetingsByVisitor = {v : [] for v in Visitors}
+    MeetingsByProfessor = {p : [] for p in Professors}
+    for (v,p,t) in Meeting:
+        MeetingsByVisitor[v].append((v,p,t))
+        MeetingsByProfessor[p].append((v,p,t))
+
+    # Order the numbers of meetings within each group
+    Rows = []
+    for Group in VisitorGroups:
+        Rows += [(MeetingsByVisitor[a], MeetingsByVisitor[b]) for (a,b) in zip(Group, Group[1:])]
+    for Group in ProfessorGroups:
+        Rows += [(MeetingsByProfessor[a], MeetingsByProfessor[b]) for (a,b) in zip(Group, Group[1:])]
+
+    # Return the result
+    return (Rows, (len(VisitorGroups), len(ProfessorGroups)))
+
+# Define the class which holds the outcome of the pre-solve analysis
+class FeasibilityAnalysis():
+    # Found by AnalyzeFeasibility from the structure of the problem alone, before any model is built
+
+    def __init__(self):
+        self.Problem = None # a description of the constraint which rules out every schedule, or None if the model has a solution
+        self.MaxTotalMeetings = 0 # an upper bound on the total number of meetings
+        self.MaxMinMeetings = 0 # an upper bound on the minimum number of meetings of any visitor
+        self.MaxMinHappiness = 0 # an upper bound on the minimum happiness score of any visitor
+        self.Windows = [] # a list with a (window, number of visitors, upper bound on their minimum number of meetings when scheduled on their own) triple for each availability window
+        self.Bottleneck = '' # a description of what limits the minimum number of meetings
+
+    def PrintSummary(self):
+        # Prints the outcome of the analysis
+        if self.Problem is not None:
+            print('\tThe model has no solution.  %s' % self.Problem)
+            return
+        print('\tAt most %d meetings can take place, and no schedule can give every visitor more than %d meetings or %d happiness points.' % (self.MaxTotalMeetings, self.MaxMinMeetings, self.MaxMinHappiness))
+        for (Window, NumVisitors, MaxMinMeetings) in self.Windows:
+            print('\t\tThe %d %s visitors could have at most %d meetings each if they were scheduled on their own.' % (NumVisitors, Window, MaxMinMeetings))
+        print('\tThe minimum number of meetings is limited by %s.' % self.Bottleneck)
+
+    def ToDict(self):
+        # Returns the analysis in the form saved to the run report
+        return {
+            'Problem' : self.Problem,
+            'Max total meetings' : self.MaxTotalMeetings,
+            'Max minimum meetings' : self.MaxMinMeetings,
+            'Max minimum happiness' : self.MaxMinHappiness,
+            'Windows' : [{'Window' : Window, 'Visitors' : NumVisitors, 'Max minimum meetings' : MaxMinMeetings} for (Window, NumVisitors, MaxMinMeetings) in self.Windows],
+            'Bottleneck' : self.Bottleneck,
+        }
+
+# Define the function for analyzing the problem before building the model
+def AnalyzeFeasibility(Visitors, Professors, TimeSlots, Parameters = None, Scope = None):
+    # Checks whether the model has a solution (and if not, which constraint rules one out), and bounds the total number of
+    # meetings, the minimum number of meetings, and the minimum happiness score from above, in milliseconds and without
+    # building the model.  The only constraints which can rule out every schedule are the free periods (when a visitor
+    # isn't allowed even zero meetings) and the fixed meetings of the scope, so both are checked directly.  The bounds come
+    # from a maximum flow from each visitor (who can have at most their maximum number of meetings, and at most one meeting
+    # with each professor they can meet) through the time slots they can meet during (one meeting each) to the professors
+    # available during each time slot (one meeting each).  This only relaxes the rule that each pair meets at most once, so
+    # the bounds can't be exceeded, although they aren't always reached.
+    # Returns:
+    #   Analysis = a FeasibilityAnalysis
+
+    # Use the default parameters and scope, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+    if Scope is None:
+        Scope = ModelScope()
+
+    # Instantiate the analysis
+    Analysis = FeasibilityAnalysis()
+
+    # Find the maximum number of meetings of each visitor
+    RequiredFreePeriods = Parameters['RequiredFreePeriods']
+    MaxMeetings = {v : Scope.MaxMeetings.get(v, len(TimeSlots) - RequiredFreePeriods) for v in Visitors}
+
+    # Check that every visitor is allowed at least zero meetings
+    for v in Visitors:
+        if MaxMeetings[v] < 0:
+            if RequiredFreePeriods > len(TimeSlots):
+                Analysis.Problem = 'Each visitor must have %d free periods, but there are only %d time slots.' % (RequiredFreePeriods, len(TimeSlots))
+            else:
+                Analysis.Problem = 'Visitor %s %s is allowed at most %d meetings.' % (Visitors[v].FirstName, Visitors[v].LastName, MaxMeetings[v])
+            return Analysis
+
+    # Find the time slots during which each visitor can meet someone, the professors each visitor can meet, and the
+    # professors available during each time slot.  For the whole problem, these follow from the visitors' availability
+    # windows, without enumerating every feasible meeting.
+    SlotProfessors = {t : set() for t in TimeSlots}
+    VisitorSlots = {v : set() for v in Visitors}
+    VisitorProfessors = {v : set() for v in Visitors}
+    if Scope.FeasibleMeetings is None:
+        for p in Professors:
+            for t in TimeSlots:
+                if Professors[p].Availability[t] == True:
+                    SlotProfessors[t].add(p)
+        WindowSets = dict()
+        for v in Visitors:
+            if Visitors[v].Availability not in WindowSets:
+                Slots = {t for t in TimeSlots if VisitorCanMeet(Visitors[v], t) and len(SlotProfessors[t]) > 0}
+                WindowSets[Visitors[v].Availability] = (Slots, set().union(*(SlotProfessors[t] for t in Slots)))
+            (VisitorSlots[v], VisitorProfessors[v]) = WindowSets[Visitors[v].Availability]
+    else:
+        for (v,p,t) in Scope.FeasibleMeetings:
+            SlotProfessors[t].add(p)
+            VisitorSlots[v].add(t)
+            VisitorProfessors[v].add(p)
+
+    # Check that the fixed meetings (among those within the scope) can all take place together
+    if Scope.FeasibleMeetings is not None:
+        FeasibleSet = set(Scope.FeasibleMeetings)
+        FixedMeetings = sorted(k for k in Scope.FixedMeetings if k in FeasibleSet)
+    else:
+        FixedMeetings = sorted((v,p,t) for (v,p,t) in Scope.FixedMeetings if v in Visitors and t in VisitorSlots[v] and p in SlotProfessors[t])
+    Booked = set()
+    NumFixedMeetings = {v : 0 for v in Visitors}
+    for (v,p,t) in FixedMeetings:
+        for (Key, Description) in [(('Visitor', v, t), 'Visitor %s %s has two fixed meetings during %s.' % (Visitors[v].FirstName, Visitors[v].LastName, TimeSlots[t])),
+                                   (('Professor', p, t), 'Professor %s has two fixed meetings during %s.' % (Professors[p].LastName, TimeSlots[t])),
+                                   (('Pair', v, p), 'Visitor %s %s has two fixed meetings with Professor %s.' % (Visitors[v].FirstName, Visitors[v].LastName, Professors[p].LastName))]:
+            if Key in Booked:
+                Analysis.Problem = Description
+                return Analysis
+            Booked.add(Key)
+        NumFixedMeetings[v] += 1
+        if NumFixedMeetings[v] > MaxMeetings[v]:
+            Analysis.Problem = 'Visitor %s %s has more fixed meetings than the %d they are allowed.' % (Visitors[v].FirstName, Visitors[v].LastName, MaxMeetings[v])
+            return Analysis
+
+    # Nothing else can rule out every schedule, so there is nothing to bound if there are no visitors
+    if len(Visitors) == 0:
+        Analysis.Bottleneck = 'nothing (there are no visitors)'
+        return Analysis
+
+    # Find the most meetings each visitor could have on their own
+    Capacity = {v : min(MaxMeetings[v], len(VisitorSlots[v]), len(VisitorProfessors[v])) for v in Visitors}
+
+    # Build the flow network, from the source (node 0) through the visitors and time slots to the sink (node 1)
+    Flow = max_flow.SimpleMaxFlow()
+    VisitorNode = {v : 2 + i for (i, v) in enumerate(Visitors)}
+    SlotNode = {t : 2 + len(Visitors) + i for (i, t) in enumerate(TimeSlots)}
+    SourceArcs = {v : Flow.add_arc_with_capacity(0, VisitorNode[v], Capacity[v]) for v in Visitors}
+    for v in Visitors:
+        for t in VisitorSlots[v]:
+            Flow.add_arc_with_capacity(VisitorNode[v], SlotNode[t], 1)
+    for t in TimeSlots:
+        Flow.add_arc_with_capacity(SlotNode[t], 1, len(SlotProfessors[t]))
+
+    # Define the function for finding the most meetings when each visitor can have at most the given number
+    def FindMaxFlow(Limits):
+        for v in Visitors:
+            Flow.set_arc_capacity(SourceArcs[v], Limits.get(v, 0))
+        Flow.solve(0, 1)
+        return Flow.optimal_flow()
+
+    # Define the function for finding the largest number of meetings which every visitor of a group can have at once
+    def FindMaxMinMeetings(Group):
+        (Low, High) = (0, min(Capacity[v] for v in Group))
+        while Low < High:
+            Middle = (Low + High + 1) // 2
+            if FindMaxFlow({v : Middle for v in Group}) == Middle * len(Group):
+                Low = Middle
+            else:
+                High = Middle - 1
+        return Low
+
+    # Bound the total and minimum numbers of meetings
+    Analysis.MaxTotalMeetings = FindMaxFlow(Capacity)
+    Analysis.MaxMinMeetings = FindMaxMinMeetings(list(Visitors))
+
+    # Bound the minimum number of meetings of the visitors of each availability window on their own
+    Groups = dict()
+    for v in Visitors:
+        Window = Visitors[v].Availability if Visitors[v].Availability in ('morning', 'afternoon') else 'all-day'
+        Groups.setdefault(Window, []).append(v)
+    Analysis.Windows = [(Window, len(Groups[Window]), FindMaxMinMeetings(Groups[Window])) for Window in Groups]
+
+    # Describe what limits the minimum number of meetings: the visitors of different windows competing for the same
+    # professors, a single visitor's own limit, or the professors available during a window's time slots
+    (Window, NumVisitors, MaxMinMeetings) = min(Analysis.Windows, key=lambda Entry: Entry[2])
+    Limited = [v for v in Groups[Window] if Capacity[v] == MaxMinMeetings]
+    if MaxMinMeetings > Analysis.MaxMinMeetings:
+        Analysis.Bottleneck = 'the visitors of the different windows competing for the same professors'
+    elif len(Limited) > 0:
+        v = Limited[0]
+        if Capacity[v] == MaxMeetings[v] and v in Scope.MaxMeetings:
+            Analysis.Bottleneck = 'the limit of %d meetings of Visitor %s %s' % (MaxMeetings[v], Visitors[v].FirstName, Visitors[v].LastName)
+        elif Capacity[v] == MaxMeetings[v]:
+            Analysis.Bottleneck = 'the %d required free periods (which allow at most %d meetings per visitor)' % (RequiredFreePeriods, MaxMeetings[v])
+        elif Capacity[v] == len(VisitorSlots[v]):
+            Analysis.Bottleneck = 'the %d time slots during which Visitor %s %s can meet anyone' % (len(VisitorSlots[v]), Visitors[v].FirstName, Visitors[v].LastName)
+        else:
+            Analysis.Bottleneck = 'the %d professors whom Visitor %s %s can meet' % (len(VisitorProfessors[v]), Visitors[v].FirstName, Visitors[v].LastName)
+    else:
+        WindowSlots = set().union(*(VisitorSlots[v] for v in Groups[Window]))
+        Analysis.Bottleneck = 'the professors available during the time slots of the %s visitors (%d meetings for %d visitors)' % (Window, sum(len(SlotProfessors[t]) for t in WindowSlots), NumVisitors)
+
+    # Bound the minimum happiness score by the points of each visitor's most preferred professors among those they can meet
+    Analysis.MaxMinHappiness = min(
+        sum(sorted((Visitors[v].PreferencePoints.get(p, 0) for p in VisitorProfessors[v]), reverse=True)[:Capacity[v]])
+        for v in Visitors
+    )
+
+    # Return the result
+    return Analysis
+
 # Define the function for building the optimization model
-def BuildModel(Visitors, Professors, TimeSlots):
+def BuildModel(Visitors, Professors, TimeSlots, Parameters = None, SolverId = 'CBC', Scope = None, Analysis = None):
     # This function builds the constraint programming model for the problem
     # Inputs:
     #   Visitors = a dictionary of visitors.
     #   Professors = a dictionary of professors
     #   TimeSlots = a list of time slot indices
+    #   Parameters = a dictionary of model parameters (defaults to DefaultParameters)
+    #   SolverId = the OR-Tools linear solver that will solve the model (e.g., 'CBC', 'SCIP', or 'HIGHS')
+    #   Scope = an optional ModelScope restricting the model to part of the problem
+    #   Analysis = an optional FeasibilityAnalysis of the same problem, whose bounds are given to the solver
     # Outputs:
     #   model = a CP model object populated with decision variables, constraints, and an objective.
+    #   Meeting = a dictionary mapping each feasible (visitor, professor, time slot) triple to its decision variable.
+    #             Infeasible triples (professor unavailable or time slot outside the visitor's window) are absent.
+
+    # Use the default parameters and scope, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+    if Scope is None:
+        Scope = ModelScope()
+
+    # Print a status update
+    print('Defining the optimization model...')
+
+    # Instantiate the model
+    model = pywraplp.Solver.CreateSolver(SolverId)
+
+    # Check that the solver is available
+    if model is None:
+        raise ValueError('The %s solver is not available in this installation of OR-Tools.' % SolverId)
+
+    # Create the model variables
+    print('\tDefining the decision variables...')
+
+    ## Primary decision variables (only for the meetings that could actually take place, with the fixed meetings forced to 1)
+    Meeting = dict()
+    for (v,p,t) in GetScopedMeetings(Visitors, Professors, TimeSlots, Scope):
+        LowerBound = 1 if (v,p,t) in Scope.FixedMeetings else 0
+        Meeting[(v,p,t)] = model.IntVar(LowerBound, 1, 'Visitor %d assigned to meet with Professor %d during time slot %d.' % (v, p, t))
+
+    ## Group the meeting variables for building the constraints
+    (MeetingsByVisitorSlot, MeetingsByProfSlot, MeetingsByPair, MeetingsByVisitor) = GroupMeetings(Visitors, Meeting)
+
+    ## Secondary decision variables (bounded by the pre-solve analysis, if there is one)
+    MinMeetings = model.NumVar(0, model.infinity() if Analysis is None else Analysis.MaxMinMeetings, 'Minimum Meetings per Visitor')
+
+    MinHappiness = model.NumVar(0, model.infinity() if Analysis is None else Analysis.MaxMinHappiness, 'Minimum Happiness per Visitor')
+
+    # Create the constraints
+    print('\tDefining the constraints...')
+
+    ## Only keep the "at most one meeting" constraints with more than one meeting, if requested, since the others are
+    ## already implied by the bounds of the variables
+    MinRowLength = 2 if Parameters['DropRedundantConstraints'] else 1
+    NumRedundantConstraints = 0
+
+    ## Each visitor can meet with at most one professor during any given time slot
+    for Keys in MeetingsByVisitorSlot.values():
+        if len(Keys) >= MinRowLength:
+            model.Add(
+                sum(Meeting[k] for k in Keys) <= 1
+            )
+        else:
+            NumRedundantConstraints += 1
+
+    ## Visitors can only attend meetings permitted by their timezones
+    ## Each professor can only meet with visitors when the professor is available
+    ## (Both are enforced by omitting the corresponding meeting variables.)
+
+    ## Each professor can meet with at most one visitor during any given time slot
+    for Keys in MeetingsByProfSlot.values():
+        if len(Keys) >= MinRowLength:
+            model.Add(
+                sum(Meeting[k] for k in Keys) <= 1
+            )
+        else:
+            NumRedundantConstraints += 1
+
+    ## Each professor-visitor pair can meet at most once
+    for Keys in MeetingsByPair.values():
+        if len(Keys) >= MinRowLength:
+            model.Add(
+                sum(Meeting[k] for k in Keys) <= 1
+            )
+        else:
+            NumRedundantConstraints += 1
+
+    ## Each visitor must have at least the minimum number of meetings
+    for v in Visitors:
+        model.Add(
+            sum(Meeting[k] for k in MeetingsByVisitor[v])
+            >=
+            MinMeetings
+        )
+
+    ## Each visitor must have at least the minimum happiness score
+    for v in Visitors:
+        model.Add(
+            sum(
+                Meeting[(v,p,t)] * Visitors[v].PreferencePoints[p]
+                for (v,p,t) in MeetingsByVisitor[v]
+                if p in Visitors[v].PreferencePoints
+            )
+            >=
+            MinHappiness
+        )
+
+    ## Each visitor must have at least the minimum number of free periods (or any lower limit set by the scope).  If
+    ## requested, this is left out for the visitors who can't meet during enough time slots to reach the limit anyway.
+    RequiredFreePeriods = Parameters['RequiredFreePeriods']
+    for v in Visitors:
+        MaxMeetings = Scope.MaxMeetings.get(v, len(TimeSlots) - RequiredFreePeriods)
+        if Parameters['DropRedundantConstraints'] and len({k[2] for k in MeetingsByVisitor[v]}) <= MaxMeetings:
+            NumRedundantConstraints += 1
+            continue
+        model.Add(
+            sum(Meeting[k] for k in MeetingsByVisitor[v])
+            <=
+            MaxMeetings
+        )
+
+    ## Interchangeable visitors and professors must have their numbers of meetings in decreasing order, if requested.  This
+    ## is only valid for the whole problem, since a scope can treat interchangeable visitors or professors differently.
+    SymmetryBreakingRows = []
+    NumGroups = (0, 0)
+    if Parameters['BreakSymmetry'] and Scope.IsWholeProblem():
+        (SymmetryBreakingRows, NumGroups) = GetSymmetryBreakingRows(Visitors, Professors, TimeSlots, Meeting)
+    for (Larger, Smaller) in SymmetryBreakingRows:
+        model.Add(
+            sum(Meeting[k] for k in Larger)
+            >=
+            sum(Meeting[k] for k in Smaller)
+        )
+
+    # Set the objective
+    print('\tDefining the objective...')
+
+    ## Retrieve the weights of the various objectives
+    Weight = Parameters['Weight']
+
+    ## Define the objective
+    model.Maximize(
+
+        # Maximize the happiness points
+        Weight['Maximize the happiness points'] *
+        sum(
+            Meeting[(v,p,t)] * Visitors[v].PreferencePoints[p]
+            for (v,p,t) in Meeting
+            if p in Visitors[v].PreferencePoints
+        )
+
+        +
+
+        Weight['Maximize the number of meetings'] *
+        sum(
+            Meeting[k]
+            for k in Meeting
+        )
+
+        +
+
+        Weight['Maximize the minimum number of meetings'] * MinMeetings
+
+        +
+
+        Weight['Maximize the minimum happiness score'] * MinHappiness
+
+        +
+
+        # Reward any meetings with a bonus
+        sum(
+            Scope.MeetingBonus[k] * Meeting[k]
+            for k in Scope.MeetingBonus
+            if k in Meeting
+        )
+    )
+
+    # Report the size of the model relative to the dense formulation, along with the effect of each reduction
+    (DenseVariables, DenseConstraints) = CountDenseModelSize(Visitors, Professors, TimeSlots)
+    print('\tThe model has %d variables and %d constraints (the dense formulation would have had %d variables and %d constraints).' % (model.NumVariables(), model.NumConstraints(), DenseVariables, DenseConstraints))
+    print('\t\tLeaving out the impossible meetings removed %d variables and %d constraints.' % (DenseVariables - model.NumVariables(), DenseConstraints - model.NumConstraints() - NumRedundantConstraints + len(SymmetryBreakingRows)))
+    print('\t\tLeaving out the redundant constraints removed %d constraints.' % NumRedundantConstraints)
+    print('\t\tBreaking the symmetry between %d groups of interchangeable visitors and %d groups of interchangeable professors added %d constraints.' % (NumGroups[0], NumGroups[1], len(SymmetryBreakingRows)))
+
+    # Return the model and the decision variable dictionary
+    return (model, Meeting)
+
+# Define the function for converting the objective weights into integers
+def ScaleWeights(Weight):
+    # CP-SAT only accepts integer objective coefficients, so every weight is multiplied by the smallest number that makes
+    # all of them integers (e.g., weights of 1 and 0.1 are scaled by 10 to 10 and 1).
+    # Returns:
+    #   IntegerWeight = a dictionary with the same keys as Weight, holding the scaled integer weights
+    #   Scale = the factor the weights were multiplied by
+
+    # Convert the weights into fractions
+    Fractions = {Key : Fraction(str(Weight[Key])).limit_denominator(1000) for Key in Weight}
+
+    # Find the least common multiple of the denominators
+    Scale = 1
+    for f in Fractions.values():
+        Scale = Scale * f.denominator // math.gcd(Scale, f.denominator)
+
+    # Scale the weights
+    IntegerWeight = {Key : int(Fractions[Key] * Scale) for Key in Fractions}
+
+    # Return the result
+    return (IntegerWeight, Scale)
+
+# Define the function for collecting every weight of the CP-SAT objective
+def GetCpSatWeights(Parameters, Scope = None):
+    # Returns the Weight dictionary of the parameters, extended with one entry for each distinct meeting bonus of the scope,
+    # so that all of them can be scaled to integers together
+    Weight = dict(Parameters['Weight'])
+    if Scope is not None:
+        for Bonus in set(Scope.MeetingBonus.values()):
+            Weight[('Meeting bonus', Bonus)] = Bonus
+    return Weight
+
+# Define the function for building the CP-SAT version of the optimization model
+def BuildCpSatModel(Visitors, Professors, TimeSlots, Parameters = None, Scope = None, Analysis = None):
+    # This function builds the same model as BuildModel, but for the CP-SAT solver, with integer-scaled objective weights.
+    # Inputs:
+    #   Visitors = a dictionary of visitors.
+    #   Professors = a dictionary of professors
+    #   TimeSlots = a list of time slot indices
+    #   Parameters = a dictionary of model parameters (defaults to DefaultParameters)
+    #   Scope = an optional ModelScope restricting the model to part of the problem
+    #   Analysis = an optional FeasibilityAnalysis of the same problem, whose bounds are given to the solver
+    # Outputs:
+    #   model = a CpModel object populated with decision variables, constraints, and an objective.
+    #   Meeting = a dictionary mapping each feasible (visitor, professor, time slot) triple to its boolean variable.
+
+    # Use the default parameters and scope, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+    if Scope is None:
+        Scope = ModelScope()
+
+    # Print a status update
+    print('Defining the CP-SAT optimization model...')
+
+    # Instantiate the model
+    model = cp_model.CpModel()
+
+    # Create the model variables
+    print('\tDefining the decision variables...')
+
+    ## Primary decision variables (only for the meetings that could actually take place)
+    Meeting = dict()
+    for (v,p,t) in GetScopedMeetings(Visitors, Professors, TimeSlots, Scope):
+        Meeting[(v,p,t)] = model.NewBoolVar('Visitor %d assigned to meet with Professor %d during time slot %d.' % (v, p, t))
+
+    ## Force the fixed meetings to take place
+    for k in Scope.FixedMeetings:
+        if k in Meeting:
+            model.Add(Meeting[k] == 1)
+
+    ## Group the meeting variables for building the constraints
+    (MeetingsByVisitorSlot, MeetingsByProfSlot, MeetingsByPair, MeetingsByVisitor) = GroupMeetings(Visitors, Meeting)
+
+    ## Secondary decision variables (bounded by the pre-solve analysis, if there is one)
+    MaxMinMeetings = len(TimeSlots) if Analysis is None else Analysis.MaxMinMeetings
+    MaxHappiness = sum(max(v.PreferencePoints.values(), default=0) for v in Visitors.values()) * len(TimeSlots)
+    if Analysis is not None:
+        MaxHappiness = min(MaxHappiness, Analysis.MaxMinHappiness)
+
+    MinMeetings = model.NewIntVar(0, MaxMinMeetings, 'Minimum Meetings per Visitor')
+
+    MinHappiness = model.NewIntVar(0, MaxHappiness, 'Minimum Happiness per Visitor')
+
+    # Create the constraints
+    print('\tDefining the constraints...')
+
+    ## Only keep the "at most one meeting" constraints with more than one meeting, if requested
+    MinRowLength = 2 if Parameters['DropRedundantConstraints'] else 1
+
+    ## Each visitor can meet with at most one professor during any given time slot
+    for Keys in MeetingsByVisitorSlot.values():
+        if len(Keys) >= MinRowLength:
+            model.AddAtMostOne(Meeting[k] for k in Keys)
+
+    ## Each professor can meet with at most one visitor during any given time slot
+    for Keys in MeetingsByProfSlot.values():
+        if len(Keys) >= MinRowLength:
+            model.AddAtMostOne(Meeting[k] for k in Keys)
+
+    ## Each professor-visitor pair can meet at most once
+    for Keys in MeetingsByPair.values():
+        if len(Keys) >= MinRowLength:
+            model.AddAtMostOne(Meeting[k] for k in Keys)
+
+    ## Each visitor must have at least the minimum number of meetings
+    for v in Visitors:
+        model.Add(sum(Meeting[k] for k in MeetingsByVisitor[v]) >= MinMeetings)
+
+    ## Each visitor must have at least the minimum happiness score
+    for v in Visitors:
+        model.Add(
+            sum(
+                Meeting[(v,p,t)] * Visitors[v].PreferencePoints[p]
+                for (v,p,t) in MeetingsByVisitor[v]
+                if p in Visitors[v].PreferencePoints
+            )
+            >=
+            MinHappiness
+        )
+
+    ## Each visitor must have at least the minimum number of free periods (or any lower limit set by the scope), unless
+    ## they can't meet during enough time slots to reach the limit anyway
+    RequiredFreePeriods = Parameters['RequiredFreePeriods']
+    for v in Visitors:
+        MaxMeetings = Scope.MaxMeetings.get(v, len(TimeSlots) - RequiredFreePeriods)
+        if not (Parameters['DropRedundantConstraints'] and len({k[2] for k in MeetingsByVisitor[v]}) <= MaxMeetings):
+            model.Add(sum(Meeting[k] for k in MeetingsByVisitor[v]) <= MaxMeetings)
+
+    ## Interchangeable visitors and professors must have their numbers of meetings in decreasing order, if requested
+    if Parameters['BreakSymmetry'] and Scope.IsWholeProblem():
+        (SymmetryBreakingRows, NumGroups) = GetSymmetryBreakingRows(Visitors, Professors, TimeSlots, Meeting)
+        for (Larger, Smaller) in SymmetryBreakingRows:
+            model.Add(sum(Meeting[k] for k in Larger) >= sum(Meeting[k] for k in Smaller))
+
+    # Set the objective
+    print('\tDefining the objective...')
+
+    ## Scale the weights of the various objectives (and any meeting bonuses) to integers
+    (Weight, Scale) = ScaleWeights(GetCpSatWeights(Parameters, Scope))
+
+    ## Define the objective
+    model.Maximize(
+        Weight['Maximize the happiness points'] *
+        sum(
+            Meeting[(v,p,t)] * Visitors[v].PreferencePoints[p]
+            for (v,p,t) in Meeting
+            if p in Visitors[v].PreferencePoints
+        )
+        +
+        Weight['Maximize the number of meetings'] * sum(Meeting.values())
+        +
+        Weight['Maximize the minimum number of meetings'] * MinMeetings
+        +
+        Weight['Maximize the minimum happiness score'] * MinHappiness
+        +
+        sum(Weight[('Meeting bonus', Scope.MeetingBonus[k])] * Meeting[k] for k in Scope.MeetingBonus if k in Meeting)
+    )
+
+    # Report the size of the model
+    print('\tThe model has %d variables and %d constraints.' % (len(model.Proto().variables), len(model.Proto().constraints)))
+
+    # Return the model and the decision variable dictionary
+    return (model, Meeting)
+
+# Define the function for quickly building a schedule without a solver
+def GreedySchedule(Visitors, Professors, TimeSlots, PreferenceMatrix, Parameters = None, Scope = None):
+    # Builds a feasible schedule in rounds.  In each round, the visitors take turns (least happy first) picking the
+    # feasible meeting worth the most preference points to them.  The result is typically used as a hint for the solver.
+    #
+    # Inputs:
+    #   PreferenceMatrix = the visitor x professor matrix of preference points returned by CalcPreferencePoints
+    #   Scope = an optional ModelScope restricting the schedule to part of the problem
+    # Outputs:
+    #   ScheduledMeetings = the set of (visitor, professor, time slot) triples for which a meeting was scheduled
+
+    # Use the default parameters and scope, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+    if Scope is None:
+        Scope = ModelScope()
+    Weight = Parameters['Weight']
+
+    # Calculate the maximum number of meetings per visitor
+    MaxMeetings = len(TimeSlots) - Parameters['RequiredFreePeriods']
+
+    # List each visitor's feasible meetings, with the most valuable ones (and then the earliest ones) first
+    (MeetingsByVisitorSlot, MeetingsByProfSlot, MeetingsByPair, MeetingsByVisitor) = GroupMeetings(Visitors, GetScopedMeetings(Visitors, Professors, TimeSlots, Scope))
+    for v in MeetingsByVisitor:
+        MeetingsByVisitor[v].sort(key=lambda k: (-(Weight['Maximize the happiness points'] * PreferenceMatrix[k[0], k[1]] + Scope.MeetingBonus.get(k, 0)), k[2]))
+
+    # Keep track of the booked time slots, the pairs that have met, and each visitor's happiness and next candidate
+    VisitorBusy = set()
+    ProfBusy = set()
+    PairsMet = set()
+    NumberOfMeetings = {v : 0 for v in Visitors}
+    Happiness = {v : 0 for v in Visitors}
+    NextCandidate = {v : 0 for v in Visitors}
+
+    # Instantiate the set of scheduled meetings
+    ScheduledMeetings = set()
+
+    # Book the fixed meetings
+    for (v,p,t) in Scope.FixedMeetings:
+        ScheduledMeetings.add((v,p,t))
+        VisitorBusy.add((v,t))
+        ProfBusy.add((p,t))
+        PairsMet.add((v,p))
+        NumberOfMeetings[v] += 1
+        Happiness[v] += PreferenceMatrix[v,p]
+
+    # Loop over the rounds
+    for Round in range(max(MaxMeetings, 0)):
+
+        # Let the visitors pick, starting with the least happy
+        for v in sorted(Visitors, key=lambda v: Happiness[v]):
+
+            # Skip over the candidates which are no longer possible.  (Once a candidate becomes impossible, it stays that way.)
+            Candidates = MeetingsByVisitor[v]
+            while NextCandidate[v] < len(Candidates):
+                (v,p,t) = Candidates[NextCandidate[v]]
+                if (v,t) not in VisitorBusy and (p,t) not in ProfBusy and (v,p) not in PairsMet:
+                    break
+                NextCandidate[v] += 1
+
+            # Book the best remaining candidate, if there is one and the visitor has room for it
+            if NextCandidate[v] < len(Candidates) and NumberOfMeetings[v] < Scope.MaxMeetings.get(v, MaxMeetings):
+                (v,p,t) = Candidates[NextCandidate[v]]
+                ScheduledMeetings.add((v,p,t))
+                VisitorBusy.add((v,t))
+                ProfBusy.add((p,t))
+                PairsMet.add((v,p))
+                NumberOfMeetings[v] += 1
+                Happiness[v] += PreferenceMatrix[v,p]
+
+    # Return the result
+    return ScheduledMeetings
+
+# Define the function for building the matrix of preference points from the visitors' dictionaries
+def GetPreferenceMatrix(Visitors, Professors):
+    # Returns the visitor x professor matrix of preference points (the same matrix returned by CalcPreferencePoints)
+
+    # Instantiate the matrix
+    PreferenceMatrix = np.zeros((max(Visitors, default=-1) + 1, max(Professors, default=-1) + 1), dtype=int)
+
+    # Fill in the nonzero entries
+    for v in Visitors:
+        for p in Visitors[v].PreferencePoints:
+            PreferenceMatrix[v,p] = Visitors[v].PreferencePoints[p]
+
+    # Return the result
+    return PreferenceMatrix
+
+# Define the function for calculating the objective of a schedule
+def CalcScheduleObjective(Visitors, ScheduledMeetings, Parameters = None):
+    # Returns the value the objective of BuildModel takes for the given set of scheduled meetings
+
+    # Use the default parameters, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+    Weight = Parameters['Weight']
+
+    # Calculate the minimum meetings and happiness
+    (MinMeetings, MinHappiness) = CalcScheduleMinimums(Visitors, ScheduledMeetings)
+
+    # Return the weighted sum of the objectives
+    return (
+        Weight['Maximize the happiness points'] * sum(Visitors[v].PreferencePoints.get(p, 0) for (v,p,t) in ScheduledMeetings)
+        + Weight['Maximize the number of meetings'] * len(ScheduledMeetings)
+        + Weight['Maximize the minimum number of meetings'] * MinMeetings
+        + Weight['Maximize the minimum happiness score'] * MinHappiness
+    )
+
+# Define the function for improving a schedule by local search
+def LocalSearchSchedule(Visitors, Professors, TimeSlots, PreferenceMatrix, ScheduledMeetings, Parameters = None, MaxSeconds = None, Scope = None):
+    # Repeatedly looks for a change to the schedule which respects every constraint of BuildModel and improves its
+    # objective, until no such change can be found (or the time runs out).  For each feasible (professor, time slot) of
+    # each visitor, the following moves are tried:
+    #   add = book the meeting if both the visitor and the professor are free
+    #   replace = swap out the professor the visitor is already meeting during that time slot
+    #   transfer = take over the professor's meeting with another visitor during that time slot
+    #   swap = exchange professors with the visitor who is meeting the professor during that time slot
+    #
+    # Inputs:
+    #   PreferenceMatrix = the visitor x professor matrix of preference points
+    #   ScheduledMeetings = the set of (visitor, professor, time slot) triples to start from (e.g., from GreedySchedule)
+    #   MaxSeconds = the time limit of the search (defaults to the solver time limit in Parameters)
+    #   Scope = an optional ModelScope restricting the schedule to part of the problem.  Fixed meetings are never moved.
+    # Outputs:
+    #   ScheduledMeetings = the improved set of scheduled meetings
+
+    # Use the default parameters and scope, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+    if Scope is None:
+        Scope = ModelScope()
+    Weight = Parameters['Weight']
+
+    # Calculate the maximum number of meetings per visitor
+    MaxMeetings = len(TimeSlots) - Parameters['RequiredFreePeriods']
+
+    # Convert the preference points into nested lists, which are faster to index one entry at a time
+    Points = PreferenceMatrix.tolist()
+
+    # List each visitor's feasible (professor, time slot) pairs
+    ScopedMeetings = GetScopedMeetings(Visitors, Professors, TimeSlots, Scope)
+    Candidates = {v : [] for v in Visitors}
+    for (v,p,t) in ScopedMeetings:
+        Candidates[v].append((p,t))
+    ScopedMeetings = set(ScopedMeetings)
+
+    # Set the deadline
+    if MaxSeconds is None:
+        MaxSeconds = GetTimeLimitSeconds(Parameters, len(ScopedMeetings))
+    Deadline = time.perf_counter() + MaxSeconds
+
+    # Set up the state of the search: who each visitor and professor meets during each time slot (-1 for nobody), the
+    # pairs who have met, and each visitor's number of meetings and happiness
+    VisitorSlot = [[-1] * len(TimeSlots) for v in range(PreferenceMatrix.shape[0])]
+    ProfSlot = [[-1] * len(TimeSlots) for p in range(PreferenceMatrix.shape[1])]
+    PairsMet = set()
+    Count = {v : 0 for v in Visitors}
+    Happy = {v : 0 for v in Visitors}
+
+    # Define the functions for booking and cancelling a meeting
+    def Book(v, p, t):
+        VisitorSlot[v][t] = p
+        ProfSlot[p][t] = v
+        PairsMet.add((v,p))
+        Count[v] += 1
+        Happy[v] += Points[v][p]
+
+    def Cancel(v, p, t):
+        VisitorSlot[v][t] = -1
+        ProfSlot[p][t] = -1
+        PairsMet.discard((v,p))
+        Count[v] -= 1
+        Happy[v] -= Points[v][p]
+
+    # Define the function for finding the minimum of a visitor statistic and the number of visitors who share it
+    def FindMinimum(Statistic):
+        Minimum = min(Statistic.values(), default=0)
+        return (Minimum, sum(1 for x in Statistic.values() if x == Minimum))
+
+    # Define the function for finding the new minimum of a visitor statistic after the values of visitor v (and,
+    # optionally, visitor u) change by dv (and du)
+    def FindNewMinimum(Statistic, Minimum, NumAtMinimum, v, dv, u, du):
+
+        # Find the minimum among the unaffected visitors, which is the current minimum unless every visitor at the
+        # minimum is affected
+        if (Statistic[v] == Minimum) + (u != -1 and Statistic[u] == Minimum) < NumAtMinimum:
+            NewMinimum = Minimum
+        else:
+            NewMinimum = min((Statistic[x] for x in Statistic if x != v and x != u), default=float('inf'))
+
+        # Include the new values of the affected visitors
+        NewMinimum = min(NewMinimum, Statistic[v] + dv)
+        if u != -1:
+            NewMinimum = min(NewMinimum, Statistic[u] + du)
+
+        # Return the result
+        return NewMinimum
+
+    # Define the function for evaluating a move without making it.  The move changes the number of meetings and happiness
+    # of visitor v by dCv and dHv, and those of visitor u (if u isn't -1) by dCu and dHu, and changes the total of the
+    # meeting bonuses by dBonus.  Besides the change in the objective, it returns the change in how unevenly the meetings
+    # and happiness are spread among the visitors (the sum of their squares).  Moves which leave the objective unchanged
+    # are kept if they even things out, since that is what eventually allows the minimum number of meetings and minimum
+    # happiness to be raised.
+    def EvaluateMove(v, dCv, dHv, u, dCu, dHu, dBonus):
+
+        # Calculate the change in the objective, apart from the minimums
+        ObjectiveChange = Weight['Maximize the happiness points'] * (dHv + dHu) + Weight['Maximize the number of meetings'] * (dCv + dCu) + dBonus
+
+        # A minimum can only go up if every visitor at the minimum is affected, so most losing moves can be rejected here
+        if ObjectiveChange < -1e-9 and MinCount[1] > 2 and MinHappy[1] > 2:
+            return (ObjectiveChange, 0)
+
+        # Add the change in the minimums
+        ObjectiveChange += (
+            Weight['Maximize the minimum number of meetings'] * (FindNewMinimum(Count, MinCount[0], MinCount[1], v, dCv, u, dCu) - MinCount[0])
+            + Weight['Maximize the minimum happiness score'] * (FindNewMinimum(Happy, MinHappy[0], MinHappy[1], v, dHv, u, dHu) - MinHappy[0])
+        )
+
+        # Calculate the change in the unevenness
+        UnevennessChange = dCv * (2 * Count[v] + dCv) + dHv * (2 * Happy[v] + dHv)
+        if u != -1:
+            UnevennessChange += dCu * (2 * Count[u] + dCu) + dHu * (2 * Happy[u] + dHu)
+
+        # Return the result
+        return (ObjectiveChange, UnevennessChange)
+
+    # Load the starting schedule
+    for (v,p,t) in ScheduledMeetings:
+        Book(v, p, t)
+    MinCount = FindMinimum(Count)
+    MinHappy = FindMinimum(Happy)
+
+    # Keep making passes over the visitors until a pass finds no improvement
+    Improved = True
+    while Improved and time.perf_counter() < Deadline:
+        Improved = False
+
+        # Start with the least happy visitors
+        for v in sorted(Visitors, key=lambda v: (Happy[v], Count[v])):
+
+            # Loop over the visitor's feasible (professor, time slot) pairs
+            for (p,t) in Candidates[v]:
+
+                # Skip the professors the visitor is already meeting
+                if (v,p) in PairsMet:
+                    continue
+
+                # Find who the visitor and the professor are meeting during this time slot
+                q = VisitorSlot[v][t]
+                u = ProfSlot[p][t]
+
+                # Build the move, along with the resulting change in the number of meetings and happiness of the visitors
+                if q == -1 and u == -1 and Count[v] < Scope.MaxMeetings.get(v, MaxMeetings):
+                    (Cancellations, Bookings) = ([], [(v,p,t)])
+                    Changes = (v, 1, Points[v][p], -1, 0, 0)
+                elif q != -1 and u == -1 and Points[v][p] > Points[v][q]:
+                    (Cancellations, Bookings) = ([(v,q,t)], [(v,p,t)])
+                    Changes = (v, 0, Points[v][p] - Points[v][q], -1, 0, 0)
+                elif q == -1 and u != -1 and Count[v] < Scope.MaxMeetings.get(v, MaxMeetings):
+                    (Cancellations, Bookings) = ([(u,p,t)], [(v,p,t)])
+                    Changes = (v, 1, Points[v][p], u, -1, -Points[u][p])
+                elif q != -1 and u != -1 and (u,q) not in PairsMet and (u,q,t) in ScopedMeetings:
+                    (Cancellations, Bookings) = ([(v,q,t), (u,p,t)], [(v,p,t), (u,q,t)])
+                    Changes = (v, 0, Points[v][p] - Points[v][q], u, 0, Points[u][q] - Points[u][p])
+                else:
+                    continue
+
+                # Never move the fixed meetings
+                if any(k in Scope.FixedMeetings for k in Cancellations):
+                    continue
+
+                # Add up the change in the meeting bonuses
+                BonusChange = sum(Scope.MeetingBonus.get(k, 0) for k in Bookings) - sum(Scope.MeetingBonus.get(k, 0) for k in Cancellations)
+
+                # Make the move if it improves the objective (or evens things out without hurting the objective)
+                (ObjectiveChange, UnevennessChange) = EvaluateMove(*Changes, BonusChange)
+                if ObjectiveChange > 1e-9 or (ObjectiveChange > -1e-9 and UnevennessChange < 0):
+                    for k in Cancellations:
+                        Cancel(*k)
+                    for k in Bookings:
+                        Book(*k)
+                    MinCount = FindMinimum(Count)
+                    MinHappy = FindMinimum(Happy)
+                    Improved = True
+
+            # Check the time limit
+            if time.perf_counter() >= Deadline:
+                break
+
+    # Collect the resulting schedule
+    ScheduledMeetings = set()
+    for v in Visitors:
+        for t in TimeSlots:
+            if VisitorSlot[v][t] != -1:
+                ScheduledMeetings.add((v, VisitorSlot[v][t], t))
+
+    # Return the result
+    return ScheduledMeetings
+
+# Define the function for calculating the minimum number of meetings and minimum happiness of a schedule
+def CalcScheduleMinimums(Visitors, ScheduledMeetings):
+    # Returns the smallest number of meetings and the smallest happiness score among all the visitors
+
+    # Count each visitor's meetings and happiness
+    NumberOfMeetings = {v : 0 for v in Visitors}
+    Happiness = {v : 0 for v in Visitors}
+    for (v,p,t) in ScheduledMeetings:
+        NumberOfMeetings[v] += 1
+        Happiness[v] += Visitors[v].PreferencePoints.get(p, 0)
+
+    # Return the result
+    return (min(NumberOfMeetings.values(), default=0), min(Happiness.values(), default=0))
+
+# Define the function for reading back the visitors' schedules written by PrintAllVisitorSchedules
+def ReadVisitorSchedules(Visitors, ProfIndex, Directory = 'Visitor Schedules'):
+    # Returns the set of (visitor, professor, time slot) triples listed in the schedule files.  Visitors and professors
+    # which can no longer be found are skipped with a warning.
+
+    # Look up each visitor's id by their name
+    VisitorIds = {'%s %s' % (Visitors[v].FirstName, Visitors[v].LastName) : v for v in Visitors}
+
+    # Instantiate the set of scheduled meetings
+    ScheduledMeetings = set()
+
+    # Loop over the visitors' schedule files
+    for v in Visitors:
+
+        # Build the path to the schedule file
+        FilePath = os.path.join(Directory, 'Visitor %s %s\'s Schedule.txt' % (Visitors[v].FirstName, Visitors[v].LastName))
+
+        # Skip any visitors without a schedule
+        if not os.path.isfile(FilePath):
+            print('Warning: No previous schedule was found for visitor %s %s.' % (Visitors[v].FirstName, Visitors[v].LastName))
+            continue
+
+        # Read the lines of the schedule
+        with open(FilePath) as File:
+            for Line in File:
+
+                # Find the lines listing a meeting, e.g., "\t8:00 AM - 8:30 AM (Period 0): Professor Smith"
+                Match = re.search(r'\(Period (\d+)\): Professor (.+)$', Line.rstrip('\n'))
+                if Match is None:
+                    continue
+
+                # Look up the professor
+                try:
+                    p = ProfIndex.Lookup(Match.group(2))
+                except ValueError:
+                    print('Warning: The professor \"%s\" in the previous schedule of visitor %s %s was not recognized.' % (Match.group(2), Visitors[v].FirstName, Visitors[v].LastName))
+                    continue
+
+                # Add the meeting
+                ScheduledMeetings.add((v, p, int(Match.group(1))))
+
+    # Return the result
+    return ScheduledMeetings
+
+# Define the function for looking up the time slots described on the command line
+def ParseTimeSlots(Description, TimeSlots):
+    # Returns the list of time slot indices matching the description, which is either 'all', a period number, or the
+    # label of a time slot (e.g., '8:00 AM - 8:30 AM').  Raises a ValueError if the description matches no time slot.
+    if Description.strip().lower() == 'all':
+        return list(TimeSlots)
+    if Description.strip().isdigit() and int(Description) in TimeSlots:
+        return [int(Description)]
+    Matches = [t for t in TimeSlots if NormalizeName(TimeSlots[t]) == NormalizeName(Description)]
+    if len(Matches) == 0:
+        raise ValueError('Unrecognized time slot: %s' % Description)
+    return Matches
+
+# Define the function for applying last-minute changes to the visitors and professors
+def ApplyLastMinuteChanges(Visitors, Professors, TimeSlots, ProfIndex, Unavailable, Withdrawn):
+    # Inputs:
+    #   Unavailable = a list of (professor name, time slot description) pairs, each marking a professor as unavailable
+    #   Withdrawn = a list of the full names of the visitors who withdrew, who are removed from the dictionary of visitors
+
+    # Mark the professors as unavailable
+    for (ProfName, SlotDescription) in Unavailable:
+        p = ProfIndex.Lookup(ProfName)
+        for t in ParseTimeSlots(SlotDescription, TimeSlots):
+            Professors[p].Availability[t] = False
+            print('\tProfessor %s is no longer available during %s (Period %d).' % (Professors[p].LastName, TimeSlots[t], t))
+
+    # Remove the withdrawn visitors
+    VisitorIds = {NormalizeName('%s %s' % (Visitors[v].FirstName, Visitors[v].LastName)) : v for v in Visitors}
+    for VisitorName in Withdrawn:
+        if NormalizeName(VisitorName) not in VisitorIds:
+            raise ValueError('Unrecognized visitor: %s' % VisitorName)
+        v = VisitorIds[NormalizeName(VisitorName)]
+        print('\tVisitor %s %s has withdrawn.' % (Visitors[v].FirstName, Visitors[v].LastName))
+        del Visitors[v]
+
+# Define the function for limiting a re-solve to the part of the schedule affected by last-minute changes
+def BuildRepairScope(Visitors, Professors, TimeSlots, PublishedMeetings, Parameters = None):
+    # The published meetings which are no longer possible are dropped.  The visitors who lost a meeting, and the visitors
+    # meeting with a professor who lost a meeting, make up the neighborhood which is re-optimized (with a bonus for keeping
+    # their published meetings, to limit churn).  Everyone else keeps their published schedule as it is.
+    #
+    # Returns:
+    #   Scope = the ModelScope of the re-solve
+    #   DroppedMeetings = the set of published meetings which are no longer possible
+    #   Neighborhood = the set of visitors whose schedules may change
+
+    # Use the default parameters, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+
+    # Sort the published meetings into those which are still possible and those which aren't
+    FeasibleMeetings = GetFeasibleMeetings(Visitors, Professors, TimeSlots)
+    FeasibleSet = set(FeasibleMeetings)
+    KeptMeetings = {k for k in PublishedMeetings if k in FeasibleSet}
+    DroppedMeetings = set(PublishedMeetings) - KeptMeetings
+
+    # Find the neighborhood of the changes
+    AffectedProfessors = {p for (v,p,t) in DroppedMeetings}
+    Neighborhood = {v for (v,p,t) in DroppedMeetings if v in Visitors}
+    Neighborhood |= {v for (v,p,t) in KeptMeetings if p in AffectedProfessors}
+
+    # Build the scope
+    Scope = ModelScope()
+    Scope.FeasibleMeetings = [k for k in FeasibleMeetings if k[0] in Neighborhood] + [k for k in KeptMeetings if k[0] not in Neighborhood]
+    Scope.FixedMeetings = {k for k in KeptMeetings if k[0] not in Neighborhood}
+    Scope.MeetingBonus = {k : Parameters['ChurnWeight'] for k in KeptMeetings if k[0] in Neighborhood}
+
+    # Return the result
+    return (Scope, DroppedMeetings, Neighborhood)
+
+# Define the function for reporting how a schedule changed
+def PrintScheduleChanges(Visitors, Professors, TimeSlots, PublishedMeetings, ScheduledMeetings, FileName = 'Schedule Changes.txt'):
+    # Prints (and writes to a file) the meetings which were cancelled or added relative to the published schedule.
+    # Visitors must include any visitors who withdrew, so that their cancelled meetings can be listed.
+
+    # Find the changes
+    Cancelled = sorted(set(PublishedMeetings) - set(ScheduledMeetings), key=lambda k: (k[0], k[2]))
+    Added = sorted(set(ScheduledMeetings) - set(PublishedMeetings), key=lambda k: (k[0], k[2]))
+
+    # Describe each change
+    Lines = ['Schedule changes: %d meetings cancelled, %d meetings added.' % (len(Cancelled), len(Added))]
+    for (Change, Meetings) in [('Cancelled', Cancelled), ('Added', Added)]:
+        for (v,p,t) in Meetings:
+            Lines.append('\t%s: Visitor %s %s with Professor %s during %s (Period %d)' % (Change, Visitors[v].FirstName, Visitors[v].LastName, Professors[p].LastName, TimeSlots[t], t))
+
+    # Print out the changes
+    print('\n'.join(Lines))
+
+    # Write the changes to the file
+    with open(FileName, 'w') as File:
+        File.write('\n'.join(Lines) + '\n')
+
+# Define the function for finding the time limit of the solver
+def GetTimeLimitSeconds(Parameters, NumVariables):
+    # Returns the time limit in seconds.  If MaxMinutes is 'auto', the time limit grows in proportion to the number of
+    # variables of the model (roughly a minute for the sample workbook), within the bounds of AutoTimeLimitMinutes.
+    if Parameters['MaxMinutes'] == 'auto':
+        (MinMinutes, MaxMinutes) = AutoTimeLimitMinutes
+        return min(max(AutoTimeLimitSecondsPerThousandVariables * NumVariables / 1000, 60 * MinMinutes), 60 * MaxMinutes)
+    return 60 * Parameters['MaxMinutes']
+
+# Define the function for checking whether the solver stopped on one of the gap targets rather than at the optimum
+def StoppedOnGap(Result, Parameters):
+    # Returns True if a gap target was set and the solver stopped with a gap larger than its own tolerance
+    return (Parameters['RelativeGap'] > 0 or Parameters['AbsoluteGap'] > 0) and Result.RelativeGap() > 1e-6
+
+# Define the class which holds the outcome of solving a model
+class SolveResult():
+
+    def __init__(self):
+        self.Status = '' # One of 'optimal', 'feasible', 'heuristic', 'decomposed', 'infeasible', 'unbounded', 'abnormal', and 'not solved'
+        self.ObjectiveValue = float('nan') # the objective of the best solution found, in the units of the Weight dictionary
+        self.BestBound = float('nan') # the best bound on the objective proven by the solver
+        self.SolveSeconds = 0.0 # the wall-clock time spent by the solver
+        self.ScheduledMeetings = set() # the set of (visitor, professor, time slot) triples for which a meeting was scheduled
+        self.SolverStatistics = dict() # the statistics reported by the solver (e.g., the number of nodes or branches)
+        self.Diagnosis = '' # why the model has no solution, if the pre-solve analysis found that it doesn't
+        self.StopReason = '' # why the solver stopped before proving optimality: 'gap' (a gap target was reached), 'stall' (the schedule stopped improving), or 'time limit'
+
+    def RelativeGap(self):
+        # Returns the relative optimality gap of the best solution found
+        return (self.BestBound - self.ObjectiveValue) / max(self.BestBound, 0.001)
+
+# Define the class which holds a schedule in the form used by the reporting and statistics code
+class ScheduleAssignment():
+    # Built once from the set of scheduled meetings, so that finding who a visitor (or professor) meets during a time slot
+    # is a single lookup rather than a scan over every professor (or visitor)
+
+    def __init__(self, Visitors, Professors, TimeSlots, ScheduledMeetings):
+        self.VisitorSlot = np.full((max(Visitors, default=-1) + 1, len(TimeSlots)), -1, dtype=int) # the professor each visitor meets during each time slot (-1 for nobody)
+        self.ProfSlot = np.full((max(Professors, default=-1) + 1, len(TimeSlots)), -1, dtype=int) # the visitor each professor meets during each time slot (-1 for nobody)
+
+        # Fill in the meetings
+        if len(ScheduledMeetings) > 0:
+            Meetings = np.array(list(ScheduledMeetings), dtype=int)
+            self.VisitorSlot[Meetings[:,0], Meetings[:,2]] = Meetings[:,1]
+            self.ProfSlot[Meetings[:,1], Meetings[:,2]] = Meetings[:,0]
+
+# Define the function for measuring the peak memory use of the process
+def GetPeakMemoryMegabytes():
+    # Returns the peak resident set size of the process so far in megabytes, or None if it can't be measured (on Windows)
+    if resource is None:
+        return None
+    PeakRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return PeakRss / 2**20 if sys.platform == 'darwin' else PeakRss / 2**10 # macOS reports bytes and Linux kilobytes
+
+# Define the class for instrumenting the stages of a run
+class RunReport():
+    # Records the wall-clock time and peak memory use of each stage of a run (e.g., reading the workbook, building the
+    # model, and solving it), along with any other details (e.g., the size of the model and the statistics of the solver),
+    # and writes them to a JSON file.  If Profile is True, each stage is also run under cProfile, and the profile of the
+    # slowest stage is kept.
+
+    def __init__(self, Profile = False):
+        self.Stages = [] # a list with a dictionary describing each stage, in order
+        self.Details = dict() # everything else in the report
+        self.Profile = Profile
+        self.SlowestProfile = None # the (stage name, seconds, profiler) of the slowest stage, if profiling
+        self.Start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def Stage(self, Name):
+        # Times (and possibly profiles) the code run inside a with block
+        Profiler = cProfile.Profile() if self.Profile else None
+        Start = time.perf_counter()
+        if Profiler is not None:
+            Profiler.enable()
+        try:
+            yield
+        finally:
+            if Profiler is not None:
+                Profiler.disable()
+            Seconds = time.perf_counter() - Start
+            self.Stages.append({'Stage' : Name, 'Seconds' : Seconds, 'Peak memory (MB)' : GetPeakMemoryMegabytes()})
+            if Profiler is not None and (self.SlowestProfile is None or Seconds > self.SlowestProfile[1]):
+                self.SlowestProfile = (Name, Seconds, Profiler)
+
+    def RecordResult(self, Result):
+        # Records the outcome of the solve and the statistics of the solver
+        self.Details['Result'] = {
+            'Status' : Result.Status,
+            'Objective' : Result.ObjectiveValue,
+            'Best bound' : Result.BestBound,
+            'Gap (%)' : 100 * Result.RelativeGap(),
+            'Stop reason' : Result.StopReason,
+            'Meetings' : len(Result.ScheduledMeetings),
+        }
+        self.Details['Solver statistics'] = Result.SolverStatistics
+
+    def PrintTimes(self):
+        # Prints the time and peak memory use of each stage
+        print('-------RUN TIMES---------')
+        for Stage in self.Stages:
+            Memory = '' if Stage['Peak memory (MB)'] is None else '   (peak memory use: %.0f MB)' % Stage['Peak memory (MB)']
+            print('%-20s %9.3f s%s' % (Stage['Stage'] + ':', Stage['Seconds'], Memory))
+        print('%-20s %9.3f s' % ('Total:', time.perf_counter() - self.Start))
+        print('-------END OF RUN TIMES---------')
+
+    def Write(self, OutputDirectory = '.'):
+        # Writes the report to "Run Report.json" (and the profile of the slowest stage to "Run Profile.prof", which can be
+        # read with the pstats module), returning the path to the report
+        Report = {
+            'Created' : time.strftime('%Y-%m-%d %H:%M:%S'),
+            'Command line' : sys.argv,
+            'Stages' : self.Stages,
+            'Total seconds' : time.perf_counter() - self.Start,
+            'Peak memory (MB)' : GetPeakMemoryMegabytes(),
+        }
+        Report.update(self.Details)
+
+        # Save the profile of the slowest stage
+        if self.SlowestProfile is not None:
+            (Name, Seconds, Profiler) = self.SlowestProfile
+            ProfileFileName = os.path.join(OutputDirectory, 'Run Profile.prof')
+            Profiler.dump_stats(ProfileFileName)
+            Report['Profile'] = {'Stage' : Name, 'File' : os.path.abspath(ProfileFileName)}
+
+        # Write the report, saving undefined numbers (e.g., the gap of a heuristic schedule) as nulls, since JSON has no NaN
+        FileName = os.path.join(OutputDirectory, 'Run Report.json')
+        with open(FileName, 'w') as File:
+            json.dump(ReplaceNaN(Report), File, indent=2, default=str)
+
+        # Return the result
+        return FileName
+
+# Define the function for preparing numbers for JSON
+def ReplaceNaN(Value):
+    # Returns a copy of nested dictionaries and lists with each NaN replaced by None (and each NumPy number converted to
+    # the matching Python number)
+    if isinstance(Value, dict):
+        return {Key : ReplaceNaN(Value[Key]) for Key in Value}
+    if isinstance(Value, (list, tuple)):
+        return [ReplaceNaN(Item) for Item in Value]
+    if isinstance(Value, np.generic):
+        return ReplaceNaN(Value.item())
+    if isinstance(Value, float) and math.isnan(Value):
+        return None
+    return Value
+
+# Define the function for timing a stage when a RunReport may not have been given
+def TimeStage(Report, Name):
+    # Returns the context manager of the stage, or one which does nothing if there is no report
+    return Report.Stage(Name) if Report is not None else contextlib.nullcontext()
+
+# Define the class for streaming the progress of the solver
+class ProgressReporter():
+    # Prints the objective of the best schedule found so far (the incumbent), the best bound, and the gap between them as
+    # the solver runs.  If a checkpoint function is given, it is also handed the incumbent schedule at most once every
+    # CheckpointSeconds seconds (e.g., to write it to disk), so that a run which is killed or runs out of time still leaves
+    # a usable schedule behind.  The checkpoint function runs on a thread of its own, so that the solver's search isn't held
+    # up while it works, and Close must be called once the solver has finished.  Solver callbacks may run on several
+    # threads, so updates are serialized by a lock.
+
+    def __init__(self, CheckpointSeconds = 0, OnCheckpoint = None):
+        self.CheckpointSeconds = CheckpointSeconds # the minimum number of seconds between checkpoints
+        self.OnCheckpoint = OnCheckpoint # a function called with the scheduled meetings and objective of the incumbent
+        self.ObjectiveValue = float('nan') # the objective of the incumbent
+        self.BestBound = float('nan') # the best bound on the objective
+        self.Incumbent = None # the scheduled meetings of the incumbent, if it hasn't been checkpointed yet
+        self.Start = time.perf_counter()
+        self.LastLine = -math.inf # the time of the last progress line
+        self.LastCheckpoint = -math.inf # the time of the last checkpoint
+        self.Lock = threading.Lock()
+        self.PendingCheckpoint = None # the (scheduled meetings, objective) of the incumbent waiting for the checkpoint thread
+        self.Closed = False # True once the solver has finished
+        self.CheckpointReady = threading.Condition(self.Lock)
+        self.CheckpointThread = None
+        if OnCheckpoint is not None:
+            self.CheckpointThread = threading.Thread(target=self.RunCheckpoints, daemon=True)
+            self.CheckpointThread.start()
+
+    def WantsSchedules(self):
+        # Returns True if the incumbent schedules are needed (reading them out of the solver takes time)
+        return self.OnCheckpoint is not None
+
+    def Update(self, ObjectiveValue = None, BestBound = None, ScheduledMeetings = None):
+        # Records a new incumbent and/or a new best bound.  A line is printed for every new incumbent, while improvements
+        # of the bound alone are printed at most once every ProgressIntervalSeconds seconds.
+        with self.Lock:
+            Seconds = time.perf_counter() - self.Start
+
+            # Record the update
+            if ObjectiveValue is not None:
+                self.ObjectiveValue = ObjectiveValue
+            if BestBound is not None:
+                self.BestBound = BestBound
+            if ScheduledMeetings is not None:
+                self.Incumbent = ScheduledMeetings
+
+            # Print the progress
+            if ObjectiveValue is not None or Seconds - self.LastLine >= ProgressIntervalSeconds:
+                Gap = 100 * (self.BestBound - self.ObjectiveValue) / max(self.BestBound, 0.001)
+                (Incumbent, Gap) = ('%10.4f' % self.ObjectiveValue, '%7.2f%%' % Gap) if not math.isnan(self.ObjectiveValue) else ('%10s' % 'none', '%8s' % '-')
+                print('\t%8.1f s   Incumbent: %s   Best bound: %10.4f   Gap: %s' % (Seconds, Incumbent, self.BestBound, Gap), flush=True)
+                self.LastLine = Seconds
+
+            # Hand the incumbent to the checkpoint thread, if a checkpoint is due (replacing any incumbent it hasn't got to yet)
+            if self.Incumbent is not None and self.OnCheckpoint is not None and Seconds - self.LastCheckpoint >= self.CheckpointSeconds:
+                self.PendingCheckpoint = (self.Incumbent, self.ObjectiveValue)
+                self.CheckpointReady.notify()
+                self.Incumbent = None
+                self.LastCheckpoint = Seconds
+
+    def RunCheckpoints(self):
+        # Runs on the checkpoint thread, handing each incumbent passed on by Update to the checkpoint function until Close is
+        # called
+        while True:
+            with self.CheckpointReady:
+                while self.PendingCheckpoint is None and not self.Closed:
+                    self.CheckpointReady.wait()
+                if self.PendingCheckpoint is None:
+                    return
+                (ScheduledMeetings, ObjectiveValue) = self.PendingCheckpoint
+                self.PendingCheckpoint = None
+            self.OnCheckpoint(ScheduledMeetings, ObjectiveValue)
+
+    def Close(self):
+        # Waits for any checkpoint being written to finish, and stops the checkpoint thread.  An incumbent which is still
+        # waiting is dropped, since the final schedule is about to be written out anyway, and must not be overwritten by it.
+        with self.CheckpointReady:
+            self.Closed = True
+            self.PendingCheckpoint = None
+            self.CheckpointReady.notify()
+        if self.CheckpointThread is not None:
+            self.CheckpointThread.join()
+
+# Define the function for creating the callback which keeps track of the incumbents found by CP-SAT, passing them on to a
+# ProgressReporter (if any)
+def CpSatProgressCallback(Meeting, Scale, Progress = None):
+    # The class of the callback derives from a CP-SAT class, so it is defined here rather than at the top level, which would
+    # import CP-SAT along with this module
+
+    class Callback(cp_model.CpSolverSolutionCallback):
+
+        def __init__(self):
+            cp_model.CpSolverSolutionCallback.__init__(self)
+            self.Meeting = Meeting # the dictionary of meeting variables
+            self.Scale = Scale # the factor the objective weights were scaled by
+            self.Progress = Progress # the ProgressReporter
+            self.LastSolution = None # the time at which the last incumbent was found
+            self.Stalled = False # True if the search was stopped because the incumbent stopped improving (see WatchForStall)
+
+        def on_solution_callback(self):
+            # Record the time of the incumbent
+            self.LastSolution = time.perf_counter()
+            if self.Progress is None:
+                return
+
+            # Read out the schedule only if it is needed, and convert the objective back into the units of the Weight
+            # dictionary
+            ScheduledMeetings = {k for k in self.Meeting if self.BooleanValue(self.Meeting[k])} if self.Progress.WantsSchedules() else None
+            self.Progress.Update(self.ObjectiveValue() / self.Scale, self.BestObjectiveBound() / self.Scale, ScheduledMeetings)
+
+    # Return the result
+    return Callback()
+
+# Define the function for stopping CP-SAT once its incumbent stops improving (in a separate thread)
+def WatchForStall(Solver, Callback, StallSeconds, SearchDone):
+    # Checks twice a second until the search is done, stopping it if no better schedule has been found for StallSeconds
+    # seconds since the first one
+    while not SearchDone.wait(0.5):
+        if Callback.LastSolution is not None and time.perf_counter() - Callback.LastSolution >= StallSeconds:
+            Callback.Stalled = True
+            Solver.stop_search()
+            return
+
+# Define the class for solver backends which use the OR-Tools linear solver wrapper (e.g., CBC, SCIP, and HiGHS)
+class LinearSolverBackend():
+
+    def __init__(self, SolverId, SupportsHint = True):
+        self.SolverId = SolverId # the solver id passed to pywraplp.Solver.CreateSolver
+        self.SupportsHint = SupportsHint # False for solvers which can't be given a starting solution
+
+    def IsAvailable(self):
+        # Returns True if OR-Tools was built with (and licensed for) this solver
+        return pywraplp.Solver.CreateSolver(self.SolverId) is not None
+
+    def Build(self, Visitors, Professors, TimeSlots, Parameters, Scope = None, Analysis = None):
+        # Returns the model and the dictionary of meeting variables
+        return BuildModel(Visitors, Professors, TimeSlots, Parameters, self.SolverId, Scope, Analysis)
+
+    def GetModelSize(self, model):
+        # Returns the numbers of variables, constraints, and nonzero constraint coefficients of the model
+        Proto = linear_solver_pb2.MPModelProto()
+        model.ExportModelToProto(Proto)
+        return {'Variables' : len(Proto.variable), 'Constraints' : len(Proto.constraint), 'Nonzeros' : sum(len(Constraint.var_index) for Constraint in Proto.constraint)}
+
+    def Solve(self, model, Meeting, Parameters, Hint = None, HintMinimums = (0, 0), Progress = None):
+        # Solves the model and returns a SolveResult.  If a hint (a set of scheduled meetings) is given, the solver starts
+        # its search from it.  HintMinimums holds the minimum meetings and minimum happiness achieved by the hint.  The
+        # linear solver wrapper has no callbacks, so if a ProgressReporter is given, the solver's own log is shown instead.
+
+        # Enable output, if the progress was requested
+        if Progress is not None:
+            print('Note: The %s solver can\'t report its incumbents as it runs, so its own log is shown instead (and no checkpoints are written).' % self.SolverId)
+            model.EnableOutput()
+
+        # Pass along the hint, if there is one, along with the minimum meetings and happiness it achieves
+        if Hint is not None:
+            if self.SupportsHint:
+                (MinMeetings, MinHappiness) = HintMinimums
+                model.SetHint(
+                    list(Meeting.values()) + [model.LookupVariable('Minimum Meetings per Visitor'), model.LookupVariable('Minimum Happiness per Visitor')],
+                    [1.0 if k in Hint else 0.0 for k in Meeting] + [MinMeetings, MinHappiness]
+                )
+            else:
+                print('Warning: The %s solver does not accept hints.  The hint will be ignored.' % self.SolverId)
+
+        # Set the time limit and the relative gap target
+        model.set_time_limit(round(1000 * GetTimeLimitSeconds(Parameters, model.NumVariables())))
+        SolverParameters = pywraplp.MPSolverParameters()
+        if Parameters['RelativeGap'] > 0:
+            SolverParameters.SetDoubleParam(SolverParameters.RELATIVE_MIP_GAP, Parameters['RelativeGap'])
+        if Parameters['AbsoluteGap'] > 0 or Parameters['StallMinutes'] is not None:
+            print('Warning: The %s solver does not support an absolute gap target or stall detection.  Only the time limit and relative gap target will be used.' % self.SolverId)
+
+        # Solve the model
+        Start = time.perf_counter()
+        status = model.Solve(SolverParameters)
+
+        # Record the outcome
+        Result = SolveResult()
+        Result.SolveSeconds = time.perf_counter() - Start
+        Result.Status = {
+            pywraplp.Solver.OPTIMAL : 'optimal',
+            pywraplp.Solver.FEASIBLE : 'feasible',
+            pywraplp.Solver.INFEASIBLE : 'infeasible',
+            pywraplp.Solver.UNBOUNDED : 'unbounded',
+            pywraplp.Solver.ABNORMAL : 'abnormal',
+        }.get(status, 'not solved')
+
+        # Record the solution, if there is one
+        if Result.Status in ('optimal', 'feasible'):
+            Result.ObjectiveValue = model.Objective().Value()
+            Result.BestBound = model.Objective().BestBound()
+            Result.ScheduledMeetings = {k for k in Meeting if Meeting[k].solution_value() > 0.5}
+
+        # Record why the solver stopped early, if it did
+        if Result.Status == 'optimal' and StoppedOnGap(Result, Parameters):
+            (Result.Status, Result.StopReason) = ('feasible', 'gap')
+        elif Result.Status == 'feasible':
+            Result.StopReason = 'time limit'
+
+        # Record the statistics of the solver
+        Result.SolverStatistics = {'Nodes' : model.nodes(), 'Iterations' : model.iterations(), 'Wall time (s)' : model.wall_time() / 1000}
+
+        # Return the result
+        return Result
+
+# Define the class for the native CP-SAT solver backend
+class CpSatBackend():
+
+    def IsAvailable(self):
+        # CP-SAT ships with every installation of OR-Tools
+        return True
+
+    def Build(self, Visitors, Professors, TimeSlots, Parameters, Scope = None, Analysis = None):
+        # Returns the model (along with the factor its objective weights were scaled by) and the dictionary of meeting variables
+        (model, Meeting) = BuildCpSatModel(Visitors, Professors, TimeSlots, Parameters, Scope, Analysis)
+        (Weight, Scale) = ScaleWeights(GetCpSatWeights(Parameters, Scope))
+        return ((model, Scale), Meeting)
+
+    def GetModelSize(self, model):
+        # Returns the numbers of variables, constraints, and nonzero constraint coefficients (or literals) of the model.  The
+        # proto is the model itself rather than a copy, and merely reading a kind of constraint which isn't set switches the
+        # constraint to that kind, so each kind is checked first.
+        Proto = model[0].Proto()
+        Nonzeros = sum(len(Constraint.linear.vars) if Constraint.has_linear() else len(Constraint.at_most_one.literals) if Constraint.has_at_most_one() else 0 for Constraint in Proto.constraints)
+        return {'Variables' : len(Proto.variables), 'Constraints' : len(Proto.constraints), 'Nonzeros' : Nonzeros}
+
+    def Solve(self, model, Meeting, Parameters, Hint = None, HintMinimums = (0, 0), Progress = None):
+        # Solves the model and returns a SolveResult.  If a hint (a set of scheduled meetings) is given, the solver starts
+        # its search from it.  HintMinimums holds the minimum meetings and minimum happiness achieved by the hint.  If a
+        # ProgressReporter is given, it is sent every new incumbent and every improvement of the best bound.
+
+        # Unpack the model
+        (model, Scale) = model
+
+        # Pass along the hint, if there is one, along with the minimum meetings and happiness it achieves
+        if Hint is not None:
+            for k in Meeting:
+                model.AddHint(Meeting[k], k in Hint)
+            (MinMeetings, MinHappiness) = HintMinimums
+            for (i, Variable) in enumerate(model.Proto().variables):
+                if Variable.name == 'Minimum Meetings per Visitor':
+                    model.AddHint(model.GetIntVarFromProtoIndex(i), MinMeetings)
+                elif Variable.name == 'Minimum Happiness per Visitor':
+                    model.AddHint(model.GetIntVarFromProtoIndex(i), MinHappiness)
+
+        # Instantiate the solver
+        Solver = cp_model.CpSolver()
+
+        # Set the time limit, the gap targets (with the absolute gap converted into the units of the scaled objective), and
+        # the number of parallel search workers
+        Solver.parameters.max_time_in_seconds = GetTimeLimitSeconds(Parameters, len(model.Proto().variables))
+        if Parameters['RelativeGap'] > 0:
+            Solver.parameters.relative_gap_limit = Parameters['RelativeGap']
+        if Parameters['AbsoluteGap'] > 0:
+            Solver.parameters.absolute_gap_limit = Parameters['AbsoluteGap'] * Scale
+        Solver.parameters.num_workers = Parameters['NumWorkers']
+
+        # Keep track of the incumbents, streaming the progress of the search if requested
+        Callback = CpSatProgressCallback(Meeting, Scale, Progress)
+        if Progress is not None:
+            Solver.best_bound_callback = lambda BestBound: Progress.Update(BestBound=BestBound / Scale)
+
+        # Stop the search if the incumbent stops improving, if requested.  CP-SAT only calls back when it finds a better
+        # schedule, so a separate thread checks how long it has been since the last one.
+        SearchDone = threading.Event()
+        if Parameters['StallMinutes'] is not None:
+            Watchdog = threading.Thread(target=WatchForStall, args=(Solver, Callback, 60 * Parameters['StallMinutes'], SearchDone), daemon=True)
+            Watchdog.start()
+
+        # Solve the model
+        Start = time.perf_counter()
+        status = Solver.Solve(model, Callback)
+        SearchDone.set()
+
+        # Record the outcome
+        Result = SolveResult()
+        Result.SolveSeconds = time.perf_counter() - Start
+        Result.Status = {
+            cp_model.OPTIMAL : 'optimal',
+            cp_model.FEASIBLE : 'feasible',
+            cp_model.INFEASIBLE : 'infeasible',
+            cp_model.MODEL_INVALID : 'abnormal',
+        }.get(status, 'not solved')
+
+        # Record the solution, if there is one, converting the objective back into the units of the Weight dictionary
+        if Result.Status in ('optimal', 'feasible'):
+            Result.ObjectiveValue = Solver.ObjectiveValue() / Scale
+            Result.BestBound = Solver.BestObjectiveBound() / Scale
+            Result.ScheduledMeetings = {k for k in Meeting if Solver.BooleanValue(Meeting[k])}
+
+        # Record why the solver stopped early, if it did
+        if Result.Status == 'optimal' and StoppedOnGap(Result, Parameters):
+            (Result.Status, Result.StopReason) = ('feasible', 'gap')
+        elif Result.Status == 'feasible':
+            Result.StopReason = 'stall' if Callback.Stalled else 'time limit'
+
+        # Record the statistics of the solver
+        Result.SolverStatistics = {'Branches' : Solver.NumBranches(), 'Conflicts' : Solver.NumConflicts(), 'Wall time (s)' : Solver.WallTime()}
+
+        # Return the result
+        return Result
+
+# Define the class for the heuristic (greedy construction followed by local search) backend, which needs no solver
+class HeuristicBackend():
+
+    def IsAvailable(self):
+        # The heuristic is pure Python
+        return True
+
+    def Build(self, Visitors, Professors, TimeSlots, Parameters, Scope = None, Analysis = None):
+        # There is no model to build, so the inputs are simply bundled together for Solve
+        return ((Visitors, Professors, TimeSlots, GetPreferenceMatrix(Visitors, Professors), Scope), None)
+
+    def GetModelSize(self, model):
+        # Returns the number of meetings the heuristic can choose from
+        (Visitors, Professors, TimeSlots, PreferenceMatrix, Scope) = model
+        return {'Feasible meetings' : len(GetScopedMeetings(Visitors, Professors, TimeSlots, Scope))}
+
+    def Solve(self, model, Meeting, Parameters, Hint = None, HintMinimums = (0, 0), Progress = None):
+        # Builds a greedy schedule (or starts from the hint, if one is given), improves it by local search, and returns a
+        # SolveResult.  The heuristic can't prove optimality, so the best bound is left undefined.  It only takes about a
+        # second, so its progress isn't reported.
+
+        # Unpack the inputs
+        (Visitors, Professors, TimeSlots, PreferenceMatrix, Scope) = model
+
+        # Build the schedule
+        Start = time.perf_counter()
+        if Hint is None:
+            Hint = GreedySchedule(Visitors, Professors, TimeSlots, PreferenceMatrix, Parameters, Scope)
+        ScheduledMeetings = LocalSearchSchedule(Visitors, Professors, TimeSlots, PreferenceMatrix, Hint, Parameters, Scope=Scope)
+
+        # Record the outcome
+        Result = SolveResult()
+        Result.SolveSeconds = time.perf_counter() - Start
+        Result.Status = 'heuristic'
+        Result.ObjectiveValue = CalcScheduleObjective(Visitors, ScheduledMeetings, Parameters)
+        Result.ScheduledMeetings = ScheduledMeetings
+
+        # Return the result
+        return Result
+
+# Specify the available solver backends.  The commercial solvers are only usable if OR-Tools finds a license for them.
+SolverBackends = {
+    'cbc' : LinearSolverBackend('CBC'),
+    'scip' : LinearSolverBackend('SCIP'),
+    'highs' : LinearSolverBackend('HIGHS', SupportsHint=False), # OR-Tools crashes when HiGHS is given a hint
+    'sat' : LinearSolverBackend('SAT'),
+    'cp-sat' : CpSatBackend(),
+    'heuristic' : HeuristicBackend(),
+    'gurobi' : LinearSolverBackend('GUROBI'),
+    'cplex' : LinearSolverBackend('CPLEX'),
+    'xpress' : LinearSolverBackend('XPRESS'),
+}
+
+# Define the function for building and solving the model with a given backend
+def SolveWithBackend(Visitors, Professors, TimeSlots, BackendName, Parameters = None, Hint = None, Scope = None, Progress = None, Report = None):
+    # Inputs:
+    #   Hint = an optional set of (visitor, professor, time slot) triples from which the solver starts its search
+    #   Scope = an optional ModelScope restricting the model to part of the problem
+    #   Progress = an optional ProgressReporter which streams the progress of the solver
+    #   Report = an optional RunReport in which the pre-solve analysis, the build and solve stages, the size of the model,
+    #            and the statistics of the solver are recorded
+    # Returns:
+    #   Result = the SolveResult of the backend
+    #   BuildSeconds = the wall-clock time spent building the model
+
+    # Use the default parameters, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+
+    # Look up the backend
+    Backend = SolverBackends[BackendName]
+
+    # Leave out the symmetry-breaking constraints when starting from a hint, since the hint needn't order the numbers of
+    # meetings of interchangeable visitors (or professors) the same way, and the solver would then reject it
+    if Hint is not None and Parameters['BreakSymmetry']:
+        Parameters = dict(Parameters, BreakSymmetry=False)
+
+    # Check that the model has a solution, and bound the minimums, before building it
+    print('Analyzing the problem...')
+    with TimeStage(Report, 'Presolve'):
+        Analysis = AnalyzeFeasibility(Visitors, Professors, TimeSlots, Parameters, Scope)
+    Analysis.PrintSummary()
+    if Report is not None:
+        Report.Details['Presolve'] = Analysis.ToDict()
+
+    # Stop without building the model if it has no solution
+    if Analysis.Problem is not None:
+        Result = SolveResult()
+        Result.Status = 'infeasible'
+        Result.Diagnosis = Analysis.Problem
+        return (Result, 0.0)
+
+    # Build the model
+    Start = time.perf_counter()
+    with TimeStage(Report, 'Build'):
+        (model, Meeting) = Backend.Build(Visitors, Professors, TimeSlots, Parameters, Scope, Analysis)
+    BuildSeconds = time.perf_counter() - Start
+
+    # Record the size of the model
+    if Report is not None:
+        Report.Details['Model'] = Backend.GetModelSize(model)
+
+    # Solve the model
+    print('Solving the model with %s... (This may take a few minutes)' % BackendName)
+    with TimeStage(Report, 'Solve'):
+        if Hint is None:
+            Result = Backend.Solve(model, Meeting, Parameters, Progress=Progress)
+        else:
+            Result = Backend.Solve(model, Meeting, Parameters, Hint, CalcScheduleMinimums(Visitors, Hint), Progress)
 
-    # Print a status update
-    print('Defining the optimization model...')
+    # Return the result
+    return (Result, BuildSeconds)
 
-    # Instantiate the model
-    model = pywraplp.Solver.CreateSolver('cbc')
+# Define the function for splitting the problem into the morning and afternoon windows
+def BuildWindowScopes(Visitors, Professors, TimeSlots, Parameters = None):
+    # Returns a list with one (window name, visitors, scope) triple for each window.  Morning-only and afternoon-only
+    # visitors only take part in their own window, while visitors who are available all day ('na') take part in both, with
+    # their maximum number of meetings split between the windows in proportion to the number of time slots in each.
 
-    # Create the model variables
-    print('\tDefining the decision variables...')
+    # Use the default parameters, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
 
-    ## Primary decision variables
-    Meeting = dict()
-    for v in Visitors:
-        for p in Professors:
-            for t in TimeSlots:
-                Meeting[(v,p,t)] = model.IntVar(0, 1, 'Visitor %d assigned to meet with Professor %d during time slot %d.' % (v, p, t))
+    # Calculate the maximum number of meetings per visitor
+    MaxMeetings = len(TimeSlots) - Parameters['RequiredFreePeriods']
 
-    ## Secondary decision variables
-    MinMeetings = model.NumVar(0, model.infinity(), 'Minimum Meetings per Visitor')
+    # Split the time slots
+    Windows = [
+        ('morning', [t for t in TimeSlots if t < AfternoonStartSlot]),
+        ('afternoon', [t for t in TimeSlots if t >= AfternoonStartSlot]),
+    ]
 
-    MinHappiness = model.NumVar(0, model.infinity(), 'Minimum Happiness per Visitor')
+    # Find the feasible meetings
+    FeasibleMeetings = GetFeasibleMeetings(Visitors, Professors, TimeSlots)
 
-    # Create the constraints
-    print('\tDefining the constraints...')
-    ## Each visitor can meet with at most one professor during any given time slot
-    for v in Visitors:
-        for t in TimeSlots:
-            model.Add(
-                sum(Meeting[(v,p,t)] for p in Professors) <= 1
-            )
+    # Build the scope of each window
+    WindowScopes = []
+    MeetingsAssigned = {v : 0 for v in Visitors}
+    for (WindowName, WindowSlots) in Windows:
 
-    ## Visitors can only attend meetings permitted by their timezones
-    for v in Visitors:
-        if Visitors[v].Availability == 'morning':
-            for t in TimeSlots:
-                if t >= 8:
-                    for p in Professors:
-                        model.Add(
-                            Meeting[v,p,t] == 0
-                        )
+        # Find the visitors who can meet during the window
+        WindowVisitors = {v : Visitors[v] for v in Visitors if any(VisitorCanMeet(Visitors[v], t) for t in WindowSlots)}
 
-        elif Visitors[v].Availability == 'afternoon':
-            for t in TimeSlots:
-                if t < 8:
-                    for p in Professors:
-                        model.Add(
-                            Meeting[v,p,t] == 0
-                        )
+        # Restrict the model to the meetings of these visitors during the window
+        Scope = ModelScope()
+        Scope.FeasibleMeetings = [(v,p,t) for (v,p,t) in FeasibleMeetings if v in WindowVisitors and t in WindowSlots]
 
-    ## Each professor can meet with at most one visitor during any given time slot
-    for p in Professors:
-        for t in TimeSlots:
-            model.Add(
-                sum(Meeting[(v,p,t)] for v in Visitors) <= 1
-            )
+        # Give the visitors available all day their share of the maximum number of meetings (with the last window getting
+        # whatever is left over)
+        for v in WindowVisitors:
+            if Visitors[v].Availability not in ('morning', 'afternoon'):
+                if WindowName == Windows[-1][0]:
+                    Scope.MaxMeetings[v] = MaxMeetings - MeetingsAssigned[v]
+                else:
+                    Scope.MaxMeetings[v] = round(MaxMeetings * len(WindowSlots) / len(TimeSlots))
+                MeetingsAssigned[v] += Scope.MaxMeetings[v]
 
-    ## Each professor can only meet with visitors when the professor is available
-    for p in Professors:
-        for t in TimeSlots:
-            for v in Visitors:
-                model.Add(
-                    Meeting[(v,p,t)] <= Professors[p].Availability[t]
-                )
+        # Add the window to the list
+        WindowScopes.append((WindowName, WindowVisitors, Scope))
 
-    ## Each professor-visitor pair can meet at most once
-    for p in Professors:
-        for v in Visitors:
-            model.Add(
-                sum(Meeting[(v,p,t)] for t in TimeSlots) <= 1
-            )
+    # Return the result
+    return WindowScopes
+
+# Define the function for solving one window of the decomposed problem (in a separate process)
+def SolveWindow(Arguments):
+    # Returns the SolveResult of the window
+    (Visitors, Professors, TimeSlots, BackendName, Parameters, Scope) = Arguments
+    (Result, BuildSeconds) = SolveWithBackend(Visitors, Professors, TimeSlots, BackendName, Parameters, Scope=Scope)
+    return Result
+
+# Define the function for solving the problem by decomposing it into the morning and afternoon windows
+def SolveDecomposed(Visitors, Professors, TimeSlots, BackendName, Parameters = None):
+    # The windows are solved concurrently in a process pool and their schedules are merged.  The windows are only coupled
+    # through the visitors available all day, who could end up meeting the same professor in both windows, and through
+    # the overall minimum number of meetings and minimum happiness.  These are coordinated afterwards by dropping any
+    # repeated meetings and improving the merged schedule by local search with the full objective.
+    # Returns:
+    #   Result = a SolveResult with the 'decomposed' status (or the status of the first window which failed)
+    #   BuildSeconds = always 0, since the models are built within the solve time of the windows
+
+    # Use the default parameters, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+
+    # Split the problem into windows
+    WindowScopes = BuildWindowScopes(Visitors, Professors, TimeSlots, Parameters)
+
+    # Solve the windows in parallel
+    print('Solving the morning and afternoon windows in parallel with %s...' % BackendName)
+    Start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=len(WindowScopes)) as Pool:
+        WindowResults = list(Pool.map(SolveWindow, [(WindowVisitors, Professors, TimeSlots, BackendName, Parameters, Scope) for (WindowName, WindowVisitors, Scope) in WindowScopes]))
+
+    # Stop if any window failed
+    for ((WindowName, WindowVisitors, Scope), WindowResult) in zip(WindowScopes, WindowResults):
+        print('\tThe %s window finished with the %s status and an objective of %f.' % (WindowName, WindowResult.Status, WindowResult.ObjectiveValue))
+        if WindowResult.Status not in ('optimal', 'feasible', 'heuristic'):
+            WindowResult.SolveSeconds = time.perf_counter() - Start
+            return (WindowResult, 0.0)
+
+    # Merge the schedules, dropping any repeated meetings between the same visitor and professor
+    ScheduledMeetings = set()
+    PairsMet = set()
+    for WindowResult in WindowResults:
+        for (v,p,t) in sorted(WindowResult.ScheduledMeetings):
+            if (v,p) not in PairsMet:
+                ScheduledMeetings.add((v,p,t))
+                PairsMet.add((v,p))
+    print('\tMerged the windows, dropping %d repeated meetings.' % (sum(len(WindowResult.ScheduledMeetings) for WindowResult in WindowResults) - len(ScheduledMeetings)))
+
+    # Coordinate the windows by improving the merged schedule
+    print('Improving the merged schedule...')
+    ScheduledMeetings = LocalSearchSchedule(Visitors, Professors, TimeSlots, GetPreferenceMatrix(Visitors, Professors), ScheduledMeetings, Parameters)
+
+    # Record the outcome
+    Result = SolveResult()
+    Result.SolveSeconds = time.perf_counter() - Start
+    Result.Status = 'decomposed'
+    Result.StopReason = next((WindowResult.StopReason for WindowResult in WindowResults if WindowResult.StopReason in ('time limit', 'stall')), '')
+    Result.ObjectiveValue = CalcScheduleObjective(Visitors, ScheduledMeetings, Parameters)
+    Result.ScheduledMeetings = ScheduledMeetings
 
-    ## Each visitor must have at least the minimum number of meetings
-    for v in Visitors:
-        model.Add(
-            sum(
-                sum(
-                    Meeting[(v,p,t)] 
-                    for t in TimeSlots
-                )
-                for p in Professors
-            )
-            >=
-            MinMeetings
-        )
+    # Return the result
+    return (Result, 0.0)
+
+# Define the function for fingerprinting a problem
+def FingerprintProblem(Visitors, Professors, TimeSlots, BackendName, Parameters, Options = ()):
+    # Returns a SHA-256 hash (as a string of hexadecimal digits) of everything that determines the schedule: the visitors
+    # (including their preference points), the professors, the time slots, the parameters (apart from the number of search
+    # workers), the solver, and any other options which affect the solve (e.g., the hint)
+    Contents = (
+        ResultCacheVersion,
+        AfternoonStartSlot,
+        BackendName,
+        sorted((Name, repr(Parameters[Name])) for Name in Parameters if Name != 'NumWorkers'),
+        [(v, str(Visitors[v].FirstName), str(Visitors[v].LastName), Visitors[v].Availability, sorted((int(p), int(Points)) for (p, Points) in Visitors[v].PreferencePoints.items())) for v in sorted(Visitors)],
+        [(p, str(Professors[p].LastName), [bool(Professors[p].Availability[t]) for t in TimeSlots]) for p in sorted(Professors)],
+        sorted(TimeSlots.items()),
+        Options,
+    )
+    return hashlib.sha256(repr(Contents).encode('utf-8')).hexdigest()
 
-    ## Each visitor must have at least the minimum happiness score
-    for v in Visitors:
-        model.Add(
-            sum(
-                sum(
-                    Meeting[(v,p,t)] * Visitors[v].PreferencePoints[p]
-                    for t in TimeSlots
-                )
-                for p in Professors
-            )
-            >=
-            MinHappiness
-        )
+# Define the function for loading a solved schedule from the cache
+def LoadCachedResult(Fingerprint):
+    # Returns the SolveResult saved under the fingerprint, or None if there isn't one
 
-    ## Each visitor must have at least the minimum number of free periods
-    RequiredFreePeriods = 8
-    for v in Visitors:
-        model.Add(
-            sum(
-                sum(
-                    Meeting[(v,p,t)] 
-                    for t in TimeSlots
-                )
-                for p in Professors
-            )
-            <=
-            len(TimeSlots) - RequiredFreePeriods
-        )
+    # Check that the file exists
+    CacheFileName = os.path.join(CacheDirectory, 'Results', '%s.pickle' % Fingerprint)
+    if not os.path.isfile(CacheFileName):
+        return None
 
-    # Set the objective
-    print('\tDefining the objective...')
+    # Load the result, treating any problem (e.g., a file written by an older version) as a cache miss
+    try:
+        with open(CacheFileName, 'rb') as File:
+            (Version, Result) = pickle.load(File)
+    except Exception:
+        return None
+    if Version != ResultCacheVersion:
+        return None
 
-    ## Define the weights of the various objectives
-    Weight = {
-        'Maximize the happiness points' : 1,
-        'Maximize the number of meetings' : 0.1,
-        'Maximize the minimum number of meetings': 1,
-        'Maximize the minimum happiness score': 1
-    }
+    # Mark the result as recently used, so that it is among the last to be evicted
+    os.utime(CacheFileName)
 
-    ## Define the objective
-    model.Maximize(
+    # Return the result
+    return Result
+
+# Define the function for checking whether a solved schedule may be cached
+def IsCacheableResult(Result):
+    # Returns False if the solver was cut off by the time limit or the stall policy, since another run (e.g., with more
+    # time) could find a better schedule and shouldn't be handed this one from the cache
+    return Result.Status == 'optimal' or Result.StopReason not in ('time limit', 'stall')
+
+# Define the function for saving a solved schedule to the cache
+def SaveCachedResult(Fingerprint, Result):
+
+    # Leave out any schedule which the solver was cut off before finishing, whoever the caller is
+    if not IsCacheableResult(Result):
+        return
+
+    # Write the result to a temporary file first, so that an interrupted run can't leave a broken file in the cache
+    CacheFileName = os.path.join(CacheDirectory, 'Results', '%s.pickle' % Fingerprint)
+    try:
+        os.makedirs(os.path.dirname(CacheFileName), exist_ok=True)
+        TemporaryFileName = '%s.%d.tmp' % (CacheFileName, os.getpid())
+        with open(TemporaryFileName, 'wb') as File:
+            pickle.dump((ResultCacheVersion, Result), File, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(TemporaryFileName, CacheFileName)
+    except OSError as Error:
+        print('Warning: The schedule could not be saved to the cache (%s).' % Error)
+        return
+
+    # Keep the cache within its size limit
+    EvictCachedResults(ResultCacheMaxMegabytes * 1024 * 1024)
+
+# Define the function for limiting the size of the cached schedules
+def EvictCachedResults(MaxBytes):
+    # Deletes the least recently used schedules until the cached schedules take up at most MaxBytes
+
+    # List the cached schedules, most recently used first
+    Directory = os.path.join(CacheDirectory, 'Results')
+    Files = [os.path.join(Directory, FileName) for FileName in os.listdir(Directory) if FileName.endswith('.pickle')]
+    Files.sort(key=os.path.getmtime, reverse=True)
+
+    # Delete the schedules beyond the size limit
+    TotalBytes = 0
+    for FileName in Files:
+        TotalBytes += os.path.getsize(FileName)
+        if TotalBytes > MaxBytes:
+            os.remove(FileName)
+
+# Define the function for checking that a solve produced an acceptable schedule
+def CheckSolveResult(Result):
+    # Prints the outcome of the solve, and raises a ValueError with an error message if no schedule was found.  A schedule which the
+    # solver couldn't prove to be optimal is still used, along with a warning if its optimality gap is large.
 
-        # Maximize the happiness points
-        Weight['Maximize the happiness points'] *
-        sum(
-            sum(
-                sum(
-                    Meeting[(v,p,t)] * Visitors[v].PreferencePoints[p]
-                    for t in TimeSlots
-                )
-                for v in Visitors
-            )
-            for p in Professors
-        )
+    # Check for optimality
+    if Result.Status == 'optimal':
 
-        +
+        # Display a success message
+        print('Optimal solution found!')
 
-        Weight['Maximize the number of meetings'] *
-        sum(
-            sum(
-                sum(
-                    Meeting[(v,p,t)]
-                    for t in TimeSlots
-                )
-                for v in Visitors
-            )
-            for p in Professors
-        )
+    elif Result.Status == 'heuristic':
 
-        +
+        # Display a success message
+        print('A schedule was found by the heuristic (its optimality has not been proven).')
 
-        Weight['Maximize the minimum number of meetings'] * MinMeetings
+    elif Result.Status == 'decomposed':
 
-        +
+        # Display a success message
+        print('A schedule was found by solving the morning and afternoon separately (its optimality has not been proven).')
 
-        Weight['Maximize the minimum happiness score'] * MinHappiness
-    )
+    elif Result.Status == 'infeasible':
 
-    # Return the model and the decision variable dictionary
-    return (model, Meeting)
+        # Stop with an error message, explaining why if the pre-solve analysis found out
+        raise ValueError(('The model was found to be infeasible.  %s' % Result.Diagnosis).strip())
 
-def PrintVisitorSchedule(Visitors, Professors, TimeSlots, Meeting, v):
-    # Prints out the schedule for the specified visitor
-    #
-    # Inputs:
-    #   v = the Id number of the visitor whose schedule you'd like to print out
-    
-    # Build the name of the output file
-    FileName = 'Visitor %s %s\'s Schedule.txt' % (Visitors[v].FirstName, Visitors[v].LastName)
+    elif Result.Status == 'not solved':
 
-    # Build the path to the directory
-    FileDirectory = '%s%s%s' %(os.getcwd(), os.sep, 'Visitor Schedules')
+        # Stop with an error message
+        raise ValueError('The model was not solved to completion.  Consider increasing the amount of time allowed to solve the model.')
 
-    # Check if the directory exists
-    if os.path.isdir(FileDirectory) == False:
+    elif Result.Status == 'unbounded':
 
-        # Create the directory
-        os.mkdir(FileDirectory)
+        # Stop with an error message
+        raise ValueError('The model was found to be unbounded.')
 
-    # Build the path to the output file
-    FilePath = '%s%s%s' %(FileDirectory, os.sep, FileName)
+    elif Result.Status == 'abnormal':
 
-    # Open up the file for writing
-    File = open(FilePath, 'w')
+        # Stop with an error message
+        raise ValueError('The solver exited with an abnormal status. Consider increasing the amount of time allowed to solve the model.')
 
-    # Print out the visitor's name
-    File.write('Visitor: %s %s\n' % (Visitors[v].FirstName, Visitors[v].LastName))
+    else:
 
-    # Loop over the time slots
-    for t in TimeSlots:
+        # Describe why the solver stopped before proving optimality
+        if Result.StopReason == 'gap':
+            print('The solver stopped once it reached the target optimality gap.')
+        elif Result.StopReason == 'stall':
+            print('The solver stopped because the schedule had stopped improving.')
+        else:
+            print('Warning: The model was not solved to completion.')
+
+        # Calculate the optimality gap
+        RelativeOptimalityGap = Result.RelativeGap()
 
-        # Initialize the string to print
-        PrintString = '\t%s (Period %d):' % (TimeSlots[t], t)
+        # Print the optimality gap
+        print('The optimality gap is %f%%' % (RelativeOptimalityGap * 100))
 
-        # Initialize a flag to indicate that a meeting has not yet been found
-        MeetingFound = False
+        if RelativeOptimalityGap > 0.01:
 
-        # Loop over the Professors
-        for p in Professors:
+            # Display a warning, but use the schedule anyway
+            print('Warning: The schedule may be noticeably worse than the best possible one.  Consider increasing the amount of time allowed to solve the model.')
 
-            # check if the current visitor has a meeting scheduled with the current professor
-            if Meeting[(v,p,t)].solution_value() == 1: # then a meeting between this visitor and professor has been scheduled
+        else:
 
-                # Add the professor's name to the print string
-                PrintString += ' Professor %s' % Professors[p].LastName
+            # Print a partial success message
+            print('The model was solved to within an acceptable optimality gap.')
 
-                # Raise the flag to indicate that a meeting was found
-                MeetingFound = True
+    # Print a success message
+    print('Success!')
 
-        # Check if a meeting was found
-        if MeetingFound == False: # then no meeting was found
+# Define the function for comparing the solver backends
+def BenchmarkBackends(Visitors, Professors, TimeSlots, BackendNames, Parameters = None, Decompose = False, CompareReductions = False):
+    # Builds and solves the model with each of the given backends and returns a data frame with one row per backend,
+    # listing the build time, solve time, objective, best bound, and relative optimality gap.  If Decompose is True, each
+    # backend is also used to solve the problem by decomposition (see SolveDecomposed), with the loss in the objective
+    # relative to solving the whole problem at once listed in an extra row.  If CompareReductions is True, each backend is
+    # also used to solve the model without the redundant constraints left out and without symmetry breaking.
+
+    # Use the default parameters, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+
+    # Instantiate the list of rows
+    Rows = []
+
+    # Loop over the backends
+    for BackendName in BackendNames:
+
+        # Skip any backends that aren't available in this installation
+        if not SolverBackends[BackendName].IsAvailable():
+            print('Warning: The %s solver is not available and will be skipped.' % BackendName)
+            Rows.append({'Backend' : BackendName, 'Status' : 'not available'})
+            continue
+
+        # Build and solve the model
+        (Result, BuildSeconds) = SolveWithBackend(Visitors, Professors, TimeSlots, BackendName, Parameters)
+
+        # Record the results
+        Rows.append({
+            'Backend' : BackendName,
+            'Status' : Result.Status,
+            'Build (s)' : BuildSeconds,
+            'Solve (s)' : Result.SolveSeconds,
+            'Objective' : Result.ObjectiveValue,
+            'Best bound' : Result.BestBound,
+            'Gap (%)' : 100 * Result.RelativeGap(),
+            'Meetings' : len(Result.ScheduledMeetings),
+        })
+
+        # Solve the model without the reductions, if requested
+        if CompareReductions:
+            (UnreducedResult, BuildSeconds) = SolveWithBackend(Visitors, Professors, TimeSlots, BackendName, dict(Parameters, DropRedundantConstraints=False, BreakSymmetry=False))
+            Rows.append({
+                'Backend' : '%s (no reductions)' % BackendName,
+                'Status' : UnreducedResult.Status,
+                'Build (s)' : BuildSeconds,
+                'Solve (s)' : UnreducedResult.SolveSeconds,
+                'Objective' : UnreducedResult.ObjectiveValue,
+                'Best bound' : UnreducedResult.BestBound,
+                'Gap (%)' : 100 * UnreducedResult.RelativeGap(),
+                'Meetings' : len(UnreducedResult.ScheduledMeetings),
+            })
+
+        # Solve the problem by decomposition, if requested, and compare the objective with that of the whole problem
+        if Decompose:
+            (DecomposedResult, BuildSeconds) = SolveDecomposed(Visitors, Professors, TimeSlots, BackendName, Parameters)
+            Rows.append({
+                'Backend' : '%s (decomposed)' % BackendName,
+                'Status' : DecomposedResult.Status,
+                'Build (s)' : BuildSeconds,
+                'Solve (s)' : DecomposedResult.SolveSeconds,
+                'Objective' : DecomposedResult.ObjectiveValue,
+                'Loss (%)' : 100 * (Result.ObjectiveValue - DecomposedResult.ObjectiveValue) / max(abs(Result.ObjectiveValue), 0.001),
+                'Meetings' : len(DecomposedResult.ScheduledMeetings),
+            })
 
-            # Extend the print string to indicate free time
-            PrintString += ' Free time'
+    # Return the result
+    Columns = ['Backend', 'Status', 'Build (s)', 'Solve (s)', 'Objective', 'Best bound', 'Gap (%)', 'Meetings']
+    if Decompose:
+        Columns.insert(Columns.index('Meetings'), 'Loss (%)')
+    return pd.DataFrame(Rows, columns=Columns)
 
-        # Add a newline character
-        PrintString += '\n'
+# Specify the parameters which can be varied between scenarios, other than the weights of the objectives
+ScenarioParameters = ['RequiredFreePeriods', 'MaxMinutes', 'AfternoonStartSlot']
 
-        # Print out the result
-        File.write(PrintString)
+# Define the function for building every combination of the given parameter values
+def BuildScenarioGrid(Grid):
+    # Inputs:
+    #   Grid = a dictionary mapping the name of each parameter (or objective weight) to the list of values to try
+    # Returns:
+    #   Scenarios = a list of dictionaries, each mapping the name of every parameter in the grid to one of its values
+    Names = list(Grid)
+    return [dict(zip(Names, Values)) for Values in itertools.product(*(Grid[Name] for Name in Names))]
+
+# Define the function for reading a list of scenarios from a CSV file
+def ReadScenarios(FileName):
+    # Each row of the file is a scenario, and each column is a parameter (e.g., RequiredFreePeriods) or an objective weight
+    # (e.g., Maximize the number of meetings).  Empty cells keep the default value.  An optional Scenario column names the
+    # scenarios.  Returns the list of scenarios, each a dictionary mapping parameter names to values.
+
+    # Read the file
+    df = pd.read_csv(FileName)
+
+    # Check the column names
+    for Column in df.columns:
+        if Column != 'Scenario' and Column not in ScenarioParameters and Column not in DefaultParameters['Weight']:
+            raise ValueError('Unrecognized column in \"%s\": %s' % (FileName, Column))
+
+    # Convert each row into a scenario, leaving out the empty cells
+    return [{Column : Row[Column] for Column in df.columns if not pd.isna(Row[Column])} for (i, Row) in df.iterrows()]
+
+# Define the function for looking up the parameters of a scenario
+def GetScenarioParameters(Scenario, Parameters = None):
+    # Returns a copy of the parameters (defaulting to DefaultParameters) with the values of the scenario filled in, along
+    # with the first time slot of the afternoon in the scenario
+    if Parameters is None:
+        Parameters = DefaultParameters
+    NewParameters = dict(Parameters, Weight=dict(Parameters['Weight']))
+    for Name in Scenario:
+        if Name in NewParameters['Weight']:
+            NewParameters['Weight'][Name] = float(Scenario[Name])
+        elif Name in ('RequiredFreePeriods', 'AfternoonStartSlot'):
+            NewParameters[Name] = int(Scenario[Name])
+        elif Name == 'MaxMinutes':
+            NewParameters[Name] = ParseMaxMinutes(Scenario[Name])
+    return (NewParameters, NewParameters.pop('AfternoonStartSlot', AfternoonStartSlot))
+
+# Define the variable which holds the inputs shared by every task of a process pool, within each of the worker processes
+WorkerInputs = None
+
+# Define the function for handing the inputs shared by every task to a worker process (once, rather than once per task)
+def SetWorkerInputs(*Inputs):
+    global WorkerInputs
+    WorkerInputs = Inputs
+
+# Define the function for solving one scenario of a sweep (in a worker process)
+def SolveScenario(Arguments):
+    # Returns a dictionary with the outcome of the scenario
+    global AfternoonStartSlot
+
+    # Unpack the inputs
+    (Name, Scenario, BackendName, Parameters) = Arguments
+    (Visitors, Professors, TimeSlots) = WorkerInputs
+
+    # Set the parameters of the scenario (the time slot at which the afternoon starts is a setting of the whole module, which
+    # is safe to change here since each worker process only solves one scenario at a time).  The setting is restored
+    # afterwards, so that the next scenario solved by the same worker doesn't inherit it.
+    OriginalAfternoonStartSlot = AfternoonStartSlot
+    (Parameters, AfternoonStartSlot) = GetScenarioParameters(Scenario, Parameters)
+
+    # Build and solve the model
+    try:
+        (Result, BuildSeconds) = SolveWithBackend(Visitors, Professors, TimeSlots, BackendName, Parameters)
+    finally:
+        AfternoonStartSlot = OriginalAfternoonStartSlot
+
+    # Describe the schedule
+    (MinMeetings, MinHappiness) = CalcScheduleMinimums(Visitors, Result.ScheduledMeetings)
+    TotalMeetingsAvailable = sum(1 for p in Professors for t in TimeSlots if Professors[p].Availability[t])
+    Row = dict({'Scenario' : Name}, **Scenario)
+    Row.update({
+        'Status' : Result.Status,
+        'Objective' : Result.ObjectiveValue,
+        'Gap (%)' : 100 * Result.RelativeGap(),
+        'Min happiness' : MinHappiness if len(Result.ScheduledMeetings) > 0 else float('nan'),
+        'Min meetings' : MinMeetings if len(Result.ScheduledMeetings) > 0 else float('nan'),
+        'Meetings' : len(Result.ScheduledMeetings),
+        'Available meetings scheduled (%)' : 100 * len(Result.ScheduledMeetings) / max(TotalMeetingsAvailable, 1),
+        'Build (s)' : BuildSeconds,
+        'Solve (s)' : Result.SolveSeconds,
+    })
 
-    # Close the file you were writing to
-    File.close()
+    # Return the result
+    return Row
 
-def PrintAllVisitorSchedules(Visitors, Professors, TimeSlots, Meeting):
+# Define the function for solving many variants of the problem in parallel
+def SweepScenarios(Visitors, Professors, TimeSlots, BackendName, Scenarios, Parameters = None, NumProcesses = None):
+    # Solves each scenario (a dictionary of parameter values, see GetScenarioParameters) in a pool of worker processes, all
+    # sharing the same visitors and professors, and returns a data frame with one row per scenario.
+    #
+    # Inputs:
+    #   Scenarios = a list of scenarios, or a dictionary mapping scenario names to scenarios
+    #   NumProcesses = the number of worker processes (defaults to the number of cores)
+
+    # Use the default parameters, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+
+    # Name the scenarios, if necessary
+    if not isinstance(Scenarios, dict):
+        Scenarios = {Scenario.get('Scenario', 'Scenario %d' % (i + 1)) : {Name : Scenario[Name] for Name in Scenario if Name != 'Scenario'} for (i, Scenario) in enumerate(Scenarios)}
+
+    # Share the cores between the processes, so that CP-SAT doesn't start more search workers than there are cores
+    if NumProcesses is None:
+        NumProcesses = os.cpu_count()
+    NumProcesses = max(1, min(NumProcesses, len(Scenarios)))
+    if Parameters['NumWorkers'] == 0:
+        Parameters = dict(Parameters, NumWorkers=max(1, os.cpu_count() // NumProcesses))
+
+    # Solve the scenarios
+    print('Solving %d scenarios with %s in %d processes...' % (len(Scenarios), BackendName, NumProcesses))
+    with ProcessPoolExecutor(max_workers=NumProcesses, initializer=SetWorkerInputs, initargs=(Visitors, Professors, TimeSlots)) as Pool:
+        Rows = list(Pool.map(SolveScenario, [(Name, Scenarios[Name], BackendName, Parameters) for Name in Scenarios]))
+
+    # Return the result, with the parameters of the scenarios listed before their outcomes
+    Columns = ['Scenario'] + list(dict.fromkeys(Name for Scenario in Scenarios.values() for Name in Scenario))
+    return pd.DataFrame(Rows, columns=Columns + [Column for Column in Rows[0] if Column not in Columns])
+
+# Define the function for finding the events in a list of workbooks
+def FindEvents(ExcelFileNames):
+    # Every sheet whose name starts with "Visitor Preferences" holds the visitors of one event.  The event is named after the
+    # workbook, followed by the rest of the sheet name, if any (e.g., the sheet "Visitor Preferences - March" of
+    # "Weekends.xlsx" is the event "Weekends March").  Raises a ValueError if two events end up with the same name.
+    # Returns:
+    #   Events = a dictionary mapping each event name to the (workbook, sheet) pair holding its visitors
+
+    # Instantiate the dictionary of events
+    Events = dict()
+
+    # Loop over the workbooks
+    for ExcelFileName in ExcelFileNames:
+
+        # Loop over the visitor sheets of the workbook (closing it as soon as its sheet names have been read)
+        with pd.ExcelFile(ExcelFileName) as Workbook:
+            SheetNames = Workbook.sheet_names
+        for SheetName in SheetNames:
+            if not SheetName.startswith('Visitor Preferences'):
+                continue
+
+            # Name the event
+            EventName = ('%s %s' % (os.path.splitext(os.path.basename(ExcelFileName))[0], SheetName[len('Visitor Preferences'):].strip(' -'))).strip()
+            if EventName in Events:
+                raise ValueError('There is more than one event called \"%s\".' % EventName)
+
+            # Add the event
+            Events[EventName] = (ExcelFileName, SheetName)
 
-    # Loop over all the visitors
-    for v in Visitors:
+    # Return the result
+    return Events
+
+# Define the function for scheduling one event of a batch (in a worker process)
+def ScheduleEvent(Arguments):
+    # Reads the visitors of the event, combines them with the professor roster shared by every event, solves the model,
+    # and writes the schedules (along with a log of everything that would otherwise have been printed) to the output
+    # directory of the event.
+    # Returns:
+    #   Row = a dictionary describing the outcome of the event (with the 'error' status and the error message if the event
+    #         couldn't be scheduled)
+    #   ProfessorMeetings = a dictionary mapping the id of each professor to their number of meetings (or None if the event
+    #                       couldn't be scheduled)
+
+    # Unpack the inputs
+    (EventName, ExcelFileName, SheetName, OutputDirectory, BackendName, Parameters, Bundle) = Arguments
+    (ProfessorNames, AvailabilityMatrix, TimeSlots) = WorkerInputs
+
+    # Create the output directory of the event
+    os.makedirs(OutputDirectory, exist_ok=True)
+
+    # Start timing the stages of the event
+    Report = RunReport()
+    Report.Details.update({'Event' : EventName, 'Solver' : BackendName, 'Parameters' : Parameters})
+
+    # Send everything printed while scheduling the event to its log.  A problem with the event (e.g., a missing column in
+    # its sheet) is recorded in the log and the summary rather than raised, so that it doesn't stop the rest of the batch.
+    with open(os.path.join(OutputDirectory, 'Log.txt'), 'w') as Log, contextlib.redirect_stdout(Log):
+        try:
+            # Combine the visitors of the event with a fresh copy of the professor roster
+            print('Attempting to import the visitor information from the \"%s\" sheet of \"%s\"...' % (SheetName, os.path.abspath(ExcelFileName)))
+            with Report.Stage('Import'):
+                Data = InputData()
+                (Data.VisitorFrame, Data.PreferredProfessors) = ReadVisitorArrays(ExcelFileName, SheetName)
+                (Data.ProfessorNames, Data.AvailabilityMatrix, Data.TimeSlots) = (ProfessorNames, AvailabilityMatrix.copy(), TimeSlots)
+                Visitors = Data.GetVisitors()
+                Professors = Data.GetProfessors()
+            print('\tSuccessfully read in the information of %d visitors.' % len(Visitors))
+
+            # Calculate the number of "preference points" that each visitor associates with each professor
+            with Report.Stage('Preference points'):
+                CalcPreferencePoints(Visitors, Professors, Data.GetProfessorIndex())
+
+            # Build and solve the model
+            (Result, BuildSeconds) = SolveWithBackend(Visitors, Professors, TimeSlots, BackendName, Parameters, Report=Report)
+            Report.RecordResult(Result)
+
+            # Write out the statistics and schedules, if a schedule was found
+            if Result.Status in ('optimal', 'feasible', 'heuristic'):
+                with Report.Stage('Output'):
+                    ReportSchedule(Visitors, Professors, TimeSlots, Result.ScheduledMeetings, OutputDirectory, Bundle)
+            else:
+                print('Error: No schedule was found (the solver finished with the %s status).' % Result.Status)
+
+            # Write out the run report
+            Report.PrintTimes()
+            Report.Write(OutputDirectory)
+        except Exception as Error:
+            print('Error: %s' % Error)
+            return ({'Event' : EventName, 'Status' : 'error', 'Error' : str(Error), 'Output directory' : os.path.abspath(OutputDirectory)}, None)
+
+    # Describe the outcome of the event
+    (MinMeetings, MinHappiness) = CalcScheduleMinimums(Visitors, Result.ScheduledMeetings)
+    TotalMeetingsAvailable = int(Data.AvailabilityMatrix.sum())
+    Row = {
+        'Event' : EventName,
+        'Visitors' : len(Visitors),
+        'Status' : Result.Status,
+        'Objective' : Result.ObjectiveValue,
+        'Gap (%)' : 100 * Result.RelativeGap(),
+        'Min happiness' : MinHappiness if len(Result.ScheduledMeetings) > 0 else float('nan'),
+        'Min meetings' : MinMeetings if len(Result.ScheduledMeetings) > 0 else float('nan'),
+        'Meetings' : len(Result.ScheduledMeetings),
+        'Available meetings scheduled (%)' : 100 * len(Result.ScheduledMeetings) / max(TotalMeetingsAvailable, 1),
+        'Solve (s)' : BuildSeconds + Result.SolveSeconds,
+        'Output directory' : os.path.abspath(OutputDirectory),
+    }
 
-        # Print out the schedule for this visitor
-        PrintVisitorSchedule(Visitors, Professors, TimeSlots, Meeting, v)
+    # Count each professor's meetings
+    ProfessorMeetings = {p : 0 for p in Professors}
+    for (v,p,t) in Result.ScheduledMeetings:
+        ProfessorMeetings[p] += 1
 
-def PrintProfessorSchedule(Visitors, Professors, TimeSlots, Meeting, p):
-    # Prints out the schedule for the specified visitor
+    # Return the result
+    return (Row, ProfessorMeetings)
+
+# Define the function for scheduling several events which share the same professors
+def ScheduleEvents(Events, RosterFileName, BackendName, OutputDirectory, Parameters = None, NumProcesses = None, Bundle = None):
+    # The professor roster is read once, and the events are scheduled concurrently in a pool of worker processes, each
+    # writing its schedules to its own subdirectory of the output directory.
     #
     # Inputs:
-    #   p = the Id number of the professor whose schedule you'd like to print out
-    
-     # Build the name of the output file
-    FileName = 'Professor %s\'s Schedule.txt' % Professors[p].LastName
+    #   Events = a dictionary mapping each event name to the (workbook, sheet) pair holding its visitors (see FindEvents)
+    #   RosterFileName = the workbook whose "Professor Availability" sheet lists the professors
+    #   NumProcesses = the number of worker processes (defaults to the number of cores)
+    #   Bundle = the format in which each event's schedules are also bundled into a single file (see BundleSchedules)
+    # Returns:
+    #   Summary = a data frame with one row per event
+    #   ProfessorLoad = a data frame with the number of meetings of each professor (rows, labelled by their id and name, so
+    #                   that professors who share a name are kept apart) at each event (columns)
+
+    # Use the default parameters, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+
+    # Read the professor roster
+    print('Attempting to import the professor information from \"%s\"...' % os.path.abspath(RosterFileName))
+    (ProfessorNames, AvailabilityMatrix, TimeSlots) = ReadProfessorArrays(RosterFileName)
+    print('\tSuccessfully read in the information of %d professors.' % len(ProfessorNames))
+
+    # Share the cores between the processes, so that CP-SAT doesn't start more search workers than there are cores
+    if NumProcesses is None:
+        NumProcesses = os.cpu_count()
+    NumProcesses = max(1, min(NumProcesses, len(Events)))
+    if Parameters['NumWorkers'] == 0:
+        Parameters = dict(Parameters, NumWorkers=max(1, os.cpu_count() // NumProcesses))
+
+    # Schedule the events
+    print('Scheduling %d events with %s in %d processes...' % (len(Events), BackendName, NumProcesses))
+    with ProcessPoolExecutor(max_workers=NumProcesses, initializer=SetWorkerInputs, initargs=(ProfessorNames, AvailabilityMatrix, TimeSlots)) as Pool:
+        Outcomes = list(Pool.map(ScheduleEvent, [(EventName, Events[EventName][0], Events[EventName][1], os.path.join(OutputDirectory, EventName), BackendName, Parameters, Bundle) for EventName in Events]))
+
+    # Collect the results
+    Summary = pd.DataFrame([Row for (Row, ProfessorMeetings) in Outcomes])
+    if 'Error' in Summary.columns:
+        Summary['Error'] = Summary['Error'].fillna('')
+    ProfessorIds = range(len(ProfessorNames))
+    ProfessorLoad = pd.DataFrame(
+        {Row['Event'] : [ProfessorMeetings[p] if ProfessorMeetings is not None else pd.NA for p in ProfessorIds] for (Row, ProfessorMeetings) in Outcomes},
+        index=pd.MultiIndex.from_arrays([list(ProfessorIds), list(ProfessorNames)], names=['Id', 'Professor']),
+    )
+    ProfessorLoad = ProfessorLoad.astype('Int64')
+    ProfessorLoad['Total'] = ProfessorLoad.sum(axis=1)
+
+    # Return the result
+    return (Summary, ProfessorLoad)
 
-    # Build the path to the directory
-    FileDirectory = '%s%s%s' %(os.getcwd(), os.sep, 'Professor Schedules')
+# Define the function for rendering a visitor's schedule
+def RenderVisitorSchedule(Visitors, Professors, TimeSlots, Schedule, v):
+    # Returns the name of the visitor's schedule file and its contents
+    #
+    # Inputs:
+    #   Schedule = the ScheduleAssignment of the scheduled meetings
+    #   v = the Id number of the visitor whose schedule you'd like to render
+
+    # Build the name of the output file
+    FileName = 'Visitor %s %s\'s Schedule.txt' % (Visitors[v].FirstName, Visitors[v].LastName)
+
+    # Start with the visitor's name
+    Lines = ['Visitor: %s %s\n' % (Visitors[v].FirstName, Visitors[v].LastName)]
+
+    # Loop over the time slots
+    for t in TimeSlots:
+
+        # Look up the professor the visitor is meeting during this time slot
+        p = Schedule.VisitorSlot[v,t]
 
-    # Check if the directory exists
-    if os.path.isdir(FileDirectory) == False:
+        # Describe the meeting, or the free time if there is no meeting
+        if p != -1: # then a meeting between this visitor and professor has been scheduled
+            Lines.append('\t%s (Period %d): Professor %s\n' % (TimeSlots[t], t, Professors[p].LastName))
+        else: # then no meeting was found
+            Lines.append('\t%s (Period %d): Free time\n' % (TimeSlots[t], t))
 
-        # Create the directory
-        os.mkdir(FileDirectory)
+    # Return the result
+    return (FileName, ''.join(Lines))
 
-    # Build the path to the output file
-    FilePath = '%s%s%s' %(FileDirectory, os.sep, FileName)
+# Define the function for rendering a professor's schedule
+def RenderProfessorSchedule(Visitors, Professors, TimeSlots, Schedule, p):
+    # Returns the name of the professor's schedule file and its contents
+    #
+    # Inputs:
+    #   Schedule = the ScheduleAssignment of the scheduled meetings
+    #   p = the Id number of the professor whose schedule you'd like to render
 
-    # Open up the file for writing
-    File = open(FilePath, 'w')
+    # Build the name of the output file
+    FileName = 'Professor %s\'s Schedule.txt' % Professors[p].LastName
 
-    # Print out the professor's name
-    File.write('Professor: %s\n' % Professors[p].LastName)
+    # Start with the professor's name
+    Lines = ['Professor: %s\n' % Professors[p].LastName]
 
     # Loop over the time slots
     for t in TimeSlots:
 
-        # Initialize the string to print
-        PrintString = '\t%s (Period %d):' % (TimeSlots[t], t)
+        # Look up the visitor the professor is meeting during this time slot
+        v = Schedule.ProfSlot[p,t]
+
+        # Describe the meeting, or whether the professor is free or unavailable if there is no meeting
+        if v != -1: # then a meeting between this visitor and professor has been scheduled
+            Lines.append('\t%s (Period %d): Visitor %s %s\n' % (TimeSlots[t], t, Visitors[v].FirstName, Visitors[v].LastName))
+        elif Professors[p].Availability[t] == True:
+            Lines.append('\t%s (Period %d): Free time (available)\n' % (TimeSlots[t], t))
+        else:
+            Lines.append('\t%s (Period %d): Unavailable\n' % (TimeSlots[t], t))
 
-        # Initialize a flag to indicate that a meeting has not yet been found
-        MeetingFound = False
+    # Return the result
+    return (FileName, ''.join(Lines))
 
-        # Loop over the visitors
-        for v in Visitors:
+# Define the function for writing many files at once
+def WriteFiles(Directory, Files):
+    # Creates the directory (if necessary) and writes each file in a single write, using a pool of threads so that slow
+    # (e.g., network) file systems can work on several files at the same time
+    #
+    # Inputs:
+    #   Files = a dictionary mapping each file name to its contents
 
-            # check if the current visitor has a meeting scheduled with the current professor
-            if Meeting[(v,p,t)].solution_value() == 1: # then a meeting between this visitor and professor has been scheduled
+    # Create the directory
+    os.makedirs(Directory, exist_ok=True)
 
-                # Add the visitor's name to the print string
-                PrintString += ' Visitor %s %s' % (Visitors[v].FirstName, Visitors[v].LastName)
+    # Define the function for writing one file
+    def WriteFile(FileName):
+        with open(os.path.join(Directory, FileName), 'w') as File:
+            File.write(Files[FileName])
 
-                # Raise the flag to indicate that a meeting was found
-                MeetingFound = True
+    # Write the files
+    with ThreadPoolExecutor(max_workers=NumWriterThreads) as Pool:
+        list(Pool.map(WriteFile, Files))
 
-        # Check if a meeting was found
-        if MeetingFound == False: # then no meeting was found
+def PrintVisitorSchedule(Visitors, Professors, TimeSlots, Schedule, v, OutputDirectory = '.'):
+    # Prints out the schedule for the specified visitor
+    #
+    # Inputs:
+    #   Schedule = the ScheduleAssignment of the scheduled meetings
+    #   v = the Id number of the visitor whose schedule you'd like to print out
+    #   OutputDirectory = the directory in which the "Visitor Schedules" directory is created
+    (FileName, Contents) = RenderVisitorSchedule(Visitors, Professors, TimeSlots, Schedule, v)
+    WriteFiles(os.path.join(OutputDirectory, 'Visitor Schedules'), {FileName : Contents})
 
-            # Check if the professor is available during this time slot
-            if Professors[p].Availability[t] == True:
+def PrintAllVisitorSchedules(Visitors, Professors, TimeSlots, Schedule, OutputDirectory = '.'):
+    # Renders every visitor's schedule in memory and then writes them all at once.  Returns the dictionary mapping each
+    # file name to its contents.
 
-                # Extend the print string to indicate free time
-                PrintString += ' Free time (available)'
+    # Render the schedules
+    Files = dict(RenderVisitorSchedule(Visitors, Professors, TimeSlots, Schedule, v) for v in Visitors)
 
-            else:
+    # Write the schedules
+    WriteFiles(os.path.join(OutputDirectory, 'Visitor Schedules'), Files)
 
-                # Extend the print string to indicate unavailability
-                PrintString += ' Unavailable'
+    # Return the result
+    return Files
 
-        # Add a newline character
-        PrintString += '\n'
+def PrintProfessorSchedule(Visitors, Professors, TimeSlots, Schedule, p, OutputDirectory = '.'):
+    # Prints out the schedule for the specified professor
+    #
+    # Inputs:
+    #   Schedule = the ScheduleAssignment of the scheduled meetings
+    #   p = the Id number of the professor whose schedule you'd like to print out
+    #   OutputDirectory = the directory in which the "Professor Schedules" directory is created
+    (FileName, Contents) = RenderProfessorSchedule(Visitors, Professors, TimeSlots, Schedule, p)
+    WriteFiles(os.path.join(OutputDirectory, 'Professor Schedules'), {FileName : Contents})
 
-        # Print out the result
-        File.write(PrintString)
+def PrintAllProfessorSchedules(Visitors, Professors, TimeSlots, Schedule, OutputDirectory = '.'):
+    # Renders every professor's schedule in memory and then writes them all at once.  Returns the dictionary mapping each
+    # file name to its contents.
 
-    # Close the file
-    File.close()
+    # Render the schedules
+    Files = dict(RenderProfessorSchedule(Visitors, Professors, TimeSlots, Schedule, p) for p in Professors)
 
-def PrintAllProfessorSchedules(Visitors, Professors, TimeSlots, Meeting):
+    # Write the schedules
+    WriteFiles(os.path.join(OutputDirectory, 'Professor Schedules'), Files)
 
-    # Loop over all the professors
-    for p in Professors:
+    # Return the result
+    return Files
+
+# Define the function for building the consolidated tables of the schedule
+def BuildScheduleTables(Visitors, Professors, TimeSlots, Schedule):
+    # Builds the master grids (one row per person, one column per time slot) and the statistics of each person, directly
+    # from the arrays of the ScheduleAssignment rather than cell by cell.  CalcVisitorHappiness and CalcMeetingsAvailable
+    # must be called first.
+    # Returns:
+    #   Tables = a dictionary mapping each sheet name to its data frame
+
+    # Look up the Id numbers of everyone, and the labels of the time slots
+    VisitorIds = np.array(list(Visitors), dtype=int)
+    ProfessorIds = np.array(list(Professors), dtype=int)
+    SlotLabels = [TimeSlots[t] for t in TimeSlots]
+
+    # Look up the names of everyone by Id number, with an extra (blank) entry at the end for the -1 which marks free time
+    VisitorNames = np.full(len(Schedule.VisitorSlot) + 1, '', dtype=object)
+    VisitorNames[VisitorIds] = ['%s %s' % (Visitors[v].FirstName, Visitors[v].LastName) for v in VisitorIds]
+    ProfessorNames = np.full(len(Schedule.ProfSlot) + 1, '', dtype=object)
+    ProfessorNames[ProfessorIds] = [Professors[p].LastName for p in ProfessorIds]
+
+    # Build the visitor grid, with the professor each visitor meets during each time slot
+    VisitorGrid = pd.DataFrame(ProfessorNames[Schedule.VisitorSlot[VisitorIds]], index=pd.Index(VisitorNames[VisitorIds], name='Visitor'), columns=SlotLabels)
+
+    # Build the professor grid, with the visitor each professor meets during each time slot, marking the time slots during
+    # which they are unavailable
+    ProfessorCells = VisitorNames[Schedule.ProfSlot[ProfessorIds]]
+    Available = np.array([[Professors[p].Availability[t] for t in TimeSlots] for p in ProfessorIds], dtype=bool).reshape(len(ProfessorIds), len(TimeSlots))
+    ProfessorCells[~Available & (Schedule.ProfSlot[ProfessorIds] == -1)] = 'Unavailable'
+    ProfessorGrid = pd.DataFrame(ProfessorCells, index=pd.Index(ProfessorNames[ProfessorIds], name='Professor'), columns=SlotLabels)
+
+    # Collect the statistics of each visitor
+    VisitorStatistics = pd.DataFrame({
+        'Visitor' : VisitorNames[VisitorIds],
+        'Availability' : [Visitors[v].Availability for v in VisitorIds],
+        'Meetings' : [Visitors[v].NumberOfMeetings for v in VisitorIds],
+        'Happiness' : [Visitors[v].Happiness for v in VisitorIds],
+        'Free periods' : len(TimeSlots) - (Schedule.VisitorSlot[VisitorIds] != -1).sum(axis=1),
+    })
+
+    # Collect the statistics of each professor
+    MeetingsAvailable = np.array([Professors[p].NumberOfMeetingsAvailable for p in ProfessorIds], dtype=int)
+    MeetingsScheduled = (Schedule.ProfSlot[ProfessorIds] != -1).sum(axis=1)
+    ProfessorStatistics = pd.DataFrame({
+        'Professor' : ProfessorNames[ProfessorIds],
+        'Meetings available' : MeetingsAvailable,
+        'Meetings' : MeetingsScheduled,
+        'Available meetings scheduled (%)' : 100 * MeetingsScheduled / np.maximum(MeetingsAvailable, 1),
+    })
+
+    # Return the result
+    return {'Visitor Grid' : VisitorGrid, 'Professor Grid' : ProfessorGrid, 'Visitor Statistics' : VisitorStatistics, 'Professor Statistics' : ProfessorStatistics}
+
+# Define the function for bundling the schedules into a single file
+def BundleSchedules(Visitors, Professors, TimeSlots, Schedule, VisitorFiles, ProfessorFiles, Format, OutputDirectory = '.'):
+    # Writes every schedule into one file (or one set of tables), which is easier to print, post, or send around than
+    # hundreds of separate files.  Returns the list of files written.
+    #
+    # Inputs:
+    #   VisitorFiles, ProfessorFiles = the dictionaries of rendered schedules returned by PrintAllVisitorSchedules and
+    #                                  PrintAllProfessorSchedules
+    #   Format = 'zip' for an archive of the schedule files, 'workbook' for a workbook with the master grids and the
+    #            statistics of each person (see BuildScheduleTables), or 'csv' for the same tables as CSV files
+
+    # Bundle the schedule files into an archive
+    if Format == 'zip':
+        FilePaths = [os.path.join(OutputDirectory, 'Schedules.zip')]
+        with zipfile.ZipFile(FilePaths[0], 'w', zipfile.ZIP_DEFLATED) as Archive:
+            for (Directory, Files) in [('Visitor Schedules', VisitorFiles), ('Professor Schedules', ProfessorFiles)]:
+                for FileName in Files:
+                    Archive.writestr('%s/%s' % (Directory, FileName), Files[FileName])
+        return FilePaths
+
+    # Otherwise, build the tables
+    Tables = BuildScheduleTables(Visitors, Professors, TimeSlots, Schedule)
+
+    # Write the tables to the sheets of a workbook
+    if Format == 'workbook':
+        FilePaths = [os.path.join(OutputDirectory, 'Schedules.xlsx')]
+        with pd.ExcelWriter(FilePaths[0]) as Writer:
+            for SheetName in Tables:
+                Tables[SheetName].to_excel(Writer, sheet_name=SheetName, index=SheetName.endswith('Grid'))
+
+    # Otherwise, write each table to its own CSV file
+    else:
+        FilePaths = [os.path.join(OutputDirectory, '%s.csv' % SheetName) for SheetName in Tables]
+        for (SheetName, FilePath) in zip(Tables, FilePaths):
+            Tables[SheetName].to_csv(FilePath, index=SheetName.endswith('Grid'))
 
-        # Print out the schedule for this professor
-        PrintProfessorSchedule(Visitors, Professors, TimeSlots, Meeting, p)
+    # Return the result
+    return FilePaths
 
-def CalcVisitorHappiness(Visitors, Professors, TimeSlots, Meeting):
+def CalcVisitorHappiness(Visitors, Professors, TimeSlots, Schedule):
 
     # Calculate the happiness of each visitor
     for v in Visitors:
 
-        # Loop over their list of professors
-        for p in Professors:
+        # Start from scratch, in case the happiness was already calculated
+        Visitors[v].Happiness = 0
+        Visitors[v].NumberOfMeetings = 0
 
-            # Check if they were assigned a meeting with that professor
-            if sum(Meeting[(v,p,t)].solution_value() for t in TimeSlots) == 1:  # They were assigned a meeting with that professor
+        # Loop over the professors they were assigned a meeting with
+        for p in Schedule.VisitorSlot[v][Schedule.VisitorSlot[v] != -1]:
 
-                # Increment their happiness accordingly
-                Visitors[v].Happiness += Visitors[v].PreferencePoints[p]
+            # Increment their happiness accordingly (professors absent from the dictionary are worth zero points)
+            Visitors[v].Happiness += Visitors[v].PreferencePoints.get(p, 0)
 
-                # Increment their meeting count accordingly
-                Visitors[v].NumberOfMeetings += 1
+            # Increment their meeting count accordingly
+            Visitors[v].NumberOfMeetings += 1
 
 def CalcMeetingsAvailable(Professors, TimeSlots):
 
     # Loop over the list of professors
     for p in Professors:
 
+        # Start from scratch, in case the meetings were already counted
+        Professors[p].NumberOfMeetingsAvailable = 0
+
         # Loop over the time slots
         for t in TimeSlots:
 
@@ -625,7 +3300,7 @@ def CalcMeetingsAvailable(Professors, TimeSlots):
                 # Increment their count of meetings available
                 Professors[p].NumberOfMeetingsAvailable += 1
 
-def PrintSummaryStatistics(Visitors, Professors, TimeSlots, Meeting):
+def PrintSummaryStatistics(Visitors, Professors, TimeSlots, Schedule):
     # This function prints some statistics to help assess the quality of the meeting assignments
 
     # Get the list of happiness scores
@@ -713,103 +3388,848 @@ def PrintSummaryStatistics(Visitors, Professors, TimeSlots, Meeting):
     # Mark the end of the summary   
     print('-------END OF SUMMARY STATISTICS---------')
 
-if __name__ == '__main__':
+# Define the function for checking a workbook without scheduling it
+def ValidateWorkbook(ExcelFileName, Parameters = None):
+    # Checks the workbook for problems which would stop it from being read, make the model infeasible, or quietly leave some
+    # visitors with poor schedules, without building a model (or importing OR-Tools)
+    # Returns:
+    #   Problems = a list of (severity, message) pairs, where the severity is either 'Error' or 'Warning'
+
+    # Use the default parameters, if necessary
+    if Parameters is None:
+        Parameters = DefaultParameters
+
+    # Read the workbook, stopping at the first missing column
+    Problems = []
+    Data = InputData()
+    try:
+        with pd.ExcelFile(ExcelFileName) as Workbook:
+            (Data.VisitorFrame, Data.PreferredProfessors) = ReadVisitorArrays(Workbook)
+            (Data.ProfessorNames, Data.AvailabilityMatrix, Data.TimeSlots) = ReadProfessorArrays(Workbook)
+            AvailabilityCells = pd.read_excel(Workbook, sheet_name='Professor Availability').drop(columns=['Last Name'])
+    except ValueError as Error:
+        return [('Error', str(Error))]
+    Visitors = Data.GetVisitors()
+    Professors = Data.GetProfessors()
+    TimeSlots = Data.TimeSlots
+
+    # Check that there is something to schedule
+    for (Count, Description) in [(len(Visitors), 'visitors'), (len(Professors), 'professors'), (len(TimeSlots), 'time slots')]:
+        if Count == 0:
+            Problems.append(('Error', 'The workbook has no %s.' % Description))
+    if len(Problems) > 0:
+        return Problems
+
+    # Check that the visitors are allowed some meetings (a negative maximum makes the model infeasible)
+    MaxMeetings = len(TimeSlots) - Parameters['RequiredFreePeriods']
+    if MaxMeetings <= 0:
+        Problems.append(('Error', 'Each visitor must have %d free periods, but there are only %d time slots, so no meetings can be scheduled.' % (Parameters['RequiredFreePeriods'], len(TimeSlots))))
+
+    # Check for cells of the availability grid which are neither blank nor 1, which are treated as unavailable
+    Unexpected = AvailabilityCells.notna().to_numpy() & ~Data.AvailabilityMatrix
+    for (p, t) in zip(*np.nonzero(Unexpected)):
+        Problems.append(('Warning', 'Professor %s has \"%s\" rather than 1 or a blank during %s, which is treated as unavailable.' % (Professors[p].LastName, AvailabilityCells.iat[p, t], TimeSlots[t])))
+
+    # Check for repeated names, which the schedule files (and the lookups by name) can't tell apart
+    for (Names, Description) in [(['%s %s' % (Visitors[v].FirstName, Visitors[v].LastName) for v in Visitors], 'visitor'), ([Professors[p].LastName for p in Professors], 'professor')]:
+        Counts = pd.Series(Names).groupby([NormalizeName(Name) for Name in Names], sort=False).agg(['first', 'size'])
+        for (Name, Count) in Counts[Counts['size'] > 1].itertuples(index=False):
+            Problems.append(('Warning', 'There are %d %ss called \"%s\".  Only the first one can be told apart by name, and their schedule files overwrite each other.' % (Count, Description, Name)))
+
+    # Check the visitors' availability windows
+    for v in Visitors:
+        if Visitors[v].Availability not in ('na', 'morning', 'afternoon'):
+            Problems.append(('Warning', 'Visitor %s %s has an availability of \"%s\" rather than morning, afternoon, or na, so they are treated as available all day.' % (Visitors[v].FirstName, Visitors[v].LastName, Visitors[v].Availability)))
+
+    # Check for preferred professors who aren't on the roster (as CalcPreferencePoints would report, but without the printing)
+    with contextlib.redirect_stdout(io.StringIO()):
+        (PreferenceRanks, UnrecognizedProfs) = CalcPreferenceRanks(Visitors, Professors, Data.GetProfessorIndex())
+    for ProfLastName in UnrecognizedProfs:
+        NumVisitors = sum(1 for v in Visitors if ProfLastName in Visitors[v].PreferredProfessors)
+        Problems.append(('Warning', 'The preferred professor \"%s\" (listed by %d visitors) isn\'t in the Professor Availability sheet, so they will be ignored.' % (ProfLastName, NumVisitors)))
 
-    # Import the visitor information
-    Visitors = ImportVisitorInfo()
+    # Check which visitors can't meet anyone, or any of their preferred professors, during their availability window
+    for v in Visitors:
+        Window = np.array([VisitorCanMeet(Visitors[v], t) for t in TimeSlots], dtype=bool)
+        Name = '%s %s' % (Visitors[v].FirstName, Visitors[v].LastName)
+        if not (Data.AvailabilityMatrix[:, Window]).any():
+            Problems.append(('Warning', 'No professor is available during the availability window of visitor %s, so they can\'t have any meetings.' % Name))
+        elif not (PreferenceRanks[v] > 0).any():
+            Problems.append(('Warning', 'Visitor %s has no recognized preferred professors, so their meetings won\'t earn any happiness points.' % Name))
+        elif not Data.AvailabilityMatrix[PreferenceRanks[v] > 0][:, Window].any():
+            Problems.append(('Warning', 'None of the preferred professors of visitor %s is available during their availability window.' % Name))
+
+    # Compare the number of meetings the professors can hold with the number the visitors are allowed
+    MeetingsAvailable = int(Data.AvailabilityMatrix.sum())
+    if 0 < MeetingsAvailable < len(Visitors) and MaxMeetings > 0:
+        Problems.append(('Warning', 'The professors are only available for %d meetings in total, so some of the %d visitors won\'t have any meetings.' % (MeetingsAvailable, len(Visitors))))
 
-    # Import the professor and time slot information
-    (Professors, TimeSlots) = ImportProfessorInfo()
+    # Return the result
+    return Problems
+
+# Define the function for filling in the parameters given to ScheduleMeetings
+def CompleteParameters(Parameters = None):
+    # Returns a copy of DefaultParameters with the given parameters filled in.  The objective weights can be given one at a
+    # time (e.g., {'Weight' : {'Maximize the number of meetings' : 0.5}}), with the others keeping their default values.
+    # Raises a ValueError for an unrecognized parameter or objective.
+    NewParameters = dict(DefaultParameters, Weight=dict(DefaultParameters['Weight']))
+    for Name in (Parameters if Parameters is not None else dict()):
+        if Name == 'Weight':
+            for Objective in Parameters['Weight']:
+                if Objective not in NewParameters['Weight']:
+                    raise ValueError('Unrecognized objective: %s.  The objectives are: %s' % (Objective, ', '.join(DefaultParameters['Weight'])))
+                NewParameters['Weight'][Objective] = float(Parameters['Weight'][Objective])
+        elif Name in NewParameters:
+            NewParameters[Name] = Parameters[Name]
+        else:
+            raise ValueError('Unrecognized parameter: %s.  The parameters are: %s' % (Name, ', '.join(DefaultParameters)))
+    return NewParameters
+
+# Define the class which holds the outcome of ScheduleMeetings
+class ScheduleResult():
+    # Holds the visitors and professors of the event (with their happiness and number of meetings filled in), the
+    # SolveResult, the ScheduleAssignment, and the RunReport of the run.
+
+    def __init__(self, Visitors, Professors, TimeSlots, Result, Report):
+        self.Visitors = Visitors
+        self.Professors = Professors
+        self.TimeSlots = TimeSlots
+        self.Result = Result
+        self.Report = Report
+
+        # Pull the scheduled meetings into arrays, and calculate everyone's statistics
+        self.Schedule = ScheduleAssignment(Visitors, Professors, TimeSlots, Result.ScheduledMeetings)
+        CalcVisitorHappiness(Visitors, Professors, TimeSlots, self.Schedule)
+        CalcMeetingsAvailable(Professors, TimeSlots)
+
+    def GetTables(self):
+        # Returns the master grids and statistics of everyone (see BuildScheduleTables)
+        return BuildScheduleTables(self.Visitors, self.Professors, self.TimeSlots, self.Schedule)
+
+    def Write(self, OutputDirectory = '.', Bundle = None):
+        # Writes out the statistics and schedule files, as the schedule command does
+        ReportSchedule(self.Visitors, self.Professors, self.TimeSlots, self.Result.ScheduledMeetings, OutputDirectory, Bundle)
+
+    def ToDict(self):
+        # Returns the outcome as a dictionary which can be saved as JSON, with the result of the solve, the schedule and
+        # statistics of each visitor and professor, the list of meetings, and the time taken by each stage
+        Tables = self.GetTables()
+        Visitors = Tables['Visitor Statistics'].to_dict('records')
+        for (Row, Schedule) in zip(Visitors, Tables['Visitor Grid'].to_numpy().tolist()):
+            Row['Schedule'] = Schedule
+        Professors = Tables['Professor Statistics'].to_dict('records')
+        for (Row, Schedule) in zip(Professors, Tables['Professor Grid'].to_numpy().tolist()):
+            Row['Schedule'] = Schedule
+        Meetings = [{
+            'Visitor' : '%s %s' % (self.Visitors[v].FirstName, self.Visitors[v].LastName),
+            'Professor' : self.Professors[p].LastName,
+            'Period' : t,
+            'Time slot' : self.TimeSlots[t],
+        } for (v,p,t) in sorted(self.Result.ScheduledMeetings)]
+        return ReplaceNaN({
+            'Result' : self.Report.Details['Result'],
+            'Time slots' : [self.TimeSlots[t] for t in self.TimeSlots],
+            'Visitors' : Visitors,
+            'Professors' : Professors,
+            'Meetings' : Meetings,
+            'Stages' : self.Report.Stages,
+        })
+
+# Define the function for scheduling an event from another program
+def ScheduleMeetings(Inputs, Parameters = None, Solver = 'cbc', Unavailable = (), Withdrawn = (), UseCache = False):
+    # Schedules the meetings of an event without writing any files or relying on the command line, and returns a
+    # ScheduleResult (whose Write method writes the same files as the schedule command).  Raises a ValueError if the inputs
+    # are invalid or no schedule is found.  Status messages are printed as usual (use contextlib.redirect_stdout to
+    # capture them).
+    #
+    # Inputs:
+    #   Inputs = the name of a workbook in the format of "Input Data.xlsx", or an InputData (which isn't changed, so that
+    #            one InputData can be read once and scheduled many times)
+    #   Parameters = a dictionary of parameters overriding DefaultParameters (see CompleteParameters)
+    #   Solver = the name of the solver backend (one of the keys of SolverBackends)
+    #   Unavailable, Withdrawn = last-minute changes to make before scheduling (see ApplyLastMinuteChanges), e.g., to see
+    #                            what would happen if a professor cancelled
+    #   UseCache = whether to load (and save) the parsed workbook and the solved schedule from the cache directory
+
+    # Check the inputs
+    if Solver not in SolverBackends:
+        raise ValueError('Unrecognized solver: %s.  The solvers are: %s' % (Solver, ', '.join(SolverBackends)))
+    Parameters = CompleteParameters(Parameters)
+
+    # Start timing the stages of the run
+    Report = RunReport()
+    Report.Details.update({'Solver' : Solver, 'Parameters' : Parameters})
+
+    # Import the visitor, professor, and time slot information
+    with Report.Stage('Import'):
+        Data = Inputs.Copy() if isinstance(Inputs, InputData) else ImportInputData(Inputs, UseCache)
+        Visitors = Data.GetVisitors()
+        Professors = Data.GetProfessors()
+        TimeSlots = Data.TimeSlots
 
     # Calculate the number of "preference points" that each visitor associates with each professor
-    CalcPreferencePoints(Visitors, Professors)
+    with Report.Stage('Preference points'):
+        CalcPreferencePoints(Visitors, Professors, Data.GetProfessorIndex())
+
+    # Apply the last-minute changes, if any
+    if len(Unavailable) > 0 or len(Withdrawn) > 0:
+        print('Applying the last-minute changes...')
+        ApplyLastMinuteChanges(Visitors, Professors, TimeSlots, Data.GetProfessorIndex(), Unavailable, Withdrawn)
+
+    # Look for the schedule in the cache (under the same fingerprint as the schedule command), or build and solve the model
+    Fingerprint = FingerprintProblem(Visitors, Professors, TimeSlots, Solver, Parameters, (False, None))
+    Result = LoadCachedResult(Fingerprint) if UseCache else None
+    Report.Details['Cached schedule'] = Result is not None
+    if Result is None:
+        (Result, BuildSeconds) = SolveWithBackend(Visitors, Professors, TimeSlots, Solver, Parameters, Report=Report)
+
+    # Check that the solution is acceptable, and save it to the cache if it is (and the solver wasn't cut off)
+    Report.RecordResult(Result)
+    CheckSolveResult(Result)
+    if UseCache and IsCacheableResult(Result):
+        SaveCachedResult(Fingerprint, Result)
 
-    # Build the model
-    (model, Meeting) = BuildModel(Visitors, Professors, TimeSlots)   
+    # Return the result
+    return ScheduleResult(Visitors, Professors, TimeSlots, Result, Report)
+
+# Define the function for handling one request of the scheduling service (in a worker process)
+def SolveServiceRequest(Arguments):
+    # Returns the dictionary of the ScheduleResult (see ScheduleResult.ToDict), with everything that would otherwise have
+    # been printed while scheduling added as its log
+
+    # Unpack the inputs
+    (Data, Solver, Parameters, Unavailable, Withdrawn) = Arguments
+
+    # Schedule the event, capturing the status messages (which is safe here since each worker process only handles one
+    # request at a time).  If scheduling fails, the messages are attached to the error, so that the client still gets them.
+    with contextlib.redirect_stdout(io.StringIO()) as Log:
+        try:
+            Outcome = ScheduleMeetings(Data, Parameters, Solver, Unavailable, Withdrawn).ToDict()
+        except Exception as Error:
+            Error.Log = Log.getvalue()
+            raise
+    Outcome['Log'] = Log.getvalue()
 
-    # Enable output
-    # model.EnableOutput()
+    # Return the result
+    return Outcome
+
+# Define the function for starting a worker process of the scheduling service
+def IgnoreInterrupts():
+    # Leaves Ctrl+C (which the terminal sends to every process of the service) to the main process, which shuts down the
+    # worker processes itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+# Define the class which holds the state of the scheduling service
+class SchedulingService(ThreadingHTTPServer):
+    # An HTTP server which keeps the parsed rosters (workbooks) in memory and hands the scheduling requests to a pool of
+    # worker processes, so that no request pays for starting Python, importing the libraries, or reading the workbook.
+    # Each request is handled in its own thread, while it waits for the worker processes.
+    #
+    #   GET  /health     the status of the service
+    #   GET  /rosters    the rosters held in memory
+    #   POST /rosters    adds the workbook in the body of the request (in the format of "Input Data.xlsx") to the rosters
+    #   POST /schedule   schedules a roster, given a JSON object with the Roster (its Id, which may be left out if only one
+    #                    roster is held), and optionally the Solver, the Parameters (see CompleteParameters), and any
+    #                    last-minute changes to try out (Unavailable, a list of [professor, time slot] pairs, and Withdrawn,
+    #                    a list of visitor names), and returns the JSON of the ScheduleResult
+
+    def __init__(self, Address, Pool, Solver = 'cbc', Parameters = None):
+        super().__init__(Address, ServiceRequestHandler)
+        self.Pool = Pool
+        self.Solver = Solver # the default solver of the requests
+        self.Parameters = Parameters if Parameters is not None else DefaultParameters # the default parameters of the requests
+        self.Rosters = dict() # a dictionary mapping the Id of each roster to its (name, InputData) pair
+        self.Lock = threading.Lock()
+
+    def AddRoster(self, ExcelFileName, Name = None):
+        # Reads a workbook and holds on to it, returning its Id (the start of the hash of the workbook's contents, so that
+        # adding the same workbook twice gives the same Id)
+        Data = ImportInputData(ExcelFileName, UseCache=False)
+        Id = HashFile(ExcelFileName)[:12]
+        with self.Lock:
+            self.Rosters[Id] = (Name if Name is not None else os.path.basename(ExcelFileName), Data)
+        return Id
+
+    def DescribeRoster(self, Id):
+        # Returns a dictionary describing the roster
+        (Name, Data) = self.Rosters[Id]
+        return {'Roster' : Id, 'Name' : Name, 'Visitors' : len(Data.VisitorFrame), 'Professors' : len(Data.ProfessorNames), 'Time slots' : [Data.TimeSlots[t] for t in Data.TimeSlots]}
+
+    def Schedule(self, Request):
+        # Returns the outcome of a scheduling request (see SolveServiceRequest), raising a ValueError if it is invalid
+
+        # Look up the roster
+        with self.Lock:
+            if len(self.Rosters) == 0:
+                raise ValueError('There are no rosters yet.  Please post a workbook to /rosters first.')
+            Id = Request.get('Roster', next(iter(self.Rosters)) if len(self.Rosters) == 1 else None)
+            if Id not in self.Rosters:
+                raise ValueError('%s.  The rosters are: %s' % ('Unrecognized roster: %s' % Id if Id is not None else 'Please give the Roster', ', '.join(self.Rosters)))
+            Data = self.Rosters[Id][1]
+
+        # Check the parameters, and fill in the defaults of the service (including the objective weights which the request
+        # leaves out)
+        RequestParameters = Request.get('Parameters', dict())
+        if not isinstance(RequestParameters, dict):
+            raise ValueError('Parameters must be an object mapping parameter names to values.')
+        for Name in RequestParameters:
+            if Name not in DefaultParameters:
+                raise ValueError('Unrecognized parameter: %s.  The parameters are: %s' % (Name, ', '.join(DefaultParameters)))
+        if not isinstance(RequestParameters.get('Weight', dict()), dict):
+            raise ValueError('Weight must be an object mapping objectives to weights.')
+        Parameters = dict(self.Parameters, **RequestParameters)
+        Parameters['Weight'] = dict(self.Parameters['Weight'], **RequestParameters.get('Weight', dict()))
+        Unavailable = [tuple(Change) for Change in Request.get('Unavailable', [])]
+        if any(len(Change) != 2 for Change in Unavailable):
+            raise ValueError('Each entry of Unavailable must be a [professor, time slot] pair.')
+
+        # Schedule the roster in one of the worker processes
+        Outcome = self.Pool.submit(SolveServiceRequest, (Data, Request.get('Solver', self.Solver), Parameters, Unavailable, list(Request.get('Withdrawn', [])))).result()
+        Outcome['Roster'] = Id
+
+        # Return the result
+        return Outcome
+
+# Define the function for recovering the status messages of a request which failed
+def GetErrorLog(Error):
+    # Returns a dictionary holding the log attached to the error by SolveServiceRequest, or an empty dictionary if there isn't one
+    return {'Log' : Error.Log} if hasattr(Error, 'Log') else dict()
+
+# Define the class which handles the HTTP requests of the scheduling service
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.SendJson(200, {'Status' : 'ok', 'Rosters' : len(self.server.Rosters)})
+        elif self.path == '/rosters':
+            with self.server.Lock:
+                self.SendJson(200, [self.server.DescribeRoster(Id) for Id in self.server.Rosters])
+        else:
+            self.SendJson(404, {'Error' : 'Unrecognized path: %s' % self.path})
+
+    def do_POST(self):
+
+        # Read the body of the request
+        Body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        # Handle the request, reporting invalid requests (and any problem with the inputs) back to the client
+        try:
+            if self.path == '/rosters':
+
+                # Save the workbook to a temporary file, since that is what ImportInputData reads
+                with tempfile.TemporaryDirectory() as Directory:
+                    ExcelFileName = os.path.join(Directory, 'Roster.xlsx')
+                    with open(ExcelFileName, 'wb') as File:
+                        File.write(Body)
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        try:
+                            Id = self.server.AddRoster(ExcelFileName, self.headers.get('X-Roster-Name', 'Roster'))
+                        except ValueError:
+                            raise
+                        except Exception as Error:
+                            raise ValueError('The body of the request is not a readable workbook (%s).' % Error)
+                with self.server.Lock:
+                    self.SendJson(201, self.server.DescribeRoster(Id))
+
+            elif self.path == '/schedule':
+                try:
+                    Request = json.loads(Body) if len(Body) > 0 else dict()
+                except ValueError:
+                    raise ValueError('The body of the request is not valid JSON.')
+                if not isinstance(Request, dict):
+                    raise ValueError('The body of the request must be a JSON object.')
+                self.SendJson(200, self.server.Schedule(Request))
 
-    # Set the time limit
-    MaxMinutes = 1
-    model.set_time_limit(round(1000*60*MaxMinutes))
+            else:
+                self.SendJson(404, {'Error' : 'Unrecognized path: %s' % self.path})
+
+        except ValueError as Error:
+            self.SendJson(400, dict({'Error' : str(Error)}, **GetErrorLog(Error)))
+        except Exception as Error:
+            self.SendJson(500, dict({'Error' : '%s: %s' % (type(Error).__name__, Error)}, **GetErrorLog(Error)))
+
+    def SendJson(self, Status, Content):
+        # Sends the response, with its content as JSON
+        Body = json.dumps(ReplaceNaN(Content), default=str).encode('utf-8')
+        self.send_response(Status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(Body)))
+        self.end_headers()
+        self.wfile.write(Body)
+
+# Define the function for reading a time limit given on the command line
+def ParseMaxMinutes(Text):
+    # Returns 'auto' or the number of minutes
+    if str(Text).strip().lower() == 'auto':
+        return 'auto'
+    try:
+        return float(Text)
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected a number of minutes or "auto", not "%s"' % Text)
+
+# Define the function for collecting the model and solver parameters given on the command line
+def GetSolverParameters(Arguments):
+    # Returns a copy of DefaultParameters with the solver options filled in
+    return dict(DefaultParameters,
+        NumWorkers=Arguments.NumWorkers,
+        MaxMinutes=Arguments.MaxMinutes,
+        RelativeGap=Arguments.GapPercent / 100,
+        AbsoluteGap=Arguments.AbsoluteGap,
+        StallMinutes=Arguments.StallMinutes,
+    )
 
-    # Solve the model
-    print('Solving the model... (This may take a few minutes)')
-    status = model.Solve()
+# Define the function for parsing the command line arguments
+def ParseArguments(Arguments = None):
+
+    # Specify the solver options shared by every command
+    SolverOptionsParser = argparse.ArgumentParser(add_help=False)
+    SolverOptionsParser.add_argument('--num-workers', dest='NumWorkers', type=int, default=DefaultParameters['NumWorkers'], help='the number of parallel search workers used by CP-SAT (default: 0, i.e., every core)')
+    SolverOptionsParser.add_argument('--max-minutes', dest='MaxMinutes', type=ParseMaxMinutes, default=DefaultParameters['MaxMinutes'], help='the time limit of the solver in minutes, or "auto" to scale it with the size of the problem (default: %(default)s)')
+    SolverOptionsParser.add_argument('--gap', dest='GapPercent', type=float, default=100 * DefaultParameters['RelativeGap'], metavar='PERCENT', help='stop as soon as the schedule is provably within PERCENT%% of the best possible one')
+    SolverOptionsParser.add_argument('--absolute-gap', dest='AbsoluteGap', type=float, default=DefaultParameters['AbsoluteGap'], metavar='POINTS', help='stop as soon as the schedule is provably within POINTS objective points of the best possible one (cp-sat only)')
+    SolverOptionsParser.add_argument('--stall-minutes', dest='StallMinutes', type=float, default=DefaultParameters['StallMinutes'], metavar='M', help='stop if the schedule hasn\'t improved for M minutes (cp-sat only)')
+
+    # Specify the options shared by every command which works on a single workbook
+    InputOptionsParser = argparse.ArgumentParser(add_help=False)
+    InputOptionsParser.add_argument('--input', dest='InputFile', default='Input Data.xlsx', help='the workbook with the visitor and professor information (default: %(default)s)')
+    CommonParser = argparse.ArgumentParser(add_help=False, parents=[SolverOptionsParser, InputOptionsParser])
+    CommonParser.add_argument('--no-cache', dest='UseCache', action='store_false', help='parse the workbook (and solve the model) even if nothing has changed since the last run, without updating the cache')
+
+    # Specify the options of the commands which write out schedules
+    OutputOptionsParser = argparse.ArgumentParser(add_help=False)
+    OutputOptionsParser.add_argument('--bundle', dest='Bundle', choices=['zip', 'workbook', 'csv'], default=None, help='also bundle all of the schedules into an archive ("Schedules.zip"), a workbook with a grid of everyone\'s schedule and statistics ("Schedules.xlsx"), or the same tables as CSV files')
+
+    # Define the commands
+    Parser = argparse.ArgumentParser(description='Schedule the visitor-professor meetings of a recruiting weekend.')
+    Commands = Parser.add_subparsers(dest='Command')
+
+    ScheduleParser = Commands.add_parser('schedule', parents=[CommonParser, OutputOptionsParser], help='generate the schedules (the default command)')
+    ScheduleParser.add_argument('--profile', dest='Profile', action='store_true', help='profile each stage of the run, saving the profile of the slowest one to "Run Profile.prof"')
+    ScheduleParser.add_argument('--solver', dest='Solver', choices=list(SolverBackends), default='cbc', help='the solver used to optimize the schedule (default: cbc)')
+    ScheduleParser.add_argument('--hint', dest='Hint', choices=['previous', 'greedy'], default=None, help='start the solver from the previous schedule (read from the "Visitor Schedules" directory) or from a quick greedy schedule')
+    ScheduleParser.add_argument('--progress', dest='Progress', action='store_true', help='print the objective, best bound, and gap of the best schedule found so far as the solver runs (only cp-sat can report these; the other solvers show their own log)')
+    ScheduleParser.add_argument('--checkpoint', dest='CheckpointSeconds', type=float, default=None, metavar='SECONDS', help='print the progress, and also write out the best schedule found so far at most once every SECONDS seconds, so that a run which is stopped early still leaves a usable schedule (cp-sat only)')
+    ScheduleParser.add_argument('--decompose', dest='Decompose', action='store_true', help='solve the morning and afternoon separately (in parallel), which is faster for large events but may give a slightly worse schedule')
+
+    ResolveParser = Commands.add_parser('resolve', parents=[CommonParser, OutputOptionsParser], help='re-optimize the published schedule after last-minute changes, moving as few meetings as possible')
+    ResolveParser.add_argument('--profile', dest='Profile', action='store_true', help='profile each stage of the run, saving the profile of the slowest one to "Run Profile.prof"')
+    ResolveParser.add_argument('--solver', dest='Solver', choices=list(SolverBackends), default='cbc', help='the solver used to re-optimize the schedule (default: cbc)')
+    ResolveParser.add_argument('--unavailable', dest='Unavailable', nargs=2, action='append', default=[], metavar=('PROFESSOR', 'SLOT'), help='mark a professor as unavailable during a time slot (a period number, a time slot label, or "all")')
+    ResolveParser.add_argument('--withdraw', dest='Withdrawn', action='append', default=[], metavar='VISITOR', help='remove a visitor (given by their full name) from the schedule')
+
+    BenchmarkParser = Commands.add_parser('benchmark', parents=[CommonParser], help='compare the build time, solve time, and solution quality of the solvers')
+    BenchmarkParser.add_argument('--solvers', dest='Solvers', nargs='+', choices=list(SolverBackends), default=['cbc', 'scip', 'highs', 'cp-sat', 'heuristic'], help='the solvers to compare (default: %(default)s)')
+    BenchmarkParser.add_argument('--csv', dest='CsvFile', default=None, help='a CSV file in which to save the comparison')
+    BenchmarkParser.add_argument('--decompose', dest='Decompose', action='store_true', help='also solve the morning and afternoon separately with each solver, and report the loss in the objective')
+    BenchmarkParser.add_argument('--compare-reductions', dest='CompareReductions', action='store_true', help='also solve the model with each solver without leaving out the redundant constraints or breaking symmetry')
+
+    SweepParser = Commands.add_parser('sweep', parents=[CommonParser], help='solve many variants of the problem (e.g., with different weights) in parallel and compare the schedules')
+    SweepParser.add_argument('--solver', dest='Solver', choices=list(SolverBackends), default='cbc', help='the solver used for every scenario (default: cbc)')
+    SweepParser.add_argument('--scenarios', dest='ScenarioFile', default=None, help='a CSV file listing the scenarios, with one row per scenario and one column per parameter or objective weight (instead of a grid)')
+    SweepParser.add_argument('--weight', dest='Weights', nargs='+', action='append', default=[], metavar=('OBJECTIVE', 'VALUE'), help='the values of an objective weight to try, e.g., --weight "Maximize the number of meetings" 0.1 0.5')
+    SweepParser.add_argument('--free-periods', dest='FreePeriods', nargs='+', type=int, default=None, metavar='N', help='the numbers of required free periods to try')
+    SweepParser.add_argument('--time-limits', dest='TimeLimits', nargs='+', type=ParseMaxMinutes, default=None, metavar='M', help='the time limits of the solver (in minutes, or "auto") to try')
+    SweepParser.add_argument('--afternoon-start', dest='AfternoonStart', nargs='+', type=int, default=None, metavar='SLOT', help='the first time slots of the afternoon to try')
+    SweepParser.add_argument('--processes', dest='NumProcesses', type=int, default=None, help='the number of scenarios solved at the same time (default: the number of cores)')
+    SweepParser.add_argument('--csv', dest='CsvFile', default=None, help='a CSV file in which to save the comparison')
+
+    BatchParser = Commands.add_parser('batch', parents=[SolverOptionsParser, OutputOptionsParser], help='schedule several events (e.g., recruiting weekends) which share the same professors')
+    BatchParser.add_argument('Workbooks', nargs='+', metavar='WORKBOOK', help='the workbooks with the visitors of the events.  Each sheet whose name starts with "Visitor Preferences" is a separate event.')
+    BatchParser.add_argument('--roster', dest='RosterFile', default=None, help='the workbook whose "Professor Availability" sheet lists the professors (default: the first workbook)')
+    BatchParser.add_argument('--solver', dest='Solver', choices=list(SolverBackends), default='cbc', help='the solver used for every event (default: cbc)')
+    BatchParser.add_argument('--output', dest='OutputDirectory', default='Events', help='the directory in which each event gets a directory for its schedules (default: %(default)s)')
+    BatchParser.add_argument('--processes', dest='NumProcesses', type=int, default=None, help='the number of events scheduled at the same time (default: the number of cores)')
+
+    ValidateParser = Commands.add_parser('validate', parents=[InputOptionsParser], help='check the workbook for problems (e.g., missing columns, unrecognized professors, or visitors who can\'t have any meetings) without scheduling it')
+    ValidateParser.add_argument('--free-periods', dest='FreePeriods', type=int, default=DefaultParameters['RequiredFreePeriods'], metavar='N', help='the number of time slots each visitor must have free (default: %(default)s)')
+
+    ServeParser = Commands.add_parser('serve', parents=[SolverOptionsParser], help='run a local HTTP service which keeps the rosters in memory and schedules them on request')
+    ServeParser.add_argument('--roster', dest='RosterFiles', action='append', default=[], metavar='WORKBOOK', help='a workbook to load when the service starts (more can be added later by posting them to /rosters).  This option can be repeated.')
+    ServeParser.add_argument('--solver', dest='Solver', choices=list(SolverBackends), default='cbc', help='the solver used by requests which don\'t name one (default: cbc)')
+    ServeParser.add_argument('--host', dest='Host', default='127.0.0.1', help='the address on which to listen (default: %(default)s, i.e., only this machine)')
+    ServeParser.add_argument('--port', dest='Port', type=int, default=8080, help='the port on which to listen (default: %(default)s)')
+    ServeParser.add_argument('--processes', dest='NumProcesses', type=int, default=None, help='the number of requests scheduled at the same time (default: the number of cores)')
+
+    # Fall back on the schedule command if no command was given
+    if Arguments is None:
+        Arguments = sys.argv[1:]
+    if len(Arguments) == 0 or Arguments[0] not in Commands.choices and Arguments[0] not in ('-h', '--help'):
+        Arguments = ['schedule'] + list(Arguments)
 
-    # Check for optimality
-    if status == pywraplp.Solver.OPTIMAL:
+    # Return the result
+    return Parser.parse_args(Arguments)
 
-        # Display a success message
-        print('Optimal solution found!')
+# Define the function for generating the schedules
+def RunScheduleCommand(Arguments):
 
-    elif status == pywraplp.Solver.INFEASIBLE:
+    # Collect the model and solver parameters
+    Parameters = GetSolverParameters(Arguments)
 
-        # Display an error message
-        print('Error: The model was found to be infeasible.')
+    # Check that the options are compatible
+    if Arguments.Decompose and Arguments.Hint is not None:
+        print('Error: The --hint option cannot be used together with --decompose.')
         exit()
-
-    elif status == pywraplp.Solver.NOT_SOLVED:
-
-        # Display an error message
-        print('Error: The model was not solved to completion.  Consider increasing the amount of time allowed to solve the model.')
+    if Arguments.Decompose and (Arguments.Progress or Arguments.CheckpointSeconds is not None):
+        print('Error: The --progress and --checkpoint options cannot be used together with --decompose.')
         exit()
 
-    elif status == pywraplp.Solver.UNBOUNDED:
+    # Start timing the stages of the run
+    Report = RunReport(Arguments.Profile)
+    Report.Details.update({'Solver' : Arguments.Solver, 'Parameters' : Parameters})
 
-        # Display an error message
-        print('Error: The model was found to be unbounded.')
-        exit()
+    # Import the visitor, professor, and time slot information
+    with Report.Stage('Import'):
+        Data = ImportInputData(Arguments.InputFile, Arguments.UseCache)
+        Visitors = Data.GetVisitors()
+        Professors = Data.GetProfessors()
+        TimeSlots = Data.TimeSlots
+
+    # Calculate the number of "preference points" that each visitor associates with each professor
+    with Report.Stage('Preference points'):
+        PreferenceMatrix = CalcPreferencePoints(Visitors, Professors, Data.GetProfessorIndex())
+
+    # Prepare the starting solution, if requested
+    Hint = None
+    if Arguments.Hint == 'previous':
+        print('Reading the previous schedule...')
+        with Report.Stage('Hint'):
+            Hint = ReadVisitorSchedules(Visitors, Data.GetProfessorIndex())
+        print('\tFound %d previously scheduled meetings.' % len(Hint))
+    elif Arguments.Hint == 'greedy':
+        print('Building a greedy schedule...')
+        with Report.Stage('Hint'):
+            Hint = GreedySchedule(Visitors, Professors, TimeSlots, PreferenceMatrix, Parameters)
+        print('\tScheduled %d meetings.' % len(Hint))
+
+    # Look for the schedule in the cache
+    Fingerprint = FingerprintProblem(Visitors, Professors, TimeSlots, Arguments.Solver, Parameters, (Arguments.Decompose, sorted(Hint) if Hint is not None else None))
+    Result = LoadCachedResult(Fingerprint) if Arguments.UseCache else None
+    Report.Details['Cached schedule'] = Result is not None
+    if Result is not None:
+        print('The schedule was found in the cache, so the model won\'t be solved again.  (Use --no-cache to solve it anyway.)')
+
+    # Otherwise, build and solve the model with the selected solver, either as a whole or one window at a time
+    elif Arguments.Decompose:
+        with Report.Stage('Solve'):
+            (Result, BuildSeconds) = SolveDecomposed(Visitors, Professors, TimeSlots, Arguments.Solver, Parameters)
+    else:
 
-    elif status == pywraplp.Solver.ABNORMAL:
+        # Stream the progress of the solver, if requested, writing out the incumbent schedule every so often (the reporter
+        # is only created here, since its checkpoint thread must be closed once the solver has finished)
+        Progress = None
+        if Arguments.CheckpointSeconds is not None:
+            Progress = ProgressReporter(Arguments.CheckpointSeconds, lambda ScheduledMeetings, ObjectiveValue: WriteCheckpoint(Visitors, Professors, TimeSlots, ScheduledMeetings, ObjectiveValue))
+        elif Arguments.Progress:
+            Progress = ProgressReporter()
+        try:
+            (Result, BuildSeconds) = SolveWithBackend(Visitors, Professors, TimeSlots, Arguments.Solver, Parameters, Hint, Progress=Progress, Report=Report)
+        finally:
+            if Progress is not None:
+                Progress.Close()
+
+    # Check that the solution is acceptable, and save it to the cache if it is (and the solver wasn't cut off)
+    Report.RecordResult(Result)
+    CheckSolveResult(Result)
+    if Arguments.UseCache and IsCacheableResult(Result):
+        SaveCachedResult(Fingerprint, Result)
+    ScheduledMeetings = Result.ScheduledMeetings
+
+    # Write out the statistics and schedules
+    with Report.Stage('Output'):
+        ReportSchedule(Visitors, Professors, TimeSlots, ScheduledMeetings, Bundle=Arguments.Bundle)
+
+    # Write out the run report
+    Report.PrintTimes()
+    Report.Write()
+
+# Define the function for writing out the incumbent schedule while the solver is still running
+def WriteCheckpoint(Visitors, Professors, TimeSlots, ScheduledMeetings, ObjectiveValue, OutputDirectory = '.'):
+    # Writes the schedule files (but not the statistics, which are only calculated for the final schedule)
+    Schedule = ScheduleAssignment(Visitors, Professors, TimeSlots, ScheduledMeetings)
+    PrintAllVisitorSchedules(Visitors, Professors, TimeSlots, Schedule, OutputDirectory)
+    PrintAllProfessorSchedules(Visitors, Professors, TimeSlots, Schedule, OutputDirectory)
+    print('\t\tWrote the incumbent schedule (objective %.4f) to the \"Visitor Schedules\" and \"Professor Schedules\" directories.' % ObjectiveValue, flush=True)
+
+# Define the function for re-optimizing the published schedule after last-minute changes
+def RunResolveCommand(Arguments):
+
+    # Collect the model and solver parameters
+    Parameters = GetSolverParameters(Arguments)
+
+    # Start timing the stages of the run
+    Report = RunReport(Arguments.Profile)
+    Report.Details.update({'Solver' : Arguments.Solver, 'Parameters' : Parameters})
+
+    # Import the visitor, professor, and time slot information
+    with Report.Stage('Import'):
+        Data = ImportInputData(Arguments.InputFile, Arguments.UseCache)
+        Visitors = Data.GetVisitors()
+        Professors = Data.GetProfessors()
+        TimeSlots = Data.TimeSlots
 
-        # Display an error message
-        print('Error: The solver exited with an abnormal status. Consider increasing the amount of time allowed to solve the model.')
+    # Calculate the number of "preference points" that each visitor associates with each professor
+    with Report.Stage('Preference points'):
+        CalcPreferencePoints(Visitors, Professors, Data.GetProfessorIndex())
+
+    # Read the published schedule
+    print('Reading the published schedule...')
+    with Report.Stage('Hint'):
+        PublishedMeetings = ReadVisitorSchedules(Visitors, Data.GetProfessorIndex())
+    print('\tFound %d published meetings.' % len(PublishedMeetings))
+
+    # Apply the last-minute changes, keeping track of everyone who was on the published schedule
+    print('Applying the last-minute changes...')
+    PublishedVisitors = dict(Visitors)
+    try:
+        ApplyLastMinuteChanges(Visitors, Professors, TimeSlots, Data.GetProfessorIndex(), Arguments.Unavailable, Arguments.Withdrawn)
+    except ValueError as Error:
+        print('Error: %s' % Error)
         exit()
 
-    else:
+    # Find the part of the schedule which needs to be re-optimized
+    (Scope, DroppedMeetings, Neighborhood) = BuildRepairScope(Visitors, Professors, TimeSlots, PublishedMeetings, Parameters)
+    print('\t%d published meetings are no longer possible.  The schedules of %d visitors will be re-optimized.' % (len(DroppedMeetings), len(Neighborhood)))
 
-        # Give a status update
-        print('Warning: The model was not solved to completion.  Calculating the optimality gap...')
+    # Re-optimize the schedule, starting from the published meetings which are still possible
+    Hint = {k for k in PublishedMeetings if k not in DroppedMeetings}
+    (Result, BuildSeconds) = SolveWithBackend(Visitors, Professors, TimeSlots, Arguments.Solver, Parameters, Hint, Scope, Report=Report)
 
-        # Calculate the optimality gap
-        OptimalityGap = model.Objective().BestBound() - model.Objective().Value()
-        RelativeOptimalityGap = OptimalityGap / max(model.Objective().BestBound(), 0.001)
+    # Check that the solution is acceptable
+    Report.RecordResult(Result)
+    CheckSolveResult(Result)
 
-        # Print the optimality gap
-        print('The optimality gap is %f%%' % (RelativeOptimalityGap * 100))
+    # Report the changes relative to the published schedule
+    PrintScheduleChanges(PublishedVisitors, Professors, TimeSlots, PublishedMeetings, Result.ScheduledMeetings)
 
-        if RelativeOptimalityGap > 0.01:
+    # Write out the statistics and schedules
+    with Report.Stage('Output'):
+        ReportSchedule(Visitors, Professors, TimeSlots, Result.ScheduledMeetings, Bundle=Arguments.Bundle)
 
-            # Display an error message
-            print('Error: I was unable to solve the model to the desired precision in the time allotted. Consider increasing the amount of time allowed to solve the model.')
-            exit()
+    # Write out the run report
+    Report.PrintTimes()
+    Report.Write()
 
-        else:
+    # Remind the user about the schedules of the withdrawn visitors, which are left in place
+    if len(Arguments.Withdrawn) > 0:
+        print('Note: The schedules of the withdrawn visitors were left in the \"Visitor Schedules\" directory.  Please remove them before publishing.')
 
-            # Print a partial success message
-            print('The model was solved to within an acceptable optimality gap.')
+# Define the function for writing out the statistics and schedules
+def ReportSchedule(Visitors, Professors, TimeSlots, ScheduledMeetings, OutputDirectory = '.', Bundle = None):
 
-    # Print a success message
-    print('Success!')
+    # Pull the scheduled meetings into arrays (once, for all of the statistics and schedules)
+    Schedule = ScheduleAssignment(Visitors, Professors, TimeSlots, ScheduledMeetings)
 
     # Calculate visitor happiness
-    CalcVisitorHappiness(Visitors, Professors, TimeSlots, Meeting)
+    CalcVisitorHappiness(Visitors, Professors, TimeSlots, Schedule)
 
     # Count the number of meetings each prof is available
     CalcMeetingsAvailable(Professors, TimeSlots)
 
     # Print out some summary statistics
-    PrintSummaryStatistics(Visitors, Professors, TimeSlots, Meeting)
+    PrintSummaryStatistics(Visitors, Professors, TimeSlots, Schedule)
     
     # Print out all the visitors' schedules
     print('Writing out the schedule for each visitor...')
-    PrintAllVisitorSchedules(Visitors, Professors, TimeSlots, Meeting)
+    VisitorFiles = PrintAllVisitorSchedules(Visitors, Professors, TimeSlots, Schedule, OutputDirectory)
 
     # Print out all the professors' schedules
     print('Writing out the schedule for each professor...')
-    PrintAllProfessorSchedules(Visitors, Professors, TimeSlots, Meeting)
+    ProfessorFiles = PrintAllProfessorSchedules(Visitors, Professors, TimeSlots, Schedule, OutputDirectory)
+
+    # Bundle the schedules into a single file, if requested
+    if Bundle is not None:
+        FilePaths = BundleSchedules(Visitors, Professors, TimeSlots, Schedule, VisitorFiles, ProfessorFiles, Bundle, OutputDirectory)
+        print('Bundled all of the schedules into %s.' % ', '.join('\"%s\"' % os.path.basename(FilePath) for FilePath in FilePaths))
 
     # Print a final message
     print('All done! Please inspect the individual schedules that were created in the \"Visitor Schedules\" and \"Professor Schedules\" directories.')
+
+# Define the function for comparing the solvers
+def RunBenchmarkCommand(Arguments):
+
+    # Collect the model and solver parameters
+    Parameters = GetSolverParameters(Arguments)
+
+    # Import the visitor, professor, and time slot information
+    Data = ImportInputData(Arguments.InputFile, Arguments.UseCache)
+    Visitors = Data.GetVisitors()
+    Professors = Data.GetProfessors()
+
+    # Calculate the number of "preference points" that each visitor associates with each professor
+    CalcPreferencePoints(Visitors, Professors, Data.GetProfessorIndex())
+
+    # Compare the solvers
+    Comparison = BenchmarkBackends(Visitors, Professors, Data.TimeSlots, Arguments.Solvers, Parameters, Arguments.Decompose, Arguments.CompareReductions)
+
+    # Print out the comparison
+    print('-------SOLVER COMPARISON---------')
+    print(Comparison.to_string(index=False, float_format='{:.3f}'.format))
+    print('-------END OF SOLVER COMPARISON---------')
+
+    # Save the comparison, if requested
+    if Arguments.CsvFile is not None:
+        Comparison.to_csv(Arguments.CsvFile, index=False)
+        print('The comparison was saved to \"%s\".' % os.path.abspath(Arguments.CsvFile))
+
+# Define the function for comparing many variants of the problem
+def RunSweepCommand(Arguments):
+
+    # Collect the model and solver parameters
+    Parameters = GetSolverParameters(Arguments)
+
+    # Read the scenarios from the file, or build the grid of scenarios from the command line
+    if Arguments.ScenarioFile is not None:
+        try:
+            Scenarios = ReadScenarios(Arguments.ScenarioFile)
+        except (OSError, ValueError) as Error:
+            print('Error: %s' % Error)
+            exit()
+    else:
+        Grid = dict()
+        for Values in Arguments.Weights:
+            if Values[0] not in DefaultParameters['Weight']:
+                print('Error: Unrecognized objective: %s.  The objectives are: %s' % (Values[0], ', '.join(DefaultParameters['Weight'])))
+                exit()
+            try:
+                Grid[Values[0]] = [float(Value) for Value in Values[1:]]
+            except ValueError:
+                print('Error: The weights of \"%s\" must be numbers.' % Values[0])
+                exit()
+        for (Name, Values) in [('RequiredFreePeriods', Arguments.FreePeriods), ('MaxMinutes', Arguments.TimeLimits), ('AfternoonStartSlot', Arguments.AfternoonStart)]:
+            if Values is not None:
+                Grid[Name] = Values
+        Scenarios = BuildScenarioGrid(Grid)
+
+    # Import the visitor, professor, and time slot information (once, for every scenario)
+    Data = ImportInputData(Arguments.InputFile, Arguments.UseCache)
+    Visitors = Data.GetVisitors()
+    Professors = Data.GetProfessors()
+
+    # Calculate the number of "preference points" that each visitor associates with each professor
+    CalcPreferencePoints(Visitors, Professors, Data.GetProfessorIndex())
+
+    # Solve the scenarios
+    Comparison = SweepScenarios(Visitors, Professors, Data.TimeSlots, Arguments.Solver, Scenarios, Parameters, Arguments.NumProcesses)
+
+    # Print out the comparison
+    print('-------SCENARIO COMPARISON---------')
+    print(Comparison.to_string(index=False, float_format='{:.3f}'.format))
+    print('-------END OF SCENARIO COMPARISON---------')
+
+    # Save the comparison, if requested
+    if Arguments.CsvFile is not None:
+        Comparison.to_csv(Arguments.CsvFile, index=False)
+        print('The comparison was saved to \"%s\".' % os.path.abspath(Arguments.CsvFile))
+
+# Define the function for scheduling several events
+def RunBatchCommand(Arguments):
+
+    # Collect the model and solver parameters
+    Parameters = GetSolverParameters(Arguments)
+
+    # Find the events
+    try:
+        Events = FindEvents(Arguments.Workbooks)
+    except (OSError, ValueError) as Error:
+        print('Error: %s' % Error)
+        exit()
+    if len(Events) == 0:
+        print('Error: None of the workbooks has a sheet whose name starts with \"Visitor Preferences\".')
+        exit()
+    for EventName in Events:
+        print('Found the event \"%s\" in the \"%s\" sheet of \"%s\".' % (EventName, Events[EventName][1], Events[EventName][0]))
+
+    # Schedule the events, using the professors of the first workbook unless another roster was given
+    RosterFile = Arguments.RosterFile if Arguments.RosterFile is not None else Arguments.Workbooks[0]
+    (Summary, ProfessorLoad) = ScheduleEvents(Events, RosterFile, Arguments.Solver, Arguments.OutputDirectory, Parameters, Arguments.NumProcesses, Arguments.Bundle)
+
+    # Print out the summary
+    print('-------BATCH SUMMARY---------')
+    print(Summary.drop(columns=['Output directory']).to_string(index=False, float_format='{:.3f}'.format))
+    print('Meetings of each professor:')
+    print(ProfessorLoad.to_string())
+    print('-------END OF BATCH SUMMARY---------')
+
+    # Save the summary
+    Summary.to_csv(os.path.join(Arguments.OutputDirectory, 'Batch Summary.csv'), index=False)
+    ProfessorLoad.to_csv(os.path.join(Arguments.OutputDirectory, 'Professor Load.csv'))
+    print('All done! The schedules and log of each event were written to its directory in \"%s\", along with \"Batch Summary.csv\" and \"Professor Load.csv\".' % os.path.abspath(Arguments.OutputDirectory))
+
+# Define the function for checking the workbook
+def RunValidateCommand(Arguments):
+
+    # Check the workbook
+    print('Checking \"%s\"...' % os.path.abspath(Arguments.InputFile))
+    Problems = ValidateWorkbook(Arguments.InputFile, dict(DefaultParameters, RequiredFreePeriods=Arguments.FreePeriods))
+
+    # Print out the problems, errors first
+    print('-------VALIDATION---------')
+    for Severity in ['Error', 'Warning']:
+        for (ProblemSeverity, Message) in Problems:
+            if ProblemSeverity == Severity:
+                print('%s: %s' % (Severity, Message))
+    NumErrors = sum(1 for (Severity, Message) in Problems if Severity == 'Error')
+    print('Found %d errors and %d warnings.' % (NumErrors, len(Problems) - NumErrors))
+    print('-------END OF VALIDATION---------')
+
+    # Exit with an error status if the workbook can't be scheduled, so that scripts can check it
+    if NumErrors > 0:
+        sys.exit(1)
+
+# Define the function for running the scheduling service
+def RunServeCommand(Arguments):
+
+    # Collect the default model and solver parameters of the requests
+    Parameters = GetSolverParameters(Arguments)
+
+    # Share the cores between the worker processes, so that CP-SAT doesn't start more search workers than there are cores
+    NumProcesses = max(1, Arguments.NumProcesses if Arguments.NumProcesses is not None else os.cpu_count())
+    if Parameters['NumWorkers'] == 0:
+        Parameters = dict(Parameters, NumWorkers=max(1, os.cpu_count() // NumProcesses))
+
+    # Finish importing the libraries, and start the worker processes before the server starts any threads, so that they are
+    # ready for the first request
+    ImportLazyModules()
+    Pool = ProcessPoolExecutor(max_workers=NumProcesses, initializer=IgnoreInterrupts)
+    Pool.submit(os.getpid).result()
+
+    # Start the server, and load the rosters
+    Server = SchedulingService((Arguments.Host, Arguments.Port), Pool, Arguments.Solver, Parameters)
+    for ExcelFileName in Arguments.RosterFiles:
+        Id = Server.AddRoster(ExcelFileName)
+        print('Loaded the roster \"%s\" as %s.' % (ExcelFileName, Id))
+
+    # Serve requests until interrupted
+    print('Serving on http://%s:%d with %d worker processes.  (Press Ctrl+C to stop.)' % (Arguments.Host, Server.server_address[1], NumProcesses), flush=True)
+    try:
+        Server.serve_forever()
+    except KeyboardInterrupt:
+        print('Stopping the service.')
+    finally:
+        Server.server_close()
+        Pool.shutdown(cancel_futures=True)
+
+if __name__ == '__main__':
+
+    # Parse the command line arguments
+    Arguments = ParseArguments()
+
+    # Run the requested command, stopping with an error message if the inputs are invalid or no schedule was found
+    try:
+        if Arguments.Command == 'benchmark':
+            RunBenchmarkCommand(Arguments)
+        elif Arguments.Command == 'resolve':
+            RunResolveCommand(Arguments)
+        elif Arguments.Command == 'sweep':
+            RunSweepCommand(Arguments)
+        elif Arguments.Command == 'batch':
+            RunBatchCommand(Arguments)
+        elif Arguments.Command == 'validate':
+            RunValidateCommand(Arguments)
+        elif Arguments.Command == 'serve':
+            RunServeCommand(Arguments)
+        else:
+            RunScheduleCommand(Arguments)
+    except ValueError as Error:
+        print('Error: %s' % Error)
+        exit()